@@ -0,0 +1,119 @@
+# apps/service/loadgen.py
+# Local load generator for apps/service/server.py (stdlib asyncio only).
+#
+#   python apps/service/loadgen.py --requests 2000 --concurrency 32 --unique 50
+#
+# Sends POST /run with household records drawn from a pool of `--unique`
+# variants (repeats exercise request coalescing), then prints throughput,
+# latency percentiles, status counts and the server's /metrics.
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+def sample_record(i: int) -> Dict[str, Any]:
+    """A small two-person household; `i` varies balances and the withdrawal level."""
+    r = random.Random(i)
+    return {
+        "id": f"load-{i}",
+        "profile": {"filing_status": "MFJ", "primary_dob": "1959-05-20", "spouse_dob": "1961-09-09",
+                    "state": r.choice(["MD", "NY", "CA", "TX", "PA"]), "county": None},
+        "inputs": {
+            "start_year": 2025, "end_year": 2025 + r.randint(20, 40),
+            "balances": {"Trad IRA": 800_000.0 + 1_000 * i, "Roth": 250_000.0,
+                         "Brokerage": 400_000.0, "Cash": 60_000.0},
+            "returns": {"Trad IRA": 0.06, "Roth": 0.07, "Brokerage": 0.06, "Cash": 0.03},
+            "withdrawals_mode": "weights",
+            "withdrawals_plan": [
+                {"name": "Trad IRA", "annual": 0.0, "tax_class": "pre_tax"},
+                {"name": "Roth", "annual": 0.0, "tax_class": "roth"},
+                {"name": "Brokerage", "annual": 0.0, "tax_class": "brokerage",
+                 "div_yield_pct": 2.0, "realize_gains_pct": 25.0},
+                {"name": "Cash", "annual": 0.0, "tax_class": "cash"},
+            ],
+            "fixed_withdrawal": 0.0, "include_roth_in_fixed": False,
+            "conversions": {"annual": 0.0, "years": 0},
+            "social_security": {"primary_age": 70, "spouse_age": 67, "primary_month": 1, "spouse_month": 9,
+                                "fra_monthly_primary": 3000.0, "fra_monthly_spouse": 2500.0, "cola": 0.02},
+        },
+        "strategy": {"mode": "weights", "total_withdraw": 60_000.0 + 500 * (i % 40),
+                     "weights": {"pre_tax": 0.5, "roth": 0.2, "brokerage": 0.2, "cash": 0.1}},
+    }
+
+
+async def request(host: str, port: int, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body)
+    await writer.drain()
+    try:
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        length = 0
+        for line in head.split("\r\n")[1:]:
+            k, _, v = line.partition(":")
+            if k.strip().lower() == "content-length":
+                length = int(v.strip())
+        payload = await reader.readexactly(length)
+    finally:
+        writer.close()
+    return int(head.split(" ", 2)[1]), payload
+
+
+async def run_load(host: str, port: int, n_requests: int, concurrency: int, unique: int) -> Dict[str, Any]:
+    bodies = [json.dumps(sample_record(i)).encode() for i in range(unique)]
+    rng = random.Random(n_requests)
+    order = [rng.randrange(unique) for _ in range(n_requests)]
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    next_i = 0
+
+    async def client():
+        nonlocal next_i
+        while next_i < n_requests:
+            body = bodies[order[next_i]]
+            next_i += 1
+            t = time.perf_counter()
+            try:
+                status, _ = await request(host, port, "POST", "/run", body)
+            except (OSError, asyncio.IncompleteReadError):
+                status = "conn_error"
+            latencies.append(time.perf_counter() - t)
+            statuses[status] += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    lat = np.array(latencies) * 1000.0
+    _, metrics = await request(host, port, "GET", "/metrics")
+    return {
+        "requests": n_requests,
+        "elapsed_sec": round(elapsed, 3),
+        "requests_per_sec": round(n_requests / elapsed, 1),
+        "latency_ms_p50": round(float(np.percentile(lat, 50)), 2),
+        "latency_ms_p99": round(float(np.percentile(lat, 99)), 2),
+        "status": {str(k): v for k, v in statuses.items()},
+        "server": json.loads(metrics),
+    }
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Load-test the local projection service.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--requests", type=int, default=1000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--unique", type=int, default=50, help="distinct households in the request mix")
+    args = ap.parse_args(argv)
+    print(json.dumps(asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency, args.unique)),
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# apps/service/server.py
+# Local JSON projection service (stdlib asyncio, no web framework).
+#
+#   python apps/service/server.py --port 8765 --workers 4 --max-queue 64
+#
+#   POST /run      one household record (same keys as core.batch: profile, inputs,
+#                  strategy?, assumptions?, options?) -> {"columns": [...], "data": {col: [...]}}
+#   POST /batch    {"households": [record, ...]} -> {"results": [{"id", "columns", "data"} | {"id", "error"}]}
+#   GET  /metrics  request counts, queue depth, coalescing and latency percentiles
+#   GET  /healthz
+#
+# Projections run on a process pool so the event loop only parses and routes.
+# Identical in-flight requests (same canonical hash) share one computation, and
+# requests beyond --max-queue pending projections get 503 + Retry-After. The
+# workers are forked before the listening socket opens, so they never hold a
+# client connection open.
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Tuple
+
+# --- make the project root importable when run as a script ---
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+# --------------------------------------------------------------
+
+import numpy as np
+
+from core.batch import project_record
+from core.cache import canonical_hash
+from core.rules import DEFAULT_RULES_VERSION
+
+MAX_BODY = 16 * 2**20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    """Pending projections are at max_queue."""
+
+
+def _project_json(rec: Dict[str, Any], rules_version: str) -> Dict[str, Any]:
+    """Worker-side: project one record and return its columns as JSON-ready lists."""
+    res = project_record(rec, rules_version)
+    return {"columns": res.columns, "data": {c: res.column(c).tolist() for c in res.columns}}
+
+
+class ProjectionService:
+    def __init__(self, workers: int | None = None, max_queue: int = 64,
+                 rules_version: str = DEFAULT_RULES_VERSION, latency_window: int = 10_000):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.rules_version = rules_version
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._latency = deque(maxlen=latency_window)   # seconds per HTTP request
+        self.started = time.time()
+        self.counters = {"requests": 0, "projections": 0, "coalesced": 0, "rejected": 0, "errors": 0}
+
+    async def project(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+        """Project a record on the pool; identical in-flight records share one future."""
+        key = canonical_hash({k: v for k, v in rec.items() if k != "id"}, self.rules_version)
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(fut)
+        if len(self._inflight) >= self.max_queue:
+            self.counters["rejected"] += 1
+            raise Overloaded()
+        loop = asyncio.get_running_loop()
+        fut = loop.run_in_executor(self.pool, _project_json, rec, self.rules_version)
+        self._inflight[key] = fut
+        self.counters["projections"] += 1
+        fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(fut)
+
+    async def start(self) -> None:
+        """Fork the pool's workers now (one warm-up task each), before any socket exists."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self.workers)))
+
+    def metrics(self) -> Dict[str, Any]:
+        lat = np.array(self._latency) * 1000.0
+        pct = lambda q: round(float(np.percentile(lat, q)), 3) if lat.size else None
+        return {
+            **self.counters,
+            "queue_depth": len(self._inflight),
+            "max_queue": self.max_queue,
+            "workers": self.workers,
+            "uptime_sec": round(time.time() - self.started, 1),
+            "latency_ms_p50": pct(50),
+            "latency_ms_p90": pct(90),
+            "latency_ms_p99": pct(99),
+        }
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if path == "/healthz":
+            return 200, {"ok": True}
+        if path == "/metrics":
+            return 200, self.metrics()
+        if path not in ("/run", "/batch"):
+            return 404, {"error": f"no route {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as e:
+            return 400, {"error": f"invalid JSON: {e}"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "request body must be a JSON object"}
+
+        if path == "/run":
+            try:
+                return 200, {"id": payload.get("id"), **await self.project(payload)}
+            except (ValueError, KeyError, TypeError) as e:   # the record does not parse into Profile/Inputs
+                self.counters["errors"] += 1
+                return 400, {"error": f"{type(e).__name__}: {e}"}
+
+        records = payload.get("households") or []
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            return 400, {"error": "households must be a list of JSON objects"}
+        if len(records) > self.max_queue:
+            return 413, {"error": f"batch of {len(records)} exceeds max queue {self.max_queue}; "
+                                  "split it into smaller batches"}
+        if len(self._inflight) + len(records) > self.max_queue:
+            self.counters["rejected"] += 1
+            raise Overloaded()
+        outcomes = await asyncio.gather(*(self.project(r) for r in records), return_exceptions=True)
+        results = []
+        for rec, out in zip(records, outcomes):
+            if isinstance(out, BaseException):
+                self.counters["errors"] += 1
+                results.append({"id": rec.get("id"), "error": f"{type(out).__name__}: {out}"})
+            else:
+                results.append({"id": rec.get("id"), **out})
+        return 200, {"results": results}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        t0 = time.perf_counter()
+        status, payload, extra = 500, {"error": "internal error"}, ""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, target, _ = request_line.split(" ", 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                k, _, v = line.partition(":")
+                headers[k.strip().lower()] = v.strip()
+            length = int(headers.get("content-length", 0) or 0)
+            self.counters["requests"] += 1
+            if length > MAX_BODY:
+                status, payload = 413, {"error": "request body too large"}
+            else:
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.route(method.upper(), target.split("?", 1)[0], body)
+        except Overloaded:
+            status, payload, extra = 503, {"error": "busy, retry later"}, "Retry-After: 1\r\n"
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, payload = 400, {"error": f"malformed request: {e}"}
+        except Exception as e:
+            self.counters["errors"] += 1
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            data = json.dumps(payload).encode()
+            head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"{extra}Connection: close\r\n\r\n").encode()
+            try:
+                writer.write(head + data)
+                await writer.drain()
+                writer.close()
+            except ConnectionError:
+                pass
+            self._latency.append(time.perf_counter() - t0)
+
+    def close(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, **kwargs) -> None:
+    service = ProjectionService(**kwargs)
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port, backlog=1024)
+    print(f"projection service on http://{host}:{port} ({service.workers} workers, max queue {service.max_queue})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Local JSON projection service.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=None, help="projection processes (default: CPU count)")
+    ap.add_argument("--max-queue", type=int, default=64, help="pending projections before 503")
+    ap.add_argument("--rules-version", default=DEFAULT_RULES_VERSION)
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_queue=args.max_queue,
+                          rules_version=args.rules_version))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
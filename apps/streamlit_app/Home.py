@@ -1,5 +1,7 @@
 # apps/streamlit_app/Home.py
+import functools
 import streamlit as st
+import pandas as pd
 from datetime import date
 
 # --- make the project root importable on Streamlit Cloud ---
@@ -10,7 +12,15 @@ if ROOT_DIR not in sys.path:
 # -----------------------------------------------------------
 
 from core.schema import Profile, Inputs, Assumptions
-from core.projection import run
+from core.cache import ResultCache, cached_run, projection_key, result_key
+from core.store import ScenarioStore
+from core.incremental import IncrementalProjector
+from core.profiling import Profiler
+from core.optimize import optimize_weights, optimize_conversions, optimize_claiming
+from core.backtest import run_backtest
+from core.sensitivity import sensitivity
+from core.montecarlo import run_monte_carlo
+from core.jobs import JobRunner, Cancelled
 
 # -------------------------------------------------
 # App configuration
@@ -19,63 +29,154 @@ st.set_page_config(page_title="RetireRight — Retirement Projection", layout="w
 st.title("RetireRight — Retirement Projection")
 st.set_option("client.showErrorDetails", True)
 
+
+@st.cache_resource
+def projection_cache() -> ResultCache:
+    # One cache per server process, shared by every session.
+    return ResultCache(max_entries=512, max_bytes=256 * 2**20, ttl_seconds=6 * 3600)
+
+
+@st.cache_resource
+def scenario_store() -> ScenarioStore | None:
+    # Saved scenarios and results on disk (~/.retireright), across sessions and restarts.
+    try:
+        return ScenarioStore()
+    except Exception:
+        return None   # e.g. a read-only home directory: run without persistence
+
+
+@st.cache_resource
+def job_runner() -> JobRunner:
+    # Background runs for every session; each session has at most one job at a time.
+    return JobRunner(max_workers=2)
+
+
+@st.cache_data
+def default_accounts() -> pd.DataFrame:
+    return pd.DataFrame([
+        {"name":"His Trad IRA",    "owner":"his",   "type":"IRA",       "tax_class":"pre_tax",  "start_balance":1_138_000, "return_pct":8.0,  "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":True},
+        {"name":"Her Trad IRA",    "owner":"hers",  "type":"IRA",       "tax_class":"pre_tax",  "start_balance":325_000,   "return_pct":4.5,  "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":True},
+        {"name":"Joint Brokerage", "owner":"joint", "type":"brokerage", "tax_class":"brokerage","start_balance":250_000,   "return_pct":7.0,  "withdraw_annual":0.0, "div_yield_pct":2.0, "realize_gains_pct":25.0, "include":False},
+        {"name":"Cash",            "owner":"joint", "type":"cash",      "tax_class":"cash",     "start_balance":100_000,   "return_pct":3.0,  "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":True},
+        {"name":"HSA (His)",       "owner":"his",   "type":"HSA",       "tax_class":"hsa",      "start_balance":0.0,       "return_pct":5.0,  "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":False},
+        {"name":"Roth (His)",      "owner":"his",   "type":"Roth",      "tax_class":"roth",     "start_balance":0.0,       "return_pct":14.0, "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":False},
+    ])
+
+
+def submit_job(key: str, label: str, fn, *args, report: bool = True, **kwargs) -> None:
+    """Start fn in the background (replacing this session's running job); its result lands in session_state[key]."""
+    running = st.session_state.get("job")
+    if running is not None:
+        running[1].cancel()
+    st.session_state.pop(key, None)
+    st.session_state.pop("job_status", None)
+    st.session_state.job = (key, job_runner().submit(label, fn, *args, report=report, **kwargs))
+    st.rerun()
+
+
+def run_projection(cache: ResultCache, store: ScenarioStore | None, projector: IncrementalProjector,
+                   profile: Profile, inputs: Inputs, progress=None, **kwargs) -> dict:
+    profiler = Profiler()
+    assumptions = Assumptions(rules_version="2025.v1")
+    # Misses go to the scenario store, then resume this session's last projection
+    # from its first changed year. `progress` (the job's) lets Cancel or a newer
+    # run stop the year loop; the projector runs one call at a time.
+    runner = functools.partial(projector.project, progress=progress)
+    if store is not None:
+        runner = functools.partial(store.run, runner=runner)
+    result = cached_run(cache, profile, inputs, assumptions, runner=runner, profiler=profiler, **kwargs)
+    with profiler.phase("table"):
+        table = result["table"]
+    cache.resize(result_key(profile, inputs, assumptions, **kwargs))   # count the DataFrame against max_bytes
+    return {"table": table, "profiler": profiler,
+            "scenario_id": projection_key(profile, inputs, assumptions, **kwargs)}
+
+
+def job_panel():
+    """Progress and Cancel for the running job; stores its result and reruns the page when it finishes."""
+    running = st.session_state.get("job")
+    if running is None:
+        status = st.session_state.get("job_status")
+        if status is not None:
+            label, e = status
+            if isinstance(e, Cancelled):
+                st.info(f"{label} cancelled.")
+            elif isinstance(e, ValueError):
+                st.warning(str(e))
+            else:
+                st.error(f"{label} failed. Details below.")
+                st.exception(e)
+        return
+    key, job = running
+    if not job.done():
+        text = f"{job.label}{' (cancelling)' if job.cancelled else ''}... {job.elapsed:.0f}s"
+        st.progress(job.fraction or 0.0, text=text)
+        if st.button("Cancel", disabled=job.cancelled):
+            job.cancel()
+        return
+    del st.session_state["job"]
+    try:
+        st.session_state[key] = job.result()
+    except Exception as e:
+        st.session_state.job_status = (job.label, e)
+    st.rerun()
+
+
+def current_profile() -> Profile:
+    ss = st.session_state
+    return Profile(
+        filing_status=ss.filing_status,
+        primary_dob=str(ss.primary_dob),
+        spouse_dob=str(ss.spouse_dob) if ss.add_spouse and ss.get("spouse_dob") else None,
+        state=ss.state,
+        county=ss.county if ss.county else None,
+    )
+
 # ===============================
 # TABS
 # ===============================
+# Each tab body is a fragment: a widget change reruns only its own tab. Values the
+# Projections tab needs from the others are read back through widget keys.
 tab_profile, tab_accounts, tab_taxes, tab_proj = st.tabs(["Profile", "Accounts", "Taxes", "Projections"])
 
 # ===============================
 # PROFILE
 # ===============================
-with tab_profile:
+@st.fragment
+def profile_tab():
     st.header("👤 Profile")
     c1, c2, c3 = st.columns(3)
     with c1:
-        filing_status = st.selectbox("Filing Status", ["MFJ", "Single", "MFS", "HOH"], index=0)
+        st.selectbox("Filing Status", ["MFJ", "Single", "MFS", "HOH"], index=0, key="filing_status")
     with c2:
-        primary_dob = st.date_input("Primary DOB", value=date(1959, 12, 31), format="YYYY-MM-DD")
+        st.date_input("Primary DOB", value=date(1959, 12, 31), format="YYYY-MM-DD", key="primary_dob")
     with c3:
-        add_spouse   = st.checkbox("Add Spouse", value=True)
-        spouse_dob   = st.date_input("Spouse DOB", value=date(1961, 9, 9), format="YYYY-MM-DD") if add_spouse else None
+        add_spouse = st.checkbox("Add Spouse", value=True, key="add_spouse")
+        if add_spouse:
+            st.date_input("Spouse DOB", value=date(1961, 9, 9), format="YYYY-MM-DD", key="spouse_dob")
 
     c4, c5 = st.columns(2)
     with c4:
-        state = st.selectbox(
+        st.selectbox(
             "State",
             ["AL","AK","AZ","AR","CA","CO","CT","DE","DC","FL","GA","HI","ID","IL","IN","IA","KS","KY","LA","ME",
              "MD","MA","MI","MN","MS","MO","MT","NE","NV","NH","NJ","NM","NY","NC","ND","OH","OK","OR","PA","RI",
              "SC","SD","TN","TX","UT","VT","VA","WA","WV","WI","WY"],
-            index=20
+            index=20, key="state",
         )
     with c5:
-        county = st.text_input("County / Locality (for MD demo)", "Montgomery")
-
-    profile = Profile(
-        filing_status=filing_status,
-        primary_dob=str(primary_dob),
-        spouse_dob=str(spouse_dob) if spouse_dob else None,
-        state=state,
-        county=county if county else None,
-    )
+        st.text_input("County / Locality (MD counties, NYC boroughs)", "Montgomery", key="county")
 
 # ===============================
 # ACCOUNTS
 # ===============================
-with tab_accounts:
+@st.fragment
+def accounts_tab():
     st.header("🏦 Accounts")
     st.caption("You can add multiple Roth/HSAs/cash/brokerage. Toggle **include** for which accounts appear. "
                "Use **withdraw_annual** for Manual mode. For brokerage, set **div_yield_pct** and **realize_gains_pct**.")
-    import pandas as pd
-    default_accounts = pd.DataFrame([
-        {"name":"His Trad IRA",    "owner":"his",   "type":"IRA",       "tax_class":"pre_tax",  "start_balance":1_138_000, "return_pct":8.0,  "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":True},
-        {"name":"Her Trad IRA",    "owner":"hers",  "type":"IRA",       "tax_class":"pre_tax",  "start_balance":325_000,   "return_pct":4.5,  "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":True},
-        {"name":"Joint Brokerage", "owner":"joint", "type":"brokerage", "tax_class":"brokerage","start_balance":250_000,   "return_pct":7.0,  "withdraw_annual":0.0, "div_yield_pct":2.0, "realize_gains_pct":25.0, "include":False},
-        {"name":"Cash",            "owner":"joint", "type":"cash",      "tax_class":"cash",     "start_balance":100_000,   "return_pct":3.0,  "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":True},
-        {"name":"HSA (His)",       "owner":"his",   "type":"HSA",       "tax_class":"hsa",      "start_balance":0.0,       "return_pct":5.0,  "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":False},
-        {"name":"Roth (His)",      "owner":"his",   "type":"Roth",      "tax_class":"roth",     "start_balance":0.0,       "return_pct":14.0, "withdraw_annual":0.0, "div_yield_pct":0.0, "realize_gains_pct":0.0, "include":False},
-    ])
     if "accounts_df" not in st.session_state:
-        st.session_state.accounts_df = default_accounts.copy()
+        st.session_state.accounts_df = default_accounts()
     with st.expander("Edit accounts table", expanded=False):
         edited = st.data_editor(
             st.session_state.accounts_df,
@@ -100,44 +201,55 @@ with tab_accounts:
 # ===============================
 # TAXES + SOCIAL SECURITY
 # ===============================
-with tab_taxes:
+@st.fragment
+def taxes_tab():
     st.header("🧾 Taxes")
     c1, c2, c3 = st.columns(3)
     with c1:
-        senior_bill_on = st.checkbox("Apply senior credits (Beautiful Bill)", value=True)
+        st.checkbox("Apply senior credits (Beautiful Bill)", value=True, key="senior_bill_on")
     with c2:
-        state_rate_pct = st.number_input("State flat rate % (non-MD)", value=0.0, step=0.25)
+        st.number_input("State flat rate % override (0 = use state rules)", value=0.0, step=0.25, key="state_rate_pct")
     with c3:
-        local_rate_pct = st.number_input("Local flat rate % (non-MD)", value=0.0, step=0.25)
+        st.number_input("Local flat rate % (with state override)", value=0.0, step=0.25, key="local_rate_pct")
 
-    std_override = st.number_input("Standard deduction override ($, blank=auto)", value=0.0, step=500.0)
-    round_whole = st.checkbox("Round to whole dollars", value=True)
+    st.number_input("Standard deduction override ($, blank=auto)", value=0.0, step=500.0, key="std_override")
+    st.checkbox("Round to whole dollars", value=True, key="round_whole")
+    st.checkbox("Monthly time step (withdrawals and growth month by month)", value=False, key="monthly",
+                help="Each year's withdrawals are taken in 12 monthly amounts and balances compound monthly.")
 
     st.subheader("Social Security (enter FRA monthly at 67)")
     s0, s1 = st.columns(2)
     with s0:
-        fra_primary = st.number_input("Your FRA monthly (at 67)", value=2981.0, step=50.0)
+        st.number_input("Your FRA monthly (at 67)", value=2981.0, step=50.0, key="fra_primary")
     with s1:
-        fra_spouse  = st.number_input("Spouse FRA monthly (at 67)", value=2800.0, step=50.0)
+        st.number_input("Spouse FRA monthly (at 67)", value=2800.0, step=50.0, key="fra_spouse")
 
     s2, s3, s4 = st.columns(3)
     with s2:
-        you_age   = st.number_input("Your claim age", value=70, min_value=62, max_value=70)
+        st.number_input("Your claim age", value=70, min_value=62, max_value=70, key="you_age")
     with s3:
-        sp_age    = st.number_input("Spouse claim age", value=65, min_value=62, max_value=70)
+        st.number_input("Spouse claim age", value=65, min_value=62, max_value=70, key="sp_age")
     with s4:
-        cola      = st.number_input("SS COLA %", value=2.0, step=0.25)
+        st.number_input("SS COLA %", value=2.0, step=0.25, key="cola")
 
     m1, m2 = st.columns(2)
     with m1:
-        you_month = st.number_input("Your start month (1–12)", value=1, min_value=1, max_value=12)
+        st.number_input("Your start month (1–12)", value=1, min_value=1, max_value=12, key="you_month")
     with m2:
-        sp_month  = st.number_input("Spouse start month (1–12)", value=9, min_value=1, max_value=12)
+        st.number_input("Spouse start month (1–12)", value=9, min_value=1, max_value=12, key="sp_month")
 
 # ===============================
 # PROJECTIONS (Manual vs Strategy sliders)
 # ===============================
-with tab_proj:
+@st.fragment
+def projections_tab():
+    ss = st.session_state
+    profile = current_profile()
+    state_rate_pct, local_rate_pct = ss.state_rate_pct, ss.local_rate_pct
+    std_override = ss.std_override if ss.std_override > 0 else None
+    senior_bill_on = ss.senior_bill_on
+    assumptions = Assumptions(rules_version="2025.v1")
+
     st.header("📆 Window & Strategy")
     p1, p2 = st.columns(2)
     with p1:
@@ -148,9 +260,6 @@ with tab_proj:
     st.subheader("Withdrawal Mode")
     mode = st.radio("Choose how withdrawals are set:", ["Manual (per account)", "Strategy sliders"], index=0, horizontal=True)
 
-    acc = st.session_state.accounts_df.copy()
-    acc["return_pct"] = acc["return_pct"].astype(float) / 100.0
-
     strategy = {"mode":"manual", "weights":{}, "total_withdraw":0.0}
     if mode == "Strategy sliders":
         strategy["mode"] = "weights"
@@ -176,63 +285,296 @@ with tab_proj:
             "cash":    float(w_cash/total_w),
         }
 
+    st.subheader("Roth Conversions")
+    rc1, rc2 = st.columns(2)
+    with rc1:
+        conv_annual = st.number_input("Convert pre-tax to Roth ($/yr)", value=0.0, step=5000.0)
+    with rc2:
+        conv_years = st.number_input("For the first N years", value=0, step=1, min_value=0)
+    conversions = {"annual": float(conv_annual), "years": int(conv_years)}
+    ss_claiming = None  # month-level claim ages from "Optimize claiming", when applied
+    # Suggestions applied with the checkboxes further down, resolved before any job builds inputs.
+    best_conv = ss.get("conv_suggestion")
+    if best_conv is not None and best_conv["conversions"]["schedule"] and ss.get("use_conv_suggestion", True):
+        conversions = best_conv["conversions"]
+    best_claim = ss.get("claim_suggestion")
+    if best_claim is not None and ss.get("use_claim_suggestion", False):
+        ss_claiming = {k: v for k, v in best_claim["social_security"].items()
+                       if k.startswith(("primary_age", "spouse_age"))}
+
+    def build_inputs():
+        # Build Inputs: balances/returns for included accounts (return_pct is a percentage)
+        balances, returns = {}, {}
+        withdrawals_plan = []  # used in manual mode
+
+        for row in ss.accounts_df.to_dict("records"):
+            if not row.get("include", True):
+                continue
+            nm = str(row.get("name", ""))
+            balances[nm] = float(row.get("start_balance", 0.0))
+            returns[nm]  = float(row.get("return_pct", 0.0)) / 100.0
+            wd = float(row.get("withdraw_annual", 0.0))
+            tax_class = str(row.get("tax_class", "cash"))
+            div_yield = float(row.get("div_yield_pct", 0.0))
+            rg_pct    = float(row.get("realize_gains_pct", 0.0))
+            withdrawals_plan.append({"name": nm, "annual": wd, "tax_class": tax_class,
+                                     "owner": str(row.get("owner", "his")),
+                                     "div_yield_pct": div_yield, "realize_gains_pct": rg_pct})
+
+        cola = ss.cola
+        inputs = Inputs(
+            start_year=int(start_year),
+            end_year=int(end_year),
+            balances=balances,
+            returns=returns,
+            withdrawals_mode="manual" if strategy["mode"]=="manual" else "weights",
+            withdrawals_plan=withdrawals_plan,
+            fixed_withdrawal=0.0,
+            include_roth_in_fixed=False,
+            conversions=conversions,
+            social_security={
+                "primary_age": int(ss.you_age),
+                "spouse_age":  int(ss.sp_age),
+                "primary_month": int(ss.you_month),
+                "spouse_month":  int(ss.sp_month),
+                "fra_monthly_primary": float(ss.fra_primary),
+                "fra_monthly_spouse":  float(ss.fra_spouse),
+                "cola": float(cola)/100.0 if cola > 1 else float(cola),
+            }
+        )
+        if ss_claiming:
+            inputs.social_security = dict(inputs.social_security, **ss_claiming)
+        return inputs
+
+    if strategy["mode"] == "weights":
+        o1, o2, o3 = st.columns([2, 2, 1])
+        with o1:
+            opt_goal = st.selectbox("Optimize for", ["Lowest lifetime tax", "Highest ending after-tax wealth"])
+        with o2:
+            spend_floor = st.number_input("Spending floor after tax ($/yr, 0 = none)", value=0.0, step=5000.0)
+        with o3:
+            st.write("")
+            suggest = st.button("Suggest split")
+        if suggest:
+            submit_job(
+                "weights_suggestion", "Searching withdrawal splits", optimize_weights,
+                profile, build_inputs(), assumptions, report=False,
+                total_withdraw=strategy["total_withdraw"],
+                objective="min_tax" if opt_goal.startswith("Lowest") else "max_wealth",
+                spending_floor=(spend_floor if spend_floor > 0 else None),
+                state_rate=state_rate_pct, local_rate=local_rate_pct, std_override=std_override,
+                senior_bill_on=senior_bill_on,
+            )
+        best = ss.get("weights_suggestion")
+        if best is not None:
+            if best["feasible"]:
+                w = best["weights"]
+                st.success(f"Suggested split — Pre-Tax {w['pre_tax']:.1%}, Roth {w['roth']:.1%}, "
+                           f"Brokerage {w['brokerage']:.1%}, Cash {w['cash']:.1%} "
+                           f"(lifetime tax ${best['lifetime_tax']:,.0f}, "
+                           f"ending after-tax ${best['ending_after_tax']:,.0f})")
+            else:
+                st.warning("No split funds the full withdrawal and meets the spending floor.")
+
+    c1, c2 = st.columns([2, 3])
+    with c1:
+        conv_rate = st.number_input("Tax rate on pre-tax left at the end (%)", value=22.0, step=1.0)
+    with c2:
+        st.write("")
+        suggest_conv = st.button("Suggest conversions")
+    if suggest_conv:
+        submit_job(
+            "conv_suggestion", "Searching conversion schedules", optimize_conversions,
+            profile, build_inputs(), assumptions, strategy=strategy,
+            terminal_rate=conv_rate / 100.0, state_rate=state_rate_pct, local_rate=local_rate_pct,
+            std_override=std_override, senior_bill_on=senior_bill_on,
+        )
+    if best_conv is not None:
+        if best_conv["conversions"]["schedule"]:
+            tb = best_conv["target_bracket"]
+            st.success(f"Suggested: fill {tb['fraction']:.0%} of the {tb['rate']:.0%} bracket for "
+                       f"{tb['years']} year(s) — lifetime tax + deferred tax "
+                       f"${best_conv['baseline_objective']:,.0f} → ${best_conv['objective']:,.0f}")
+            _ = st.checkbox("Use suggested conversion schedule", value=True, key="use_conv_suggestion")
+        else:
+            st.info("No conversion schedule beats converting nothing (or there is no Roth account).")
+
+    s1, s2 = st.columns([2, 3])
+    with s1:
+        claim_goal = st.selectbox("Rank claiming ages by", ["Lifetime after-tax income", "Ending wealth"])
+    with s2:
+        st.write("")
+        suggest_claim = st.button("Optimize claiming")
+    if suggest_claim:
+        submit_job(
+            "claim_suggestion", "Evaluating every claim-age combination", optimize_claiming,
+            profile, build_inputs(), assumptions, report=False, strategy=strategy,
+            objective="after_tax_income" if claim_goal.startswith("Lifetime") else "ending_wealth",
+            state_rate=state_rate_pct, local_rate=local_rate_pct, std_override=std_override,
+            senior_bill_on=senior_bill_on,
+        )
+    if best_claim is not None:
+        fmt = lambda c: ("as entered" if c.get("as_entered") else f"{c['age']}y{c['months']}m"
+                         ) + f" (from {c['start_month']}/{c['start_year']})"
+        msg = f"Best of {best_claim['evaluated']:,} combinations — you {fmt(best_claim['primary'])}"
+        if best_claim["spouse"]:
+            msg += f", spouse {fmt(best_claim['spouse'])}"
+        st.success(f"{msg}: ${best_claim['value']:,.0f} vs ${best_claim['baseline_value']:,.0f} as entered")
+        st.dataframe(
+            [{"you": fmt(r["primary"]), "spouse": fmt(r["spouse"]) if r["spouse"] else "",
+              "value": round(r["value"]), "lifetime tax": round(r["lifetime_tax"])} for r in best_claim["top"]],
+            use_container_width=True, hide_index=True,
+        )
+        _ = st.checkbox("Use suggested claim ages", value=False, key="use_claim_suggestion")
+
+    if st.button("Historical backtest"):
+        submit_job("backtest", "Replaying every historical start year", run_backtest,
+                   profile, build_inputs(), assumptions, strategy=strategy,
+                   state_rate=state_rate_pct, local_rate=local_rate_pct, std_override=std_override,
+                   senior_bill_on=senior_bill_on)
+    bt = ss.get("backtest")
+    if bt is not None:
+        first, last = bt["history"]
+        st.caption(f"{bt['n_windows']} windows from {first}-{last} US stock/bond/bill returns "
+                   "(60/40 unless an account sets asset_mix; cash earns bills).")
+        b1, b2, b3 = st.columns(3)
+        b1.metric("Fully funded", f"{bt['success_rate']:.0%}")
+        b2.metric(f"Worst start ({bt['worst']['start']})", f"${bt['worst']['ending_balance']:,.0f}",
+                  help=("Depleted in " + str(bt["worst"]["depletion_year"]))
+                  if bt["worst"]["depletion_year"] else None)
+        b3.metric(f"Median start ({bt['median']['start']})", f"${bt['median']['ending_balance']:,.0f}")
+        st.dataframe(bt["windows"], use_container_width=True, hide_index=True)
+
+    m1, m2, m3 = st.columns([1, 1, 3])
+    with m1:
+        mc_paths = st.number_input("Monte Carlo paths", value=10_000, step=1_000, min_value=1_000)
+    with m2:
+        mc_vol = st.number_input("Volatility % (non-cash)", value=12.0, step=1.0, min_value=0.0)
+    with m3:
+        st.write("")
+        run_mc = st.button("Monte Carlo")
+    if run_mc:
+        inputs = build_inputs()
+        vols = {str(m["name"]): (0.01 if m["tax_class"] == "cash" else mc_vol / 100.0)
+                for m in inputs.withdrawals_plan}
+        # workers=1: simulate inside the job thread rather than forking the server process
+        submit_job("montecarlo", f"Simulating {int(mc_paths):,} paths", run_monte_carlo,
+                   profile, inputs, assumptions, n_paths=int(mc_paths), volatility=vols, workers=1,
+                   strategy=strategy, state_rate=state_rate_pct, local_rate=local_rate_pct,
+                   std_override=std_override, senior_bill_on=senior_bill_on)
+    mc = ss.get("montecarlo")
+    if mc is not None:
+        q1, q2, q3 = st.columns(3)
+        q1.metric("Fully funded", f"{mc['success_probability']:.0%}")
+        q2.metric("Median ending balance", f"${mc['ending_balance_percentiles'][50]:,.0f}")
+        q3.metric("5th percentile ending balance", f"${mc['ending_balance_percentiles'][5]:,.0f}")
+        by_year = mc["by_year"]
+        st.line_chart(pd.DataFrame({f"p{p}": by_year["balance_percentiles"][p] for p in (5, 25, 50, 75, 95)},
+                                   index=by_year["years"]))
+
+    t1, t2 = st.columns([2, 3])
+    with t1:
+        tornado_metric = st.selectbox("Sensitivity of", ["Ending wealth", "Lifetime tax"])
+    with t2:
+        st.write("")
+        show_tornado = st.button("Sensitivity (tornado)")
+    if show_tornado:
+        submit_job("sensitivity", "Perturbing every input", sensitivity,
+                   profile, build_inputs(), assumptions, strategy=strategy,
+                   state_rate=state_rate_pct, local_rate=local_rate_pct, std_override=std_override,
+                   senior_bill_on=senior_bill_on)
+    sens = ss.get("sensitivity")
+    if sens is not None:
+        metric = "ending_wealth" if tornado_metric.startswith("Ending") else "lifetime_tax"
+        rows = [r for r in sens["tornado"][metric] if r["swing"] != 0][:15]
+        st.caption(f"Change vs base (${sens['base'][metric]:,.0f}) when each input moves down / up one step: "
+                   "returns ±1 pt, balances and withdrawals ±10%, COLA ±0.5 pt, claim age ±1 yr, weights ±5 pts. "
+                   f"{sens['scenarios']} scenarios in one batch.")
+        if rows:
+            tor = pd.DataFrame({"down": [r["low"] for r in rows], "up": [r["high"] for r in rows]},
+                               index=[r["name"] for r in rows])
+            st.bar_chart(tor, horizontal=True, stack=False)
+            st.dataframe(tor.round(0), use_container_width=True)
+
     st.divider()
-    run_now = st.button("Run Projection", type="primary")
-    if run_now:
-        with st.spinner("Running projection..."):
-            # Build Inputs: balances/returns for included accounts
-            balances, returns = {}, {}
-            withdrawals_plan = []  # used in manual mode
-
-            for _, row in acc.iterrows():
-                if not row.get("include", True):
-                    continue
-                nm = str(row.get("name", ""))
-                balances[nm] = float(row.get("start_balance", 0.0))
-                returns[nm]  = float(row.get("return_pct", 0.0))
-                wd = float(row.get("withdraw_annual", 0.0))
-                tax_class = str(row.get("tax_class", "cash"))
-                div_yield = float(row.get("div_yield_pct", 0.0))
-                rg_pct    = float(row.get("realize_gains_pct", 0.0))
-                withdrawals_plan.append({"name": nm, "annual": wd, "tax_class": tax_class,
-                                         "div_yield_pct": div_yield, "realize_gains_pct": rg_pct})
-
-            inputs = Inputs(
-                start_year=int(start_year),
-                end_year=int(end_year),
-                balances=balances,
-                returns=returns,
-                withdrawals_mode="manual" if strategy["mode"]=="manual" else "weights",
-                withdrawals_plan=withdrawals_plan,
-                fixed_withdrawal=0.0,
-                include_roth_in_fixed=False,
-                conversions={"annual":0.0,"years":0},
-                social_security={
-                    "primary_age": int(you_age),
-                    "spouse_age":  int(sp_age),
-                    "primary_month": int(you_month),
-                    "spouse_month":  int(sp_month),
-                    "fra_monthly_primary": float(fra_primary),
-                    "fra_monthly_spouse":  float(fra_spouse),
-                    "cola": float(cola)/100.0 if cola > 1 else float(cola),
-                }
+    if st.button("Run Projection", type="primary"):
+        submit_job("projection", "Running projection", run_projection,
+                   projection_cache(), scenario_store(), ss.setdefault("projector", IncrementalProjector()),
+                   profile, build_inputs(),
+                   state_rate=state_rate_pct, local_rate=local_rate_pct,
+                   senior_bill_on=senior_bill_on, round_whole=ss.round_whole,
+                   std_override=std_override, strategy=strategy,
+                   # annual runs keep their existing cache / store keys
+                   **({"time_step": "monthly"} if ss.monthly else {}))
+    store = scenario_store()
+    proj = ss.get("projection")
+    if proj is not None:
+        st.subheader("📊 Projection Results")
+        st.dataframe(proj["table"], use_container_width=True)
+        if store is not None:
+            n1, n2 = st.columns([3, 1])
+            with n1:
+                save_name = st.text_input("Scenario name", placeholder="e.g. Retire at 65, 4% withdrawals")
+            with n2:
+                st.write("")
+                if st.button("Save scenario", disabled=not save_name):
+                    store.rename(proj["scenario_id"], save_name)
+                    st.toast(f"Saved “{save_name}”")
+
+        with st.expander("Performance"):
+            phases = proj["profiler"].summary()
+            st.write(f"Last run: {sum(p['seconds'] for p in phases.values()) * 1000:.1f} ms")
+            st.dataframe(
+                [{"phase": name, "ms": round(p["seconds"] * 1000, 3), "calls": p["calls"],
+                  "share": f"{p['share']:.0%}"} for name, p in phases.items()],
+                use_container_width=True, hide_index=True,
             )
-            assumptions = Assumptions(rules_version="2025.v1")
-
-            try:
-                result = run(
-                    profile, inputs, assumptions,
-                    state_rate=state_rate_pct, local_rate=local_rate_pct,
-                    senior_bill_on=senior_bill_on, round_whole=round_whole,
-                    std_override=(std_override if std_override > 0 else None),
-                    strategy=strategy
-                )
-
-                df = result["table"] if isinstance(result, dict) and "table" in result else result
-                st.subheader("📊 Projection Results")
-                st.dataframe(df, use_container_width=True)
-            except Exception as e:
-                st.error("Projection failed. Details below.")
-                st.exception(e)
+            cs = projection_cache().stats()
+            st.caption(f"Result cache: {cs['entries']} entries ({cs['bytes'] / 1024:.0f} KB), "
+                       f"{cs['hits']} hits / {cs['misses']} misses ({cs['hit_rate']:.0%}), "
+                       f"{cs['evictions']} evicted")
+            if store is not None:
+                ds = store.stats()
+                st.caption(f"Scenario store: {ds['scenarios']} scenarios, {ds['results']} results "
+                           f"({ds['result_bytes'] / 1024:.0f} KB), {ds['hits']} hits / {ds['misses']} misses, "
+                           f"{ds['invalidated']} invalidated by rules changes")
+            if not {"cache_hit", "store_hit"} & set(phases):
+                projector = ss.projector
+                st.caption(f"Incremental projection resumed at year index {projector.last_restart} "
+                           f"({projector.stats['years_reused']} years reused across "
+                           f"{projector.stats['runs']} runs)")
     else:
         st.caption("Choose Manual or Strategy, set your inputs, then click **Run Projection**.")
+
+    saved = store.list(named_only=True) if store is not None else []
+    if saved:
+        with st.expander(f"Saved scenarios ({len(saved)})"):
+            labels = {s["id"]: f"{s['name']} ({s['state']}, rules {s['rules_version']})" for s in saved}
+            ids = list(labels)
+            v1, v2 = st.columns(2)
+            with v1:
+                a = st.selectbox("Scenario", ids, format_func=labels.get)
+            with v2:
+                b = st.selectbox("Compare with", [None] + ids, format_func=lambda i: "—" if i is None else labels[i])
+            stored = store.get_results([a] + ([b] if b else []))
+            if a not in stored:
+                st.info("Its stored result was computed under older rules data; run it again to refresh it.")
+            elif b is None:
+                st.dataframe(stored[a].table, use_container_width=True)
+            elif b not in stored:
+                st.info("The comparison's stored result is out of date; run it again to refresh it.")
+            else:
+                st.caption("Year by year, second minus first (years both cover).")
+                st.dataframe(pd.DataFrame(store.diff(a, b)), use_container_width=True, hide_index=True)
+
+
+with tab_profile:
+    profile_tab()
+with tab_accounts:
+    accounts_tab()
+with tab_taxes:
+    taxes_tab()
+with tab_proj:
+    # Polls twice a second while a job runs; otherwise shows the last job's error, if any.
+    st.fragment(job_panel, run_every=0.5 if "job" in st.session_state else None)()
+    projections_tab()
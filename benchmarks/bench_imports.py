@@ -0,0 +1,79 @@
+# benchmarks/bench_imports.py
+# Cold import time of the core engine modules, each measured in a fresh
+# interpreter, with a budget check for CI.
+#
+#   python benchmarks/bench_imports.py                   # measure and print
+#   python benchmarks/bench_imports.py --check           # exit 1 if over budget or pandas got imported
+#   python benchmarks/bench_imports.py --budget-ms 80 --module core.projection
+#
+# "core ms" is the time to import the module after NumPy is already loaded (the
+# part this repo controls); "total ms" includes NumPy. Each figure is the best
+# of --repeats fresh processes. The engine modules must not pull in pandas,
+# pyarrow or streamlit: those load only when a DataFrame/Arrow table is asked for.
+# tests/test_imports.py enforces the same budget under pytest.
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+MODULES = ("core.projection", "core.vectorized", "core.incremental", "core.optimize",
+           "core.montecarlo", "core.backtest", "core.sensitivity", "core.cache", "core.store",
+           "core.batch")
+HEAVY = ("pandas", "pyarrow", "streamlit")
+BUDGET_MS = 75.0
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import numpy
+t1 = time.perf_counter()
+import {module}
+t2 = time.perf_counter()
+print(json.dumps({{"core_ms": (t2 - t1) * 1e3, "total_ms": (t2 - t0) * 1e3,
+                   "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeats: int = 5) -> dict:
+    """Best-of-`repeats` import times of `module` in fresh interpreters, plus heavy modules it loaded."""
+    best = None
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+                             cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout)
+        if best is None or r["core_ms"] < best["core_ms"]:
+            best = r
+    return best
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Measure cold import time of the core modules.")
+    ap.add_argument("--module", action="append", help="module to measure (repeatable; default: all engine modules)")
+    ap.add_argument("--repeats", type=int, default=5, help="fresh interpreters per module (best is kept)")
+    ap.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="allowed core ms per module for --check")
+    ap.add_argument("--check", action="store_true", help="exit 1 if a module is over budget or imports pandas")
+    args = ap.parse_args(argv)
+
+    failures = []
+    print(f"{'module':<20} {'core ms':>9} {'total ms':>9}  heavy")
+    for module in args.module or MODULES:
+        r = measure(module, args.repeats)
+        print(f"{module:<20} {r['core_ms']:>9.1f} {r['total_ms']:>9.1f}  {','.join(r['heavy']) or '-'}")
+        if r["heavy"]:
+            failures.append(f"{module} imports {', '.join(r['heavy'])}")
+        if r["core_ms"] > args.budget_ms:
+            failures.append(f"{module} takes {r['core_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if args.check:
+        for f in failures:
+            print(f"OVER BUDGET {f}")
+        print(f"{len(failures)} problem(s)")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
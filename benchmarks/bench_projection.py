@@ -0,0 +1,180 @@
+# benchmarks/bench_projection.py
+# Timing matrix for core.projection.run with JSON baselines and regression checks.
+#
+#   python benchmarks/bench_projection.py                        # run and print
+#   python benchmarks/bench_projection.py --save                 # write baselines/projection.json
+#   python benchmarks/bench_projection.py --compare              # exit 1 if any case regressed
+#   python benchmarks/bench_projection.py --filter y30 --threshold 0.25
+#
+# Matrix: horizon (10/30/60 years) x accounts (2/10/50) x manual/weights mode x
+# MD rules vs generic flat state x output ("raw": compute only, "table": also
+# build the DataFrame). Each case reports ops/sec (best of timed repeats with GC
+# off, as timeit does) and the peak traced allocation of one call. Baselines are
+# machine-specific: regenerate them with --save on the machine that runs --compare.
+from __future__ import annotations
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# --- make the project root importable when run as a script ---
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+# --------------------------------------------------------------
+
+from core.schema import Profile, Inputs, Assumptions
+from core.projection import run
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "projection.json"
+HORIZONS = (10, 30, 60)
+ACCOUNTS = (2, 10, 50)
+MODES = ("manual", "weights")
+STATES = ("MD", "flat")
+OUTPUTS = ("raw", "table")
+CLASSES = ("pre_tax", "roth", "brokerage", "cash")
+
+
+def household(years: int, n_accounts: int, mode: str):
+    """Deterministic synthetic household with `n_accounts` accounts cycling through the tax classes."""
+    names = [f"acct{j:02d}" for j in range(n_accounts)]
+    plan = []
+    for j, nm in enumerate(names):
+        tc = CLASSES[j % len(CLASSES)]
+        plan.append({"name": nm, "annual": 0.0 if mode == "weights" else 4_000.0 * (j % 3),
+                     "tax_class": tc,
+                     "div_yield_pct": 2.0 if tc == "brokerage" else 0.0,
+                     "realize_gains_pct": 25.0 if tc == "brokerage" else 0.0})
+    inputs = Inputs(
+        start_year=2025, end_year=2025 + years - 1,
+        balances={nm: 100_000.0 + 5_000.0 * j for j, nm in enumerate(names)},
+        returns={nm: 0.03 + 0.001 * (j % 7) for j, nm in enumerate(names)},
+        withdrawals_mode=mode, withdrawals_plan=plan,
+        fixed_withdrawal=0.0, include_roth_in_fixed=False,
+        conversions={"annual": 0.0, "years": 0},
+        social_security={"primary_age": 67, "spouse_age": 65, "primary_month": 1, "spouse_month": 9,
+                         "fra_monthly_primary": 2981.0, "fra_monthly_spouse": 2800.0, "cola": 0.02},
+    )
+    strategy = None
+    if mode == "weights":
+        strategy = {"mode": "weights", "total_withdraw": 6_000.0 * n_accounts,
+                    "weights": {"pre_tax": 0.4, "roth": 0.2, "brokerage": 0.3, "cash": 0.1}}
+    return inputs, strategy
+
+
+def cases(pattern: str | None = None):
+    for years, n_acct, mode, state, output in itertools.product(HORIZONS, ACCOUNTS, MODES, STATES, OUTPUTS):
+        name = f"y{years}-a{n_acct}-{mode}-{state}-{output}"
+        if pattern and pattern not in name:
+            continue
+        yield name, years, n_acct, mode, state, output
+
+
+def bench_case(years: int, n_acct: int, mode: str, state: str, output: str,
+               min_time: float = 0.2, repeats: int = 7) -> dict:
+    profile = Profile("MFJ", "1959-12-31", "1961-09-09", "MD" if state == "MD" else "VA", "Montgomery")
+    inputs, strategy = household(years, n_acct, mode)
+    assumptions = Assumptions(rules_version="2025.v1")
+    kwargs = dict(strategy=strategy)
+    if state == "flat":
+        kwargs.update(state_rate=5.0, local_rate=1.0)
+
+    def call():
+        res = run(profile, inputs, assumptions, **kwargs)
+        if output == "table":
+            res["table"]
+
+    call()  # warm caches (rules, state calculator)
+    n, t = 1, 0.0
+    while True:  # calibrate loop count to ~min_time / repeats per sample
+        t0 = time.perf_counter()
+        for _ in range(n):
+            call()
+        t = time.perf_counter() - t0
+        if t >= min_time / repeats:
+            break
+        n *= 2
+    samples = []
+    gc_was_on = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            for _ in range(n):
+                call()
+            samples.append((time.perf_counter() - t0) / n)
+    finally:
+        if gc_was_on:
+            gc.enable()
+
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sec = min(samples)
+    return {"ops_per_sec": round(1.0 / sec, 2), "ms_per_op": round(sec * 1000.0, 4),
+            "peak_alloc_kb": round(peak / 1024.0, 1)}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Cases whose ops/sec fell more than `threshold` (fraction) below the baseline."""
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        drop = 1.0 - cur["ops_per_sec"] / base["ops_per_sec"]
+        if drop > threshold:
+            regressions.append((name, base["ops_per_sec"], cur["ops_per_sec"], drop))
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark core.projection.run.")
+    ap.add_argument("--filter", default=None, help="only cases whose name contains this text")
+    ap.add_argument("--min-time", type=float, default=0.2, help="seconds of timing per case")
+    ap.add_argument("--save", action="store_true", help=f"write results to {BASELINE.relative_to(ROOT_DIR)}")
+    ap.add_argument("--compare", action="store_true", help="compare with the stored baseline; exit 1 on regression")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed ops/sec drop (fraction) for --compare")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    args = ap.parse_args(argv)
+
+    results = {}
+    print(f"{'case':<32} {'ops/sec':>10} {'ms/op':>9} {'peak KB':>9}")
+    for name, *params in cases(args.filter):
+        r = bench_case(*params, min_time=args.min_time)
+        results[name] = r
+        print(f"{name:<32} {r['ops_per_sec']:>10.1f} {r['ms_per_op']:>9.3f} {r['peak_alloc_kb']:>9.1f}")
+
+    status = 0
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"no baseline at {args.baseline}; run with --save first")
+            return 2
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for name, base, cur, drop in regressions:
+            print(f"REGRESSION {name}: {base:.1f} -> {cur:.1f} ops/sec ({drop:.0%} slower)")
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} across {len(results)} case(s)")
+        status = 1 if regressions else 0
+    if args.save:
+        payload = {"machine": {"python": platform.python_version(), "platform": platform.platform(),
+                               "processor": platform.processor() or platform.machine()},
+                   "results": results}
+        if args.filter and args.baseline.exists():   # keep the other cases when saving a subset
+            old = json.loads(args.baseline.read_text())
+            payload["results"] = {**old.get("results", {}), **results}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        print(f"saved {len(results)} case(s) to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# core/accounts.py
+# Account definitions compiled once per run: parallel per-account fields in
+# account order with integer tax-class codes, so the year loops never re-parse
+# withdrawals_plan, re-lowercase tax classes or rebuild per-class account lists.
+from __future__ import annotations
+from typing import List, Tuple
+
+from .schema import Inputs
+
+# Weights-mode classes, in code order (also the last axis of BatchPlan.weights).
+TAX_CLASSES = ("pre_tax", "roth", "brokerage", "cash")
+PRE_TAX, ROTH, BROKERAGE, CASH, OTHER = 0, 1, 2, 3, 4
+# Account owner codes (withdrawals_plan "owner"); joint/unknown count as primary.
+PRIMARY, SPOUSE = 0, 1
+_SPOUSE_OWNERS = ("hers", "spouse")
+
+
+def class_code(tax_class: str) -> int:
+    tc = str(tax_class).lower()
+    return TAX_CLASSES.index(tc) if tc in TAX_CLASSES else OTHER
+
+
+def owner_code(owner: str | None) -> int:
+    return SPOUSE if str(owner or "").lower() in _SPOUSE_OWNERS else PRIMARY
+
+
+class AccountBook:
+    """
+    Parallel per-account fields (index j = position in inputs.balances):
+    starting balance, return, tax-class code, dividend yield and realized-gain
+    share as fractions, manual annual withdrawal (clipped at 0), owner code
+    (PRIMARY/SPOUSE, whose age drives the account's RMDs), plus
+    `class_index[c]`, the account indices of TAX_CLASSES[c] in account order,
+    and `roth_target`, the first Roth account (Roth conversions land there; -1 if none).
+    Accounts missing from withdrawals_plan are cash with no withdrawal.
+    """
+    __slots__ = ("names", "balances", "returns", "tax_class", "div_yield", "realize",
+                 "annual", "owner", "class_index", "roth_target")
+
+    def __init__(self, names: List[str], balances: List[float], returns: List[float],
+                 tax_class: List[int], div_yield: List[float], realize: List[float],
+                 annual: List[float], owner: List[int]):
+        self.names = names
+        self.balances = balances
+        self.returns = returns
+        self.tax_class = tax_class
+        self.div_yield = div_yield
+        self.realize = realize
+        self.annual = annual
+        self.owner = owner
+        self.class_index: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(j for j, code in enumerate(tax_class) if code == c) for c in range(len(TAX_CLASSES)))
+        self.roth_target = self.class_index[ROTH][0] if self.class_index[ROTH] else -1
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def compile_accounts(inputs: Inputs) -> AccountBook:
+    """Build the AccountBook for one Inputs (balances/returns/withdrawals_plan)."""
+    meta = {str(item.get("name", "")): item for item in (inputs.withdrawals_plan or [])}
+    names = list(inputs.balances.keys())
+    tax_class, div_yield, realize, annual, owner = [], [], [], [], []
+    for nm in names:
+        m = meta.get(nm, {})
+        tax_class.append(class_code(m.get("tax_class", "cash")))
+        div_yield.append(float(m.get("div_yield_pct", 0.0)) / 100.0)
+        realize.append(float(m.get("realize_gains_pct", 0.0)) / 100.0)
+        annual.append(max(0.0, float(m.get("annual", 0.0))))
+        owner.append(owner_code(m.get("owner")))
+    return AccountBook(
+        names=names,
+        balances=[float(inputs.balances[nm]) for nm in names],
+        returns=[float(inputs.returns.get(nm, 0.0)) for nm in names],
+        tax_class=tax_class, div_yield=div_yield, realize=realize, annual=annual, owner=owner,
+    )
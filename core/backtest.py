@@ -0,0 +1,166 @@
+# core/backtest.py
+# Historical sequence-of-returns backtest: slide the projection window across
+# every start year of a stock/bond/bill return history (memory-mapped from
+# data/returns) and run all windows through the batch engine in one pass.
+from __future__ import annotations
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .schema import Profile, Inputs, Assumptions
+from .accounts import CASH, compile_accounts
+from .rules import DATA_DIR
+from .vectorized import prepare_batch, tile_plan, project
+
+HISTORY = DATA_DIR / "returns" / "us_returns.json"
+ASSETS = ("stocks", "bonds", "bills")
+DEFAULT_MIX = {"stocks": 0.6, "bonds": 0.4}
+CASH_MIX = {"bills": 1.0}
+_ALIASES = {"cash": "bills", "bond": "bonds", "stock": "stocks", "equities": "stocks"}
+
+
+def _read_history(src: Path) -> np.ndarray:
+    """(N, 1 + len(ASSETS)) array of [year, returns as fractions] from the JSON history."""
+    with open(src) as f:
+        data = json.load(f)
+    cols = [data["series"].index(a) for a in ASSETS]
+    rows = sorted((int(y), [float(v[c]) / 100.0 for c in cols]) for y, v in data["returns_pct"].items())
+    years = [y for y, _ in rows]
+    if years != list(range(years[0], years[-1] + 1)):
+        raise ValueError(f"{src}: return history must cover consecutive years")
+    return np.array([[y] + r for y, r in rows], dtype=np.float64)
+
+
+def compile_history(src: Path = HISTORY, dst: Path | None = None) -> Path:
+    """Write the JSON history as the .npy that load_history memory-maps."""
+    dst = dst or src.with_suffix(".npy")
+    tmp = dst.with_suffix(".tmp.npy")
+    np.save(tmp, _read_history(src))
+    tmp.replace(dst)
+    return dst
+
+
+@lru_cache(maxsize=None)
+def load_history(src: Path = HISTORY) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (years (N,), returns (N, len(ASSETS)) as fractions). The returns are a
+    read-only memory map of the compiled .npy next to `src`, rebuilt when
+    missing or older than the JSON (or kept in memory if data/ is read-only).
+    """
+    npy = src.with_suffix(".npy")
+    try:
+        if not npy.exists() or npy.stat().st_mtime < src.stat().st_mtime:
+            compile_history(src, npy)
+        arr = np.load(npy, mmap_mode="r")
+    except OSError:
+        arr = _read_history(src)
+    return arr[:, 0].astype(np.int64), arr[:, 1:]
+
+
+def _mix_vector(mix: Dict[str, float]) -> np.ndarray:
+    v = np.zeros(len(ASSETS))
+    for k, w in mix.items():
+        v[ASSETS.index(_ALIASES.get(str(k).lower(), str(k).lower()))] += float(w)
+    total = v.sum()
+    if total <= 0:
+        raise ValueError(f"asset mix has no weight: {mix!r}")
+    return v / total
+
+
+def account_mixes(inputs: Inputs, asset_mix: Dict[str, Any] | None = None) -> np.ndarray:
+    """
+    (A, len(ASSETS)) asset weights per account in `inputs.balances` order. Each
+    account uses, in order: asset_mix[name], its withdrawals_plan "asset_mix",
+    asset_mix["default"], then 100% bills for cash accounts or DEFAULT_MIX (60/40).
+    Weights may be fractions or percentages; they are normalized to sum to 1.
+    """
+    asset_mix = asset_mix or {}
+    meta = {str(m.get("name", "")): m for m in (inputs.withdrawals_plan or [])}
+    book = compile_accounts(inputs)
+    rows = []
+    for nm, code in zip(book.names, book.tax_class):
+        mix = (asset_mix.get(nm) or meta.get(nm, {}).get("asset_mix") or asset_mix.get("default")
+               or (CASH_MIX if code == CASH else DEFAULT_MIX))
+        rows.append(_mix_vector(mix))
+    return np.array(rows)
+
+
+def window_returns(history: np.ndarray, starts: np.ndarray, n_years: int, mix: np.ndarray,
+                   wrap: bool = False) -> np.ndarray:
+    """(W, n_years, A) account returns for windows starting at history rows `starts`."""
+    idx = np.asarray(starts)[:, None] + np.arange(n_years)[None, :]
+    if wrap:
+        idx %= len(history)
+    return np.asarray(history[idx]) @ mix.T
+
+
+def run_backtest(profile: Profile, inputs: Inputs, assumptions: Assumptions,
+                 strategy: Dict[str, Any] | None = None, asset_mix: Dict[str, Any] | None = None,
+                 start_years: Sequence[int] | None = None, wrap: bool = False,
+                 state_rate: float | None = None, local_rate: float | None = None,
+                 std_override: float | None = None, senior_bill_on: bool = True,
+                 progress: Callable[[int, int], None] | None = None) -> Dict[str, Any]:
+    """
+    Replay the plan (inputs.start_year..end_year) once for every historical
+    start year, with each account's return in plan year t taken from history
+    year start + t through its asset mix (see account_mixes; inputs.returns is
+    not used). Only windows that fit in the history run unless `wrap`, which
+    continues from the first year after the last. `start_years` limits the
+    historical start years.
+
+    "Success" means every year's requested withdrawal was fully funded; a
+    window's depletion year is the first plan year with nothing left. Windows
+    are ranked by ending balance (ties: earlier depletion is worse).
+    `progress` is passed to vectorized.project.
+    """
+    plan1 = prepare_batch(profile, [inputs], state_rate=state_rate, local_rate=local_rate,
+                          std_override=std_override, strategies=strategy,
+                          rules_version=assumptions.rules_version, senior_bill_on=senior_bill_on)
+    Y = len(plan1.years)
+    hist_years, history = load_history()
+    N = len(hist_years)
+    starts = np.arange(N) if wrap else np.arange(max(0, N - Y + 1))
+    if start_years is not None:
+        starts = starts[np.isin(hist_years[starts], np.asarray(start_years))]
+    if not len(starts):
+        raise ValueError(f"no {Y}-year window fits in the {hist_years[0]}-{hist_years[-1]} history "
+                         "(shorten the plan, or pass wrap=True)")
+
+    plan = tile_plan(plan1, len(starts))
+    plan.returns = window_returns(history, starts, Y, account_mixes(inputs, asset_mix), wrap)
+    res = project(plan, progress=progress)
+
+    total_bal = res["balances"].sum(axis=2)
+    depleted = total_bal <= 0.005
+    short = res["requested"] - res["withdrawn"] > 0.005
+    ending = total_bal[:, -1]
+    lifetime_tax = res["total_tax"].sum(axis=1)
+    dep_idx = np.where(depleted.any(axis=1), depleted.argmax(axis=1), Y)
+    years = plan1.years
+
+    windows: List[Dict[str, Any]] = []
+    for w, s in enumerate(starts.tolist()):
+        windows.append({
+            "start": int(hist_years[s]),
+            "success": bool(not short[w].any()),
+            "depletion_year": int(years[dep_idx[w]]) if dep_idx[w] < Y else None,
+            "first_shortfall_year": int(years[short[w].argmax()]) if short[w].any() else None,
+            "ending_balance": float(ending[w]),
+            "min_balance": float(total_bal[w].min()),
+            "lifetime_tax": float(lifetime_tax[w]),
+        })
+    order = np.lexsort((dep_idx, ending))   # by ending balance, then earlier depletion first
+    dep_counts = np.bincount(dep_idx[dep_idx < Y], minlength=Y)
+    return {
+        "windows": windows,
+        "n_windows": len(windows),
+        "success_rate": float(np.mean([w["success"] for w in windows])),
+        "worst": windows[int(order[0])],
+        "median": windows[int(order[len(order) // 2])],
+        "best": windows[int(order[-1])],
+        "depletion_by_year": dict(zip(years.tolist(), dep_counts.tolist())),
+        "history": (int(hist_years[0]), int(hist_years[-1])),
+    }
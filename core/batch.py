@@ -0,0 +1,205 @@
+# core/batch.py
+# Headless batch runner: stream household records from JSONL/CSV, project them
+# in a process pool chunk by chunk, and write one output partition per chunk.
+#
+#   python -m core.batch households.jsonl out/ --format parquet --workers 8
+#
+# Each record is {"id", "profile", "inputs", "strategy"?, "assumptions"?, "options"?}
+# (CSV: the same keys as columns, nested values as JSON strings). "options" holds
+# projection.run keywords (state_rate, local_rate, senior_bill_on, round_whole,
+# std_override, time_step). Finished chunks are written atomically, so re-running
+# the same command after a crash skips them and resumes with the first missing
+# partition. Per-chunk errors and the run summary go to out_dir/_meta/, so the
+# output directory itself holds only partitions (pd.read_parquet(out_dir) works).
+from __future__ import annotations
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+from .schema import Profile, Inputs, Assumptions
+from .rules import DEFAULT_RULES_VERSION
+
+FORMATS = ("csv", "parquet")
+RUN_OPTIONS = ("state_rate", "local_rate", "senior_bill_on", "round_whole", "std_override", "time_step")
+META_DIR = "_meta"   # errors-NNNNN.jsonl and summary.json; readers skip "_" paths
+
+
+def iter_records(path: str | os.PathLike) -> Iterator[Dict[str, Any]]:
+    """Yield household records one at a time from a .jsonl or .csv file."""
+    path = Path(path)
+    with open(path, newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                rec = {}
+                for k, v in row.items():
+                    if k in ("profile", "inputs", "strategy", "assumptions", "options"):
+                        rec[k] = json.loads(v) if v else None
+                    else:
+                        rec[k] = v
+                yield rec
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def project_record(rec: Dict[str, Any], rules_version: str = DEFAULT_RULES_VERSION):
+    """Run projection.run for one household record (see the module docstring for its keys)."""
+    from .projection import run
+    opts = {k: v for k, v in (rec.get("options") or {}).items() if k in RUN_OPTIONS}
+    assumptions = Assumptions(**{"rules_version": rules_version, **(rec.get("assumptions") or {})})
+    return run(Profile(**rec["profile"]), Inputs(**rec["inputs"]), assumptions,
+               strategy=rec.get("strategy"), **opts)
+
+
+def _part_name(chunk: int, fmt: str) -> str:
+    return f"part-{chunk:05d}.{fmt}"
+
+
+def _run_chunk(task) -> Dict[str, Any]:
+    """Project one chunk and write its partition (plus errors, if any) atomically."""
+    import pandas as pd
+
+    chunk, records, out_dir, fmt, rules_version = task
+    frames, errors, latencies = [], [], []
+    for i, rec in enumerate(records):
+        hid = str(rec.get("id", f"{chunk}:{i}"))
+        t = time.perf_counter()
+        try:
+            df = project_record(rec, rules_version).to_pandas()
+        except Exception as e:  # one bad household must not sink the chunk
+            errors.append({"id": hid, "error": f"{type(e).__name__}: {e}"})
+            continue
+        finally:
+            latencies.append(time.perf_counter() - t)
+        df.insert(0, "household_id", hid)
+        frames.append(df)
+
+    out_dir = Path(out_dir)
+    err_path = out_dir / META_DIR / f"errors-{chunk:05d}.jsonl"
+    if errors:
+        with open(err_path, "w") as f:
+            f.writelines(json.dumps(e) + "\n" for e in errors)
+    else:
+        err_path.unlink(missing_ok=True)   # from an earlier run of this chunk
+    part = out_dir / _part_name(chunk, fmt)
+    tmp = part.with_name(part.name + ".tmp")
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame({"household_id": []})
+    if fmt == "parquet":
+        table.to_parquet(tmp, index=False)
+    else:
+        table.to_csv(tmp, index=False)
+    os.replace(tmp, part)
+    return {"chunk": chunk, "ok": len(frames), "failed": len(errors), "latencies": latencies}
+
+
+def _chunks(records: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    it = iter(records)
+    while True:
+        block = list(itertools.islice(it, size))
+        if not block:
+            return
+        yield block
+
+
+def run_batch_file(input_path: str | os.PathLike, out_dir: str | os.PathLike, fmt: str = "csv",
+                   workers: int | None = None, chunk_size: int = 200,
+                   rules_version: str = DEFAULT_RULES_VERSION, resume: bool = True) -> Dict[str, Any]:
+    """
+    Project every household in `input_path` into `out_dir`/part-NNNNN.<fmt>.
+    At most 2 x workers chunks are read ahead, so memory is bounded by chunk_size
+    regardless of file size. With resume, chunks whose partition already exists
+    are skipped (chunk numbering follows record order, so use the same input),
+    and half-written part-*.tmp files from a crashed run are deleted.
+    Returns a summary (also written to out_dir/_meta/summary.json).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("parquet output needs pyarrow (pip install pyarrow)") from e
+    out_dir = Path(out_dir)
+    (out_dir / META_DIR).mkdir(parents=True, exist_ok=True)
+    for tmp in out_dir.glob("part-*.tmp"):
+        tmp.unlink()
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    tasks = ((i, block, str(out_dir), fmt, rules_version)
+             for i, block in enumerate(_chunks(iter_records(input_path), chunk_size))
+             if not (resume and (out_dir / _part_name(i, fmt)).exists()))
+
+    ok = failed = chunks = 0
+    latencies: List[float] = []
+    t0 = time.perf_counter()
+
+    def _collect(r):
+        nonlocal ok, failed, chunks
+        ok += r["ok"]
+        failed += r["failed"]
+        chunks += 1
+        latencies.extend(r["latencies"])
+
+    if workers == 1:
+        for task in tasks:
+            _collect(_run_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            pending = set()
+            for task in tasks:
+                pending.add(ex.submit(_run_chunk, task))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        _collect(fut.result())
+            for fut in pending:
+                _collect(fut.result())
+
+    elapsed = time.perf_counter() - t0
+    lat = np.array(latencies) * 1000.0
+    summary = {
+        "households": ok + failed,
+        "succeeded": ok,
+        "failed": failed,
+        "chunks_written": chunks,
+        "elapsed_sec": round(elapsed, 3),
+        "households_per_sec": round((ok + failed) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms_p50": round(float(np.percentile(lat, 50)), 3) if lat.size else None,
+        "latency_ms_p99": round(float(np.percentile(lat, 99)), 3) if lat.size else None,
+    }
+    with open(out_dir / META_DIR / "summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m core.batch",
+                                 description="Project households from JSONL/CSV into partitioned CSV/Parquet.")
+    ap.add_argument("input", help="households .jsonl or .csv")
+    ap.add_argument("out_dir", help="output directory (part-NNNNN files; errors and summary in _meta/)")
+    ap.add_argument("--format", choices=FORMATS, default="csv")
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: CPU count; 1 = in-process)")
+    ap.add_argument("--chunk-size", type=int, default=200, help="households per partition")
+    ap.add_argument("--rules-version", default=DEFAULT_RULES_VERSION)
+    ap.add_argument("--no-resume", action="store_true", help="recompute chunks that already have output")
+    args = ap.parse_args(argv)
+
+    summary = run_batch_file(args.input, args.out_dir, fmt=args.format, workers=args.workers,
+                             chunk_size=args.chunk_size, rules_version=args.rules_version,
+                             resume=not args.no_resume)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
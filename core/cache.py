@@ -0,0 +1,225 @@
+# core/cache.py
+# Content-addressed result cache: canonical hashing of projection inputs and a
+# bounded, thread-safe LRU (entry count, approximate bytes, TTL) with counters.
+from __future__ import annotations
+import dataclasses
+import hashlib
+import json
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from .rules import rules_digest
+
+HASH_FORMAT = "v1"  # bump when the canonical form changes
+
+
+def _canonical(obj: Any) -> Any:
+    """JSON-safe canonical form: sorted dict keys, tuples as lists, all numbers as floats."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {"__type__": type(obj).__name__,
+                **{f.name: _canonical(getattr(obj, f.name)) for f in dataclasses.fields(obj)}}
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return [_canonical(v) for v in obj.tolist()]
+    if isinstance(obj, (bool, np.bool_)):
+        return bool(obj)
+    if isinstance(obj, (int, float, np.integer, np.floating)):
+        x = float(obj)
+        return repr(x) if not math.isfinite(x) else (0.0 if x == 0 else x)
+    if obj is None or isinstance(obj, str):
+        return obj
+    return repr(obj)
+
+
+def canonical_hash(*parts: Any) -> str:
+    """
+    Stable SHA-256 over dataclasses/dicts/lists/scalars. Equal content gives equal
+    hashes regardless of dict order or int-vs-float spelling (1 == 1.0).
+    """
+    blob = json.dumps([HASH_FORMAT] + [_canonical(p) for p in parts],
+                      sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _size_of(value: Any) -> int:
+    """Approximate in-memory size (DataFrames/arrays counted by their buffers)."""
+    if isinstance(value, dict):
+        return sum(_size_of(v) for v in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_size_of(v) for v in value) + sys.getsizeof(value)
+    if hasattr(value, "memory_usage"):      # pandas
+        return int(np.sum(value.memory_usage(deep=True)))
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Bounded LRU keyed by canonical_hash. Evicts least-recently-used entries past
+    `max_entries` or `max_bytes`, and drops entries older than `ttl_seconds`.
+    Safe to share across threads (e.g. Streamlit sessions); concurrent misses on
+    the same key compute once and the other callers wait for that result.
+    Cached values are shared, so callers must treat them as read-only. Values
+    that grow after put (a ProjectionResult whose table gets built) are
+    re-measured on every hit, or explicitly with resize(key).
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int | None = 256 * 2**20,
+                 ttl_seconds: float | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple] = OrderedDict()   # key -> (stored_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _drop(self, key: str) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while self._data and (len(self._data) > self.max_entries
+                              or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            self._drop(next(iter(self._data)))
+            self.evictions += 1
+
+    def _resize(self, key: str) -> None:
+        stored_at, size, value = self._data[key]
+        new = _size_of(value)
+        if new != size:
+            self._data[key] = (stored_at, new, value)
+            self._bytes += new - size
+
+    def _lookup(self, key: str):
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+        if self.ttl_seconds is not None and time.monotonic() - item[0] > self.ttl_seconds:
+            self._drop(key)
+            self.expirations += 1
+            return False, None
+        self._data.move_to_end(key)
+        self._resize(key)
+        self._evict()   # `key` is now the most recent entry, so it goes last
+        return True, item[2]
+
+    def resize(self, key: str) -> None:
+        """Re-measure an entry whose value grew since put (then evict past max_bytes)."""
+        with self._lock:
+            if key in self._data:
+                self._resize(key)
+                self._evict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def put(self, key: str, value: Any) -> None:
+        size = _size_of(value)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # larger than the whole cache; don't flush everything for it
+            self._data[key] = (time.monotonic(), size, value)
+            self._bytes += size
+            self._evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, computing (once) and storing it on a miss."""
+        while True:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    self.hits += 1
+                    return value
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self.misses += 1
+                    done = self._inflight[key] = threading.Event()
+                    break
+            waiter.wait()   # another caller is computing this key; re-check when it finishes
+        try:
+            value = compute()
+            self.put(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def projection_key(profile, inputs, assumptions, **kwargs) -> str:
+    """Cache key for core.projection.run(profile, inputs, assumptions, **kwargs)."""
+    return canonical_hash("projection.run", profile, inputs, assumptions, kwargs)
+
+
+def result_key(profile, inputs, assumptions, **kwargs) -> str:
+    """
+    cached_run's key: projection_key plus the digest of the rules files in use,
+    so editing a rules table makes earlier results miss instead of waiting out the TTL.
+    """
+    return canonical_hash(projection_key(profile, inputs, assumptions, **kwargs),
+                          rules_digest(assumptions.rules_version, profile.state))
+
+
+def cached_run(cache: ResultCache, profile, inputs, assumptions, runner: Callable | None = None,
+               profiler=None, **kwargs):
+    """
+    core.projection.run through `cache` (keyed by result_key); same arguments,
+    same (shared, read-only) result.
+    `runner` computes misses instead of run (e.g. IncrementalProjector.project).
+    `profiler` (not part of the key) is passed to the runner on a miss; a hit
+    records its lookup time as phase "cache_hit".
+    """
+    if runner is None:
+        from .projection import run as runner
+    key = result_key(profile, inputs, assumptions, **kwargs)
+    if profiler is None:
+        return cache.get_or_compute(key, lambda: runner(profile, inputs, assumptions, **kwargs))
+    missed = []
+
+    def compute():
+        missed.append(True)
+        return runner(profile, inputs, assumptions, profiler=profiler, **kwargs)
+
+    t = profiler.clock()
+    value = cache.get_or_compute(key, compute)
+    if not missed:
+        profiler.lap("cache_hit", t)
+    return value
@@ -0,0 +1,122 @@
+# core/federal.py
+# Federal ordinary-income schedules compiled once per filing status, plus the
+# Social Security taxable-portion formula. Every helper accepts a float or a
+# NumPy array, so the scalar and batch engines share one implementation.
+# The numbers themselves live in data/federal/ (loaded by core/rules.py).
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+FILING_STATUSES = ("MFJ", "SINGLE", "MFS", "HOH")
+NO_BRACKET = -1  # marginal code when taxable income is zero
+
+
+def normalize_status(fs: str | None) -> str:
+    fs = (fs or "MFJ").upper()
+    return fs if fs in FILING_STATUSES else "MFJ"
+
+
+class TaxSchedule:
+    """
+    A progressive schedule with the tax owed at each bracket floor precomputed,
+    so tax(x) = base[i] + (x - floor[i]) * rate[i] for the bracket i holding x.
+    Marginal brackets are integer codes (index into `rates`, NO_BRACKET for 0%).
+    """
+    __slots__ = ("tops", "rates", "floors", "base", "labels", "_tops_arr", "_rates_arr",
+                 "_floors_arr", "_base_arr")
+
+    def __init__(self, brackets: Sequence[Tuple[float, float]]):
+        self.tops = [float(t) for t, _ in brackets]
+        self.rates = [float(r) for _, r in brackets]
+        self.floors = [0.0] + self.tops[:-1]
+        base, acc = [], 0.0
+        for lo, hi, rate in zip(self.floors, self.tops, self.rates):
+            base.append(acc)
+            acc += (hi - lo) * rate
+        self.base = base
+        self.labels = tuple(f"{int(round(r * 100))}%" for r in self.rates)
+        self._tops_arr = np.array(self.tops)
+        self._rates_arr = np.array(self.rates)
+        self._floors_arr = np.array(self.floors)
+        self._base_arr = np.array(self.base)
+
+    def marginal_code(self, taxable):
+        """Bracket index holding `taxable` (NO_BRACKET when taxable <= 0)."""
+        if np.ndim(taxable) == 0:
+            x = float(taxable)
+            return bisect_left(self.tops, x) if x > 0 else NO_BRACKET
+        x = np.asarray(taxable, dtype=float)
+        return np.where(x > 0, np.searchsorted(self._tops_arr, x, side="left"), NO_BRACKET)
+
+    def tax(self, taxable):
+        """Tax on `taxable`; returns (tax, marginal_code) with matching scalar/array shape."""
+        if np.ndim(taxable) == 0:
+            x = float(taxable)
+            if x <= 0:
+                return 0.0, NO_BRACKET
+            i = bisect_left(self.tops, x)
+            return self.base[i] + (x - self.floors[i]) * self.rates[i], i
+        x = np.asarray(taxable, dtype=float)
+        i = np.searchsorted(self._tops_arr, x, side="left")
+        i_safe = np.minimum(i, len(self.tops) - 1)
+        t = self._base_arr[i_safe] + (x - self._floors_arr[i_safe]) * self._rates_arr[i_safe]
+        pos = x > 0
+        return np.where(pos, t, 0.0), np.where(pos, i, NO_BRACKET)
+
+    def rate(self, code):
+        """Numeric marginal rate for a code (0.0 for NO_BRACKET)."""
+        if np.ndim(code) == 0:
+            return self.rates[code] if code >= 0 else 0.0
+        code = np.asarray(code)
+        return np.where(code >= 0, self._rates_arr[np.maximum(code, 0)], 0.0)
+
+    def label(self, code) -> str:
+        return self.labels[code] if code >= 0 else "0%"
+
+    def label_array(self, codes: np.ndarray) -> np.ndarray:
+        return np.array(("0%",) + self.labels)[np.asarray(codes) + 1]
+
+
+def ss_taxable(ss_total, provisional, base: float, adj: float):
+    """Taxable portion of Social Security (up to 85%) for thresholds (base, adj); scalar or array."""
+    if np.ndim(ss_total) == 0 and np.ndim(provisional) == 0:
+        if ss_total <= 0:
+            return 0.0
+        part1 = max(0.0, min(provisional - base, max(0.0, adj - base))) * 0.5
+        part2 = max(0.0, provisional - adj) * 0.85
+        return min(0.85 * ss_total, part1 + part2)
+    part1 = np.maximum(0.0, np.minimum(provisional - base, max(0.0, adj - base))) * 0.5
+    part2 = np.maximum(0.0, provisional - adj) * 0.85
+    return np.where(ss_total <= 0, 0.0, np.minimum(0.85 * ss_total, part1 + part2))
+
+
+class FederalRules:
+    """
+    One rules_version of federal data (see data/federal/*.json), compiled once:
+    a TaxSchedule per filing status, standard deductions, SS thresholds, LTCG rate.
+    Build via core.rules.federal_rules(version), which validates and caches.
+    """
+
+    def __init__(self, data: Dict):
+        self.rules_version = str(data["rules_version"])
+        self.schedules = {fs: TaxSchedule([(float("inf") if top is None else float(top), float(rate))
+                                           for top, rate in data["brackets"][fs]])
+                          for fs in FILING_STATUSES}
+        self.standard_deduction = {fs: float(data["standard_deduction"][fs]) for fs in FILING_STATUSES}
+        self.age_65_addition = float(data["age_65_addition"])
+        self.ss_thresholds = {fs: (float(data["ss_thresholds"][fs][0]), float(data["ss_thresholds"][fs][1]))
+                              for fs in FILING_STATUSES}
+        self.ltcg_rate = float(data["ltcg_rate"])
+
+    def schedule(self, filing_status: str | None) -> TaxSchedule:
+        return self.schedules[normalize_status(filing_status)]
+
+    def std_deduction(self, filing_status: str | None, num65=0):
+        """Standard deduction plus the 65+ addition per qualifying taxpayer (scalar or array num65)."""
+        return self.standard_deduction[normalize_status(filing_status)] + num65 * self.age_65_addition
+
+    def ss_taxable(self, ss_total, provisional, filing_status: str | None):
+        base, adj = self.ss_thresholds[normalize_status(filing_status)]
+        return ss_taxable(ss_total, provisional, base, adj)
@@ -0,0 +1,119 @@
+# core/incremental.py
+# Incremental re-projection: keep the last run's per-year checkpoints and, on an
+# edit, re-run the year loop only from the first year whose inputs changed.
+from __future__ import annotations
+import threading
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from .schema import Profile, Inputs, Assumptions
+from .profiling import Profiler
+from .projection import OUTPUTS
+from .vectorized import BatchPlan, FLOW_KEYS, prepare_batch, simulate, apply_taxes, to_results
+
+# Plan fields the year loop reads for every year (any change restarts at year 0)
+# and per-year fields (a change restarts at the first differing year).
+_STATIC_FIELDS = ("balances", "tax_class", "div_yield", "realize", "manual_wd", "weights_mode", "roth_target",
+                  "owner", "monthly")
+_YEARLY_FIELDS = ("returns", "weights", "total_withdraw", "conversions", "rmd_rate")
+
+
+def first_changed_year(old: BatchPlan, new: BatchPlan) -> int:
+    """
+    Index of the first year whose balances/flows can differ between two plans.
+    Social Security, deductions, filing status and state rules only feed the tax
+    pass, so they never force the loop to re-run. Extending the window returns
+    the old length (only the new years are simulated).
+    """
+    if (old.acct_names != new.acct_names or old.n_scenarios != new.n_scenarios
+            or len(old.years) == 0 or len(new.years) == 0 or old.years[0] != new.years[0]):
+        return 0
+    for f in _STATIC_FIELDS:
+        if not np.array_equal(getattr(old, f), getattr(new, f)):
+            return 0
+    n = min(len(old.years), len(new.years))
+    changed = np.zeros(n, dtype=bool)
+    for f in _YEARLY_FIELDS:
+        a, b = getattr(old, f)[:, :n], getattr(new, f)[:, :n]
+        changed |= (a != b).reshape(a.shape[0], n, -1).any(axis=(0, 2))
+    hit = np.flatnonzero(changed)
+    return int(hit[0]) if hit.size else n
+
+
+class IncrementalProjector:
+    """
+    Drop-in for projection.run that remembers the previous call. Each year's
+    ending balances and flows serve as checkpoints: an edit resumes the year loop
+    from the end of the last unaffected year, and a longer window only simulates
+    the added years. The tax pass (vectorized over all years) always re-runs, so
+    tax-only edits (SS claim age, deductions, state) cost no loop years at all.
+
+    `last_restart` is the year index the most recent call resumed from;
+    `stats` counts simulated vs reused years. Calls are serialized, so threads
+    can share one projector.
+    """
+
+    def __init__(self):
+        self._plan: BatchPlan | None = None
+        self._flows: Dict[str, np.ndarray] | None = None
+        self.last_restart: int | None = None
+        self.stats = {"runs": 0, "years_simulated": 0, "years_reused": 0}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._plan = self._flows = None
+
+    def project(self, profile: Profile, inputs: Inputs, assumptions: Assumptions,
+                state_rate: float | None = None, local_rate: float | None = None,
+                senior_bill_on: bool = True, round_whole: bool = True,
+                std_override: float | None = None, strategy: Dict[str, Any] | None = None,
+                profiler: Profiler | None = None, output: str = "result", time_step: str = "annual",
+                progress: Callable[[int, int], None] | None = None):
+        """
+        Same arguments and result as projection.run. `profiler` phases:
+        plan, simulate, taxes, output. `progress` is passed to the year loop (see
+        vectorized.simulate); if it raises, the checkpoints stay as they were.
+        """
+        if output not in OUTPUTS:
+            raise ValueError(f"output must be one of {OUTPUTS}")
+        with self._lock:
+            if profiler is not None:
+                tp = profiler.clock()
+            plan = prepare_batch(profile, [inputs], state_rate=state_rate, local_rate=local_rate,
+                                 std_override=std_override, strategies=strategy,
+                                 rules_version=assumptions.rules_version, senior_bill_on=senior_bill_on,
+                                 time_step=time_step)
+            Y = len(plan.years)
+            t0 = 0 if self._plan is None else min(first_changed_year(self._plan, plan), Y)
+
+            # New flow arrays sized for this window, reusing the checkpointed prefix.
+            out = {}
+            for k in FLOW_KEYS:
+                shape = (plan.n_scenarios, Y) + ((len(plan.acct_names),) if k == "balances" else ())
+                out[k] = np.zeros(shape)
+                if t0:
+                    out[k][:, :t0] = self._flows[k][:, :t0]
+            init = out["balances"][:, t0 - 1, :] if t0 else None
+            if profiler is not None:
+                tp = profiler.lap("plan", tp)
+            flows = simulate(plan, t0=t0, init_balances=init, out=out, progress=progress)
+            if profiler is not None:
+                tp = profiler.lap("simulate", tp)
+
+            self._plan, self._flows = plan, flows
+            self.last_restart = t0
+            self.stats["runs"] += 1
+            self.stats["years_simulated"] += Y - t0
+            self.stats["years_reused"] += t0
+
+        res = apply_taxes(plan, flows)
+        if profiler is not None:
+            tp = profiler.lap("taxes", tp)
+        result = to_results(plan, res, round_whole)[0]
+        if output == "arrays":
+            result = result.arrays()
+        if profiler is not None:
+            profiler.lap("output", tp)
+        return result
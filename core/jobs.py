@@ -0,0 +1,76 @@
+# core/jobs.py
+# Background execution for long runs (Monte Carlo, optimizers, backtests): a
+# thread pool that hands each job a progress callback. Engines call it as
+# progress(done, total); once the job is cancelled the next call raises
+# Cancelled, so cancellation takes effect at the engine's next checkpoint.
+from __future__ import annotations
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class Cancelled(Exception):
+    """Raised inside a job's engine call once Job.cancel() has been requested."""
+
+
+class Job:
+    """
+    One submitted run. `fraction` is the last reported progress (None until the
+    engine reports, e.g. for engines without a progress hook).
+    """
+    __slots__ = ("label", "future", "fraction", "started", "_cancel")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.future: Future | None = None
+        self.fraction: float | None = None
+        self.started = time.monotonic()
+        self._cancel = threading.Event()
+
+    def report(self, done: float, total: float) -> None:
+        """Progress callback handed to the engine."""
+        if self._cancel.is_set():
+            raise Cancelled(self.label)
+        self.fraction = min(1.0, done / total) if total else None
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()   # still queued: never starts
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def result(self) -> Any:
+        """The engine's return value; raises Cancelled (even if it finished) or the engine's exception."""
+        if self._cancel.is_set() or self.future.cancelled():
+            raise Cancelled(self.label)
+        return self.future.result()
+
+
+class JobRunner:
+    """Thread pool for Jobs. Engines release the GIL in NumPy, so the UI stays responsive."""
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def submit(self, label: str, fn: Callable[..., Any], *args: Any,
+               report: bool = True, **kwargs: Any) -> Job:
+        """Run fn(*args, **kwargs) in the background; with `report`, also pass progress=job.report."""
+        job = Job(label)
+        if report:
+            kwargs["progress"] = job.report
+        job.future = self._pool.submit(fn, *args, **kwargs)
+        return job
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,222 @@
+# core/montecarlo.py
+# Monte Carlo mode: stochastic per-year, per-account returns run through the
+# batch engine, spread across a process pool in fixed-size seeded chunks.
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Sequence
+
+import numpy as np
+
+from .schema import Profile, Inputs, Assumptions
+from .vectorized import prepare_batch, tile_plan, project
+from .streaming import QuantileSketch, RunningMoments
+
+# Default annual volatility by tax class when none is given per account.
+DEFAULT_VOL = {"cash": 0.01}
+DEFAULT_VOL_OTHER = 0.12
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+def account_vols(inputs: Inputs, volatility: float | Dict[str, float] | None) -> np.ndarray:
+    """Per-account annual volatility in `inputs.balances` order."""
+    names = list(inputs.balances.keys())
+    if volatility is not None and not isinstance(volatility, dict):
+        return np.full(len(names), float(volatility))
+    volatility = volatility or {}
+    tcs = {str(m.get("name", "")): str(m.get("tax_class", "cash")).lower()
+           for m in (inputs.withdrawals_plan or [])}
+    return np.array([float(volatility.get(nm, DEFAULT_VOL.get(tcs.get(nm, "cash"), DEFAULT_VOL_OTHER)))
+                     for nm in names])
+
+
+def draw_returns(rng: np.random.Generator, n: int, n_years: int, mean: np.ndarray, vol: np.ndarray,
+                 chol: np.ndarray, distribution: str = "normal") -> np.ndarray:
+    """
+    Draw (n, years, accounts) annual returns with the given arithmetic mean and
+    volatility per account; `chol` is the Cholesky factor of the correlation matrix.
+    - normal: r = mean + vol * z
+    - lognormal: 1 + r is lognormal with the same mean and standard deviation
+    """
+    z = rng.standard_normal((n, n_years, len(mean))) @ chol.T
+    if distribution == "normal":
+        return mean + vol * z
+    if distribution == "lognormal":
+        gross = 1.0 + mean
+        sig2 = np.log1p((vol / gross) ** 2)
+        mu = np.log(gross) - 0.5 * sig2
+        return np.exp(mu + np.sqrt(sig2) * z) - 1.0
+    raise ValueError(f"unknown distribution: {distribution!r}")
+
+
+class PathStats:
+    """
+    Streaming summary of simulated paths: balance/tax quantile sketches and
+    moments per year (and per account), success count and a first-depletion
+    histogram. Size is O(years x accounts) however many paths are folded in.
+    """
+
+    def __init__(self, n_years: int, n_accounts: int):
+        self.paths = 0
+        self.successes = 0
+        self.depletion_counts = np.zeros(n_years, dtype=np.int64)
+        self.account_balance = QuantileSketch((n_years, n_accounts))
+        self.total_balance = QuantileSketch((n_years,))
+        self.total_tax = QuantileSketch((n_years,), min_value=0.01)
+        self.ending_balance = QuantileSketch()
+        self.lifetime_tax = QuantileSketch(min_value=0.01)
+        self.balance_moments = RunningMoments((n_years,))
+        self.tax_moments = RunningMoments((n_years,))
+
+    def add(self, res: Dict[str, np.ndarray]) -> None:
+        """Fold one batch of projected paths (output of vectorized.project)."""
+        total_bal = res["balances"].sum(axis=2)                      # (n, Y)
+        shortfall = res["requested"] - res["withdrawn"] > 0.005      # (n, Y)
+        depleted = total_bal <= 0.005
+        ever = depleted.any(axis=1)
+        lifetime_tax = res["total_tax"].sum(axis=1)
+
+        self.paths += len(total_bal)
+        self.successes += int((~shortfall.any(axis=1)).sum())
+        self.depletion_counts += np.bincount(depleted.argmax(axis=1)[ever],
+                                             minlength=len(self.depletion_counts))
+        self.account_balance.add(res["balances"])
+        self.total_balance.add(total_bal)
+        self.total_tax.add(res["total_tax"])
+        self.ending_balance.add(total_bal[:, -1])
+        self.lifetime_tax.add(lifetime_tax)
+        self.balance_moments.add(total_bal)
+        self.tax_moments.add(res["total_tax"])
+
+    def merge(self, other: "PathStats") -> None:
+        self.paths += other.paths
+        self.successes += other.successes
+        self.depletion_counts += other.depletion_counts
+        for name in ("account_balance", "total_balance", "total_tax", "ending_balance",
+                     "lifetime_tax", "balance_moments", "tax_moments"):
+            getattr(self, name).merge(getattr(other, name))
+
+
+def _simulate_chunk(task: Dict[str, Any]) -> PathStats:
+    """Worker: simulate one chunk of paths with its own seeded stream."""
+    inputs = task["inputs"]
+    plan = prepare_batch(task["profile"], [inputs], state_rate=task["state_rate"],
+                         local_rate=task["local_rate"], std_override=task["std_override"],
+                         strategies=task["strategy"], rules_version=task["rules_version"],
+                         senior_bill_on=task["senior_bill_on"])
+    n = task["n"]
+    rng = np.random.default_rng(task["seed_seq"])
+    mean = plan.returns[0, 0, :]
+    plan = tile_plan(plan, n)
+    plan.returns = draw_returns(rng, n, len(plan.years), mean, task["vol"], task["chol"], task["distribution"])
+
+    res = project(plan)
+    if task["spill_path"]:
+        raw = np.load(task["spill_path"], mmap_mode="r+")
+        raw[task["offset"]:task["offset"] + n] = res["balances"]
+        raw.flush()
+        del raw
+
+    stats = PathStats(len(plan.years), len(plan.acct_names))
+    stats.add(res)
+    return stats
+
+
+def run_monte_carlo(profile: Profile, inputs: Inputs, assumptions: Assumptions,
+                    n_paths: int = 10_000,
+                    volatility: float | Dict[str, float] | None = None,
+                    correlation: Sequence[Sequence[float]] | None = None,
+                    distribution: str = "normal",
+                    seed: int = 0, workers: int | None = None, chunk_size: int = 2_000,
+                    state_rate: float | None = None, local_rate: float | None = None,
+                    std_override: float | None = None, senior_bill_on: bool = True,
+                    strategy: Dict[str, Any] | None = None,
+                    percentiles: Sequence[float] = PERCENTILES,
+                    spill_path: str | None = None,
+                    progress: Callable[[int, int], None] | None = None) -> Dict[str, Any]:
+    """
+    Simulate `n_paths` return paths around `inputs.returns` (the per-account mean).
+
+    Paths are split into chunks of `chunk_size`; chunk k always draws from child k
+    of SeedSequence(seed), so results are bit-identical for any `workers` value.
+    `correlation` is an accounts x accounts matrix in `inputs.balances` order
+    (identity when omitted). `workers=1` runs in-process.
+
+    "Success" means every year's requested withdrawal was fully funded.
+    Percentiles come from streaming sketches (within 1% relative error), so
+    memory does not grow with `n_paths`. Raw per-path balances are kept only if
+    `spill_path` is given: they are written to a (paths, years, accounts)
+    float64 .npy file, readable later with np.load(spill_path, mmap_mode="r").
+    `progress(paths done, n_paths)` is called as each chunk is folded in; if it
+    raises (see core.jobs.Cancelled), chunks not yet started are dropped.
+    """
+    names = list(inputs.balances.keys())
+    A = len(names)
+    corr = np.eye(A) if correlation is None else np.asarray(correlation, dtype=float)
+    if corr.shape != (A, A):
+        raise ValueError(f"correlation must be {A}x{A} (one row per account)")
+    chol = np.linalg.cholesky(corr)
+    vol = account_vols(inputs, volatility)
+
+    n_paths = int(n_paths)
+    n_chunks = -(-n_paths // chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    years = list(range(int(inputs.start_year), int(inputs.end_year) + 1))
+    if spill_path:
+        np.lib.format.open_memmap(spill_path, mode="w+", dtype=np.float64,
+                                  shape=(n_paths, len(years), A)).flush()
+
+    tasks = [{
+        "profile": profile, "inputs": inputs, "strategy": strategy,
+        "rules_version": assumptions.rules_version,
+        "state_rate": state_rate, "local_rate": local_rate, "std_override": std_override,
+        "senior_bill_on": senior_bill_on, "vol": vol, "chol": chol, "distribution": distribution,
+        "n": min(chunk_size, n_paths - k * chunk_size), "seed_seq": seeds[k],
+        "spill_path": spill_path, "offset": k * chunk_size,
+    } for k in range(n_chunks)]
+
+    # Chunks are folded in chunk order, so float moments are reproducible too.
+    stats = PathStats(len(years), A)
+    workers = min(workers or os.cpu_count() or 1, n_chunks)
+    if workers <= 1:
+        for t in tasks:
+            stats.merge(_simulate_chunk(t))
+            if progress is not None:
+                progress(stats.paths, n_paths)
+    else:
+        ex = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for part in ex.map(_simulate_chunk, tasks):
+                stats.merge(part)
+                if progress is not None:
+                    progress(stats.paths, n_paths)
+        except BaseException:
+            ex.shutdown(wait=False, cancel_futures=True)
+            raise
+        ex.shutdown()
+
+    return summarize(stats, years, names, percentiles)
+
+
+def summarize(stats: PathStats, years: Sequence[int], acct_names: Sequence[str],
+              percentiles: Sequence[float] = PERCENTILES) -> Dict[str, Any]:
+    """Turn folded PathStats into plain dicts/lists keyed by percentile and year."""
+    pct = lambda sk: {p: sk.quantile(p / 100.0).tolist() for p in percentiles}
+    acct_q = {p: stats.account_balance.quantile(p / 100.0) for p in percentiles}
+    return {
+        "paths": stats.paths,
+        "success_probability": stats.successes / stats.paths if stats.paths else 0.0,
+        "ending_balance_percentiles": pct(stats.ending_balance),
+        "lifetime_tax_percentiles": pct(stats.lifetime_tax),
+        "depletion_by_year": dict(zip(years, stats.depletion_counts.tolist())),
+        "by_year": {
+            "years": list(years),
+            "balance_percentiles": pct(stats.total_balance),
+            "balance_mean": stats.balance_moments.mean.tolist(),
+            "balance_std": stats.balance_moments.std.tolist(),
+            "tax_percentiles": pct(stats.total_tax),
+            "tax_mean": stats.tax_moments.mean.tolist(),
+        },
+        "accounts": {nm: {p: acct_q[p][:, j].tolist() for p in percentiles}
+                     for j, nm in enumerate(acct_names)},
+    }
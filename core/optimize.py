@@ -0,0 +1,357 @@
+# core/optimize.py
+# Withdrawal strategy optimizer: searches the weights-mode split
+# (pre_tax/roth/brokerage/cash) with batched evaluations through the vector engine,
+# plus a Roth conversion optimizer built on per-year bracket headroom and a
+# Social Security claiming optimizer over month-level claim ages.
+from __future__ import annotations
+from dataclasses import replace
+from itertools import product
+from typing import Any, Callable, Dict, Sequence
+
+import numpy as np
+
+from .schema import Profile, Inputs, Assumptions
+from .federal import normalize_status
+from .social_security import CLAIM_AGE_MONTHS, benefit_stream, claim_grid_streams, claim_start, claim_terms
+from .vectorized import BatchPlan, TAX_CLASSES, PRE_TAX, prepare_batch, tile_plan, project, simulate, apply_taxes
+
+OBJECTIVES = ("min_tax", "max_wealth")
+CLAIM_OBJECTIVES = ("after_tax_income", "ending_wealth")
+
+
+def simplex_grid(step: float, k: int = len(TAX_CLASSES)) -> np.ndarray:
+    """All k-part weight vectors that are multiples of `step` and sum to 1."""
+    n = int(round(1.0 / step))
+    pts = [c + (n - sum(c),) for c in product(range(n + 1), repeat=k - 1) if sum(c) <= n]
+    return np.array(pts, dtype=float) / n
+
+
+def _neighbors(w: np.ndarray, step: float, radius: int = 2) -> np.ndarray:
+    """Points of the `step` grid within `radius` steps of w (per coordinate), on the simplex."""
+    k = len(w)
+    offs = np.array(list(product(range(-radius, radius + 1), repeat=k - 1)), dtype=float) * step
+    pts = np.empty((len(offs), k))
+    pts[:, :-1] = w[:-1] + offs
+    pts[:, -1] = 1.0 - pts[:, :-1].sum(axis=1)
+    pts = np.round(pts / step) * step
+    return pts[(pts >= -1e-9).all(axis=1)].clip(0.0, 1.0)
+
+
+def strategy_metrics(plan: BatchPlan, res: Dict[str, np.ndarray], pre_tax_rate: float) -> Dict[str, np.ndarray]:
+    """
+    Per-scenario summary used to rank strategies:
+    - lifetime_tax: sum of Total Tax over the window
+    - ending_after_tax: ending balances with pre-tax accounts haircut by `pre_tax_rate`
+    - min_spending: worst year of (withdrawals + Social Security - total tax)
+    - max_shortfall: largest gap between requested and funded withdrawals
+    """
+    end = res["balances"][:, -1, :]
+    haircut = np.where(plan.tax_class == PRE_TAX, 1.0 - pre_tax_rate, 1.0)
+    spending = res["withdrawn"] + res["ss_total"] - res["total_tax"]
+    return {
+        "lifetime_tax": res["total_tax"].sum(axis=1),
+        "ending_after_tax": (end * haircut).sum(axis=1),
+        "min_spending": spending.min(axis=1),
+        "max_shortfall": (res["requested"] - res["withdrawn"]).max(axis=1),
+    }
+
+
+def _search(score_fn: Callable[[np.ndarray], np.ndarray], step: float, min_step: float,
+            top_k: int) -> tuple:
+    """
+    Coarse-to-fine simplex search. Scores the full grid at `step`, keeps only the
+    `top_k` finite (feasible) candidates, then re-scores the finer grid around
+    them, halving the step until `min_step`. Returns (best_w, best_score, n_evaluated).
+    """
+    cands = simplex_grid(step)
+    scores = score_fn(cands)
+    seen = {tuple(np.round(c, 6)) for c in cands}
+    n_eval = len(cands)
+    while step / 2.0 >= min_step - 1e-12:
+        keep = np.argsort(scores)[:top_k]
+        keep = keep[np.isfinite(scores[keep])]
+        if not len(keep):
+            break
+        step /= 2.0
+        new = []
+        for w in cands[keep]:
+            for p in _neighbors(w, step):
+                key = tuple(np.round(p, 6))
+                if key not in seen:
+                    seen.add(key)
+                    new.append(p)
+        if not new:
+            continue
+        new = np.array(new)
+        new_scores = score_fn(new)
+        n_eval += len(new)
+        cands = np.vstack([cands[keep], new])
+        scores = np.concatenate([scores[keep], new_scores])
+    best = int(np.argmin(scores))
+    return cands[best], float(scores[best]), n_eval
+
+
+def optimize_weights(profile: Profile, inputs: Inputs, assumptions: Assumptions,
+                     total_withdraw: float, objective: str = "min_tax",
+                     spending_floor: float | None = None, phases: int = 1,
+                     step: float = 0.1, min_step: float = 0.0125, top_k: int = 4,
+                     sweeps: int = 2, pre_tax_rate: float = 0.22, require_funded: bool = True,
+                     state_rate: float | None = None, local_rate: float | None = None,
+                     std_override: float | None = None, senior_bill_on: bool = True) -> Dict[str, Any]:
+    """
+    Find the weights-mode split that minimizes lifetime tax ("min_tax") or
+    maximizes ending after-tax wealth ("max_wealth") for a fixed `total_withdraw`,
+    subject to every year's net spending staying at or above `spending_floor`.
+    With `require_funded`, splits that leave part of `total_withdraw` unfunded
+    (e.g. weight on an empty class) are infeasible.
+
+    With phases > 1 the window is cut into equal blocks, each with its own split,
+    refined by coordinate descent (one batched search per phase per sweep).
+    The returned "strategy" can be passed straight to projection.run.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+    base = {"mode": "weights", "weights": {}, "total_withdraw": float(total_withdraw)}
+    plan1 = prepare_batch(profile, [inputs], state_rate=state_rate, local_rate=local_rate,
+                          std_override=std_override, strategies=base,
+                          rules_version=assumptions.rules_version, senior_bill_on=senior_bill_on)
+    Y = len(plan1.years)
+    phases = max(1, min(int(phases), Y))
+    bounds = np.linspace(0, Y, phases + 1).round().astype(int)
+    phase_of_year = np.searchsorted(bounds[1:], np.arange(Y), side="right")
+
+    def evaluate(schedules: np.ndarray) -> Dict[str, np.ndarray]:
+        """schedules: (M, phases, C) -> metrics for each candidate."""
+        plan = tile_plan(plan1, len(schedules))
+        plan.weights = schedules[:, phase_of_year, :]
+        res = project(plan)
+        return strategy_metrics(plan, res, pre_tax_rate)
+
+    def score(m: Dict[str, np.ndarray]) -> np.ndarray:
+        s = m["lifetime_tax"] if objective == "min_tax" else -m["ending_after_tax"]
+        if spending_floor is not None:
+            s = np.where(m["min_spending"] >= float(spending_floor), s, np.inf)
+        if require_funded:
+            s = np.where(m["max_shortfall"] <= 0.005, s, np.inf)
+        return s
+
+    # Seed every phase with the best single split, then refine phase by phase.
+    w, _, n_eval = _search(lambda c: score(evaluate(np.repeat(c[:, None, :], phases, axis=1))),
+                           step, min_step, top_k)
+    current = np.repeat(w[None, :], phases, axis=0)
+    for _ in range(sweeps if phases > 1 else 0):
+        for k in range(phases):
+            def score_fn(cands, k=k):
+                sched = np.repeat(current[None], len(cands), axis=0)
+                sched[:, k, :] = cands
+                return score(evaluate(sched))
+
+            current[k], _, n = _search(score_fn, step, min_step, top_k)
+            n_eval += n
+
+    best = evaluate(current[None])
+    as_dict = lambda w: {tc: float(round(x, 6)) for tc, x in zip(TAX_CLASSES, w)}
+    strategy = dict(base, weights=as_dict(current[0]))
+    if phases > 1:
+        strategy["schedule"] = [{"from_year": int(plan1.years[bounds[k]]), "weights": as_dict(current[k])}
+                                for k in range(phases)]
+    feasible = bool(np.isfinite(score(best)[0]))
+    return {
+        "strategy": strategy,
+        "weights": strategy["weights"],
+        "schedule": strategy.get("schedule"),
+        "lifetime_tax": float(best["lifetime_tax"][0]),
+        "ending_after_tax": float(best["ending_after_tax"][0]),
+        "min_spending": float(best["min_spending"][0]),
+        "feasible": feasible,
+        "evaluated": n_eval,
+    }
+
+
+def conversion_headroom(plan: BatchPlan, ordinary: np.ndarray, top) -> np.ndarray:
+    """
+    Per scenario and year, the conversion x that lifts the federal ordinary tax
+    base (ordinary + x + taxable SS - std) to `top`, given `ordinary` income
+    without conversions, (S, Y); `top` is a float or an (S, 1) array. Taxable SS is piecewise linear in x, so the base
+    is evaluated at its kinks (provisional income reaching the two thresholds and
+    the 85% cap) and inverted on the segment that crosses `top`; no iteration.
+    """
+    base, adj = plan.fed.ss_thresholds[normalize_status(plan.filing_status)]
+    ss = plan.ss_total
+    prov0 = ordinary + 0.5 * ss
+    kinks = np.stack([np.full_like(prov0, base), np.full_like(prov0, adj),
+                      np.full_like(prov0, base) + 1.7 * ss,
+                      adj + (0.85 * ss - 0.5 * max(0.0, adj - base)) / 0.85], axis=-1) - prov0[..., None]
+    far = (top + plan.std[None, :] + 1.0)[..., None] + np.maximum(kinks, 0.0).max(axis=-1, keepdims=True)
+    x = np.sort(np.concatenate([np.zeros_like(far), np.maximum(kinks, 0.0), far], axis=-1), axis=-1)
+    f = (ordinary[..., None] + x + plan.fed.ss_taxable(ss[..., None], prov0[..., None] + x, plan.filing_status)
+         - plan.std[None, :, None])
+    i = np.clip((f < np.asarray(top)[..., None]).sum(axis=-1), 1, x.shape[-1] - 1)[..., None]
+    x0, x1 = np.take_along_axis(x, i - 1, -1)[..., 0], np.take_along_axis(x, i, -1)[..., 0]
+    f0, f1 = np.take_along_axis(f, i - 1, -1)[..., 0], np.take_along_axis(f, i, -1)[..., 0]
+    slope = np.divide(x1 - x0, f1 - f0, out=np.zeros_like(x0), where=f1 > f0)
+    return np.where(f0 >= top, 0.0, np.maximum(0.0, x0 + (top - f0) * slope))
+
+
+def optimize_conversions(profile: Profile, inputs: Inputs, assumptions: Assumptions,
+                         strategy: Dict[str, Any] | None = None, terminal_rate: float = 0.22,
+                         brackets: Sequence[float] | None = None, fractions: Sequence[float] = (0.5, 1.0),
+                         max_years: int | None = None, passes: int = 2,
+                         state_rate: float | None = None, local_rate: float | None = None,
+                         std_override: float | None = None, senior_bill_on: bool = True,
+                         progress: Callable[[int, int], None] | None = None) -> Dict[str, Any]:
+    """
+    Choose per-year Roth conversions that minimize lifetime tax (federal + state)
+    plus `terminal_rate` x the ending pre-tax balance (the tax still owed on it).
+
+    Candidates are "fill to a fraction of bracket B's top for the first N years",
+    for each bracket rate in `brackets` (default: every finite federal bracket),
+    each N up to `max_years` and each fraction; all are evaluated in one batched
+    projection. Converting changes later balances and flows, so each candidate's
+    headroom is then recomputed from its own projection and re-evaluated
+    (`passes` times). No conversion is always a candidate.
+
+    The returned "conversions" ({"schedule": {year: amount}}) can be assigned to
+    Inputs.conversions as is. `progress(passes done, passes)` follows each pass.
+    """
+    plan1 = prepare_batch(profile, [inputs], state_rate=state_rate, local_rate=local_rate,
+                          std_override=std_override, strategies=strategy,
+                          rules_version=assumptions.rules_version, senior_bill_on=senior_bill_on)
+    plan1.conversions = np.zeros_like(plan1.conversions)
+    Y = len(plan1.years)
+    sched = plan1.fed.schedule(plan1.filing_status)
+    tops = [(r, t) for r, t in zip(sched.rates, sched.tops) if np.isfinite(t)
+            and (brackets is None or any(abs(r - float(b)) < 1e-9 for b in brackets))]
+    n_years = range(1, min(Y, int(max_years) if max_years else Y) + 1)
+    cands = [(r, t, n, float(fr)) for r, t in tops for n in n_years for fr in fractions]
+
+    def objective(plan: BatchPlan, res: Dict[str, np.ndarray]) -> np.ndarray:
+        pre_end = np.where(plan.tax_class == PRE_TAX, res["balances"][:, -1, :], 0.0).sum(axis=1)
+        return res["total_tax"].sum(axis=1) + terminal_rate * pre_end
+
+    base_res = project(plan1)
+    baseline = float(objective(plan1, base_res)[0])
+    if plan1.roth_target[0] < 0 or not cands:
+        return {"conversions": {"schedule": {}}, "objective": baseline, "baseline_objective": baseline,
+                "lifetime_tax": float(base_res["total_tax"].sum()), "target_bracket": None, "evaluated": 1}
+
+    plan = tile_plan(plan1, len(cands))
+    top = np.array([t for _, t, _, _ in cands])[:, None]
+    frac = np.array([fr for *_, fr in cands])[:, None]
+    active = np.arange(Y)[None, :] < np.array([n for _, _, n, _ in cands])[:, None]
+    ordinary = np.repeat(base_res["ordinary_income"], len(cands), axis=0)
+    n_eval, passes = 1, max(1, int(passes))
+    for k in range(passes):
+        plan.conversions = np.where(active, frac * conversion_headroom(plan, ordinary, top), 0.0)
+        res = project(plan)
+        n_eval += len(cands)
+        ordinary = res["ordinary_income"] - res["roth_conversion"]
+        if progress is not None:
+            progress(k + 1, passes)
+
+    score = objective(plan, res)
+    best = int(np.argmin(score))
+    if score[best] >= baseline:
+        return {"conversions": {"schedule": {}}, "objective": baseline, "baseline_objective": baseline,
+                "lifetime_tax": float(base_res["total_tax"].sum()), "target_bracket": None, "evaluated": n_eval}
+    rate, _, n, fr = cands[best]
+    amounts = np.floor(res["roth_conversion"][best] * 100.0) / 100.0   # cents, never past the bracket top
+    return {
+        "conversions": {"schedule": {int(yr): float(a) for yr, a in zip(plan.years, amounts) if a > 0}},
+        "objective": float(score[best]),
+        "baseline_objective": baseline,
+        "lifetime_tax": float(res["total_tax"][best].sum()),
+        "target_bracket": {"rate": rate, "years": n, "fraction": fr},
+        "evaluated": n_eval,
+    }
+
+
+def optimize_claiming(profile: Profile, inputs: Inputs, assumptions: Assumptions,
+                      strategy: Dict[str, Any] | None = None, objective: str = "after_tax_income",
+                      discount_rate: float = 0.0, reinvest_rate: float = 0.03, pre_tax_rate: float = 0.22,
+                      top_n: int = 5, claim_age_months: np.ndarray = CLAIM_AGE_MONTHS,
+                      state_rate: float | None = None, local_rate: float | None = None,
+                      std_override: float | None = None, senior_bill_on: bool = True) -> Dict[str, Any]:
+    """
+    Rank every combination of claim ages, month by month from 62y0m to 70y0m
+    for each spouse (97 x 97 = 9,409 pairs for a couple), by
+    - "after_tax_income": withdrawals + Social Security - total tax, summed over
+      the window (discounted at `discount_rate`), or
+    - "ending_wealth": ending after-tax balances (pre-tax haircut by
+      `pre_tax_rate`) plus each year's after-tax income grown at `reinvest_rate`.
+    Claims that would start before the window are skipped; someone with no
+    claim age left keeps the claim as entered ("as_entered" in the result).
+
+    Claiming only changes Social Security, which feeds the tax pass but not the
+    year loop, so the loop runs once and the tax pass runs for all pairs at once.
+    The returned "social_security" dict (month-level ages via "<who>_age_months")
+    can replace Inputs.social_security.
+    """
+    if objective not in CLAIM_OBJECTIVES:
+        raise ValueError(f"objective must be one of {CLAIM_OBJECTIVES}")
+    plan1 = prepare_batch(profile, [inputs], state_rate=state_rate, local_rate=local_rate,
+                          std_override=std_override, strategies=strategy,
+                          rules_version=assumptions.rules_version, senior_bill_on=senior_bill_on)
+    flows = simulate(plan1)
+    years = plan1.years
+    Y = len(years)
+    ss = inputs.social_security
+    cola = float(ss.get("cola", 0.02))
+
+    def options(who: str, dob: str):
+        """(streams (N, Y), claim descriptions) for one person's claim ages inside the window."""
+        by, bm = (int(x) for x in dob.split("-")[:2])
+        ages = np.asarray(claim_age_months)
+        ages = ages[by + (bm - 1 + ages) // 12 >= years[0]]
+        if ages.size:
+            streams = claim_grid_streams(years, dob, float(ss.get(f"fra_monthly_{who}", 0.0)), cola, ages)
+            claims = []
+            for m in ages.tolist():
+                first_year, month = claim_start(dob, m // 12, m % 12)
+                claims.append({"age": m // 12, "months": m % 12, "start_year": first_year, "start_month": month})
+            return streams, claims
+        base, first_year, month = claim_terms(ss, who, dob)
+        return (benefit_stream(years, first_year, month, base, cola)[None, :],
+                [{"as_entered": True, "start_year": first_year, "start_month": month}])
+
+    grid, you = options("primary", profile.primary_dob)
+    spouse = [None]
+    if profile.spouse_dob:
+        sp_grid, spouse = options("spouse", profile.spouse_dob)
+        grid = (grid[:, None, :] + sp_grid[None, :, :]).reshape(-1, Y)
+    M = len(grid)
+
+    end = flows["balances"][:, -1, :]
+    ending_after_tax = float((end * np.where(plan1.tax_class == PRE_TAX, 1.0 - pre_tax_rate, 1.0)).sum())
+    t = np.arange(Y)
+    weight = (1.0 + discount_rate) ** -t if objective == "after_tax_income" else (1.0 + reinvest_rate) ** (Y - 1 - t)
+
+    def value(res: Dict[str, np.ndarray]) -> np.ndarray:
+        net = (res["withdrawn"] + res["ss_total"] - res["total_tax"]) @ weight
+        return net + ending_after_tax if objective == "ending_wealth" else net
+
+    baseline = float(value(apply_taxes(plan1, flows))[0])
+    res = apply_taxes(replace(plan1, ss_total=grid),
+                      {k: np.broadcast_to(v, (M,) + v.shape[1:]) for k, v in flows.items()})
+    scores = value(res)
+    top = []
+    for k in np.argsort(-scores, kind="stable")[:max(1, int(top_n))].tolist():
+        i, j = divmod(k, len(spouse))
+        top.append({"primary": you[i], "spouse": spouse[j],
+                    "value": float(scores[k]), "lifetime_tax": float(res["total_tax"][k].sum())})
+
+    best = top[0]
+    new_ss = dict(ss)
+    for who in ("primary", "spouse"):
+        c = best[who]
+        if c is not None and not c.get("as_entered"):
+            new_ss.update({f"{who}_age": c["age"], f"{who}_age_months": c["months"]})
+    return {
+        "social_security": new_ss,
+        "primary": best["primary"],
+        "spouse": best["spouse"],
+        "value": best["value"],
+        "baseline_value": baseline,
+        "top": top,
+        "evaluated": M,
+    }
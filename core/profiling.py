@@ -0,0 +1,62 @@
+# core/profiling.py
+# Opt-in per-phase timing for the projection engines. Engines take
+# profiler=None and only touch the clock when one is passed, so the disabled
+# path costs a single `is not None` check per phase.
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Protocol
+
+
+class Collector(Protocol):
+    """Anything with record(phase, seconds) can be attached to a Profiler as a hook."""
+
+    def record(self, phase: str, seconds: float) -> None: ...
+
+
+class Profiler:
+    """
+    Accumulates wall time and call counts per phase, and forwards every sample
+    to optional hooks (Collector objects or plain callables taking (phase, seconds)).
+
+    Engines use the lap pattern, which needs no context-manager allocation:
+        t = prof.clock()
+        ...phase work...
+        t = prof.lap("social_security", t)   # records and restarts the clock
+    Coarse callers can use `with prof.phase("table"): ...`.
+    """
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self, hooks: List[Collector | Callable[[str, float], None]] | None = None):
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.hooks = list(hooks or [])
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        for hook in self.hooks:
+            (hook.record if hasattr(hook, "record") else hook)(phase, seconds)
+
+    def lap(self, phase: str, start: float) -> float:
+        now = time.perf_counter()
+        self.record(phase, now - start)
+        return now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        self.seconds.clear()
+        self.calls.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{phase: {"seconds", "calls", "share"}}, slowest phase first."""
+        total = sum(self.seconds.values()) or 1.0
+        return {p: {"seconds": s, "calls": self.calls[p], "share": s / total}
+                for p, s in sorted(self.seconds.items(), key=lambda kv: -kv[1])}
@@ -1,249 +1,367 @@
 # core/projection.py
 from __future__ import annotations
-import pandas as pd
 from typing import Dict, Any, List, Tuple
 
+import numpy as np
+
 from .schema import Profile, Inputs, Assumptions
-from .rmd import year_to_age
-from .social_security import ss_annual_at_claim, compute_ss_for_year
+from .rmd import year_to_age, rmd_rates
+from .social_security import claim_terms, benefit_stream
+from .rules import DEFAULT_RULES_VERSION, federal_rules
 from .taxes_states.registry import get_state_calculator
+from .accounts import TAX_CLASSES, PRE_TAX, BROKERAGE, PRIMARY, SPOUSE, compile_accounts
+from .profiling import Profiler
+from .result import ProjectionResult, result_columns
+
+# run(output=...): a lazy ProjectionResult, or the plain dict of column arrays.
+OUTPUTS = ("result", "arrays")
+# run(time_step=...): withdrawals and growth applied once a year, or in 12 monthly steps.
+TIME_STEPS = ("annual", "monthly")
+
+# -------- Federal helpers (tables in data/federal, loaded via core/rules.py) --------
+def pick_brackets(fs: str, rules_version: str = DEFAULT_RULES_VERSION):
+    sched = federal_rules(rules_version).schedule(fs)
+    return list(zip(sched.tops, sched.rates))
+
+def fed_tax_piecewise_ordinary(taxable: float, filing_status: str,
+                               rules_version: str = DEFAULT_RULES_VERSION) -> Tuple[float, str]:
+    sched = federal_rules(rules_version).schedule(filing_status)
+    tax, code = sched.tax(taxable)
+    return tax, sched.label(code)
+
+def ss_taxable(ss_total: float, provisional: float, filing_status: str,
+               rules_version: str = DEFAULT_RULES_VERSION) -> float:
+    return federal_rules(rules_version).ss_taxable(ss_total, provisional, filing_status)
+
+def weights_for_year(strategy: Dict[str, Any], year: int) -> Dict[str, float]:
+    """
+    Weights-mode split in effect for `year`. An optional strategy["schedule"] of
+    {"from_year": Y, "weights": {...}} entries overrides strategy["weights"]
+    from each entry's from_year onward.
+    """
+    weights = strategy.get("weights", {})
+    for phase in sorted(strategy.get("schedule") or [], key=lambda p: int(p["from_year"])):
+        if year >= int(phase["from_year"]):
+            weights = phase.get("weights", {})
+    return weights
 
-# -------- Federal helpers (demo bands) --------
-BRACKETS_MFJ = [
-    (100_000, 0.12),
-    (190_750, 0.22),
-    (364_200, 0.24),
-    (462_500, 0.32),
-    (693_750, 0.35),
-    (float("inf"), 0.37),
-]
-BRACKETS_SINGLE = [
-    (47_000, 0.12),
-    (95_000, 0.22),
-    (182_100, 0.24),
-    (231_250, 0.32),
-    (578_100, 0.35),
-    (float("inf"), 0.37),
-]
-STD_AUTO = {"MFJ": 31_500, "MFS": 15_750, "HOH": 22_500, "SINGLE": 15_750}
-AGE_ADD = 1_600  # per 65+ taxpayer
-
-def pick_brackets(fs: str):
-    fs = (fs or "MFJ").upper()
-    if fs in ("SINGLE","HOH","MFS"):
-        return BRACKETS_SINGLE
-    return BRACKETS_MFJ
-
-def fed_tax_piecewise_ordinary(taxable: float, filing_status: str) -> Tuple[float, str]:
-    if taxable <= 0:
-        return 0.0, "0%"
-    tax = 0.0
-    marginal = "0%"
-    prev_top, rem = 0.0, taxable
-    for top, rate in pick_brackets(filing_status):
-        span = max(0.0, min(rem, top - prev_top))
-        if span > 0:
-            tax += span * rate
-            rem -= span
-            prev_top = top
-            marginal = f"{int(rate*100)}%"
-        if rem <= 0:
-            break
-    return max(0.0, tax), marginal
-
-def ss_taxable(ss_total: float, provisional: float, filing_status: str) -> float:
-    if ss_total <= 0:
-        return 0.0
-    if filing_status.upper() == "MFJ":
-        base, adj = 32_000, 44_000
-    else:
-        base, adj = 25_000, 34_000
-    part1 = max(0.0, min(provisional - base, max(0.0, adj - base))) * 0.5
-    part2 = max(0.0, provisional - adj) * 0.85
-    return min(0.85 * ss_total, part1 + part2)
+def conversions_for_years(conversions: Dict[str, Any] | None, years: List[int]) -> List[float]:
+    """
+    Requested Roth conversion per year from Inputs.conversions:
+    {"annual": X, "years": N} converts X in each of the first N years, and an
+    optional {"schedule": {year: amount}} sets specific years (overriding annual).
+    """
+    conversions = conversions or {}
+    annual = float(conversions.get("annual", 0.0) or 0.0)
+    n = int(conversions.get("years", 0) or 0)
+    out = [annual if i < n else 0.0 for i in range(len(years))]
+    sched = {int(y): float(a) for y, a in (conversions.get("schedule") or {}).items()}
+    if sched:
+        out = [sched.get(int(yr), amt) for yr, amt in zip(years, out)]
+    return [max(0.0, a) for a in out]
+
+# -------- Monthly time step --------
+def monthly_rates(annual) -> np.ndarray:
+    """Monthly return that compounds to each annual return: (1 + r) ** (1/12) - 1."""
+    return np.power(np.maximum(0.0, 1.0 + np.asarray(annual, dtype=float)), 1.0 / 12.0) - 1.0
+
+def monthly_year(start, w, growth) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Twelve monthly steps, elementwise over balances `start`: withdraw `w` at the
+    start of each month (whatever is left once that falls short), then multiply
+    by `growth`. Twelve in-place passes over the whole balance array; this beats
+    a closed form over a month axis (cumprod/cumsum) by an order of magnitude.
+    Returns (ending balances, total withdrawn, sum of the 12 post-withdrawal
+    balances, which is the base for monthly dividends and realized gains).
+    """
+    start, w, growth = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (start, w, growth)))
+    bal = np.maximum(start, 0.0)
+    taken = np.zeros_like(bal)
+    invested = np.zeros_like(bal)
+    x = np.empty_like(bal)
+    for _ in range(12):
+        np.minimum(bal, w, out=x)
+        bal -= x
+        taken += x
+        invested += bal
+        bal *= growth
+    return bal, taken, invested
 
 # -------- Engine --------
 def run(profile: Profile, inputs: Inputs, assumptions: Assumptions,
         state_rate: float | None = None, local_rate: float | None = None,
         senior_bill_on: bool = True, round_whole: bool = True,
         std_override: float | None = None,
-        strategy: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        strategy: Dict[str, Any] | None = None,
+        profiler: Profiler | None = None,
+        output: str = "result", time_step: str = "annual") -> ProjectionResult | Dict[str, np.ndarray]:
+    """
+    Project one household year by year. Returns a ProjectionResult; its
+    ["table"] is the familiar DataFrame (core columns, then one per account).
+    With output="arrays", returns the table's columns as a plain dict of
+    unrounded NumPy arrays instead (round_whole does not apply).
+    With time_step="monthly", each year's withdrawals (set from start-of-year
+    balances, RMDs included) are taken in 12 equal monthly amounts, conversions
+    move in January, and balances compound monthly at the equivalent monthly
+    return (see monthly_year); the table stays annual.
+    `profiler` (core.profiling.Profiler) records time per phase: setup,
+    social_security, withdrawals, account_flows, federal_tax, state_tax, output.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {OUTPUTS}")
+    if time_step not in TIME_STEPS:
+        raise ValueError(f"time_step must be one of {TIME_STEPS}")
+    if profiler is not None:
+        tp = profiler.clock()
 
     years = list(range(int(inputs.start_year), int(inputs.end_year) + 1))
     py = int(profile.primary_dob.split("-")[0])
     sy = int(profile.spouse_dob.split("-")[0]) if profile.spouse_dob else None
 
-    # SS bases (FRA monthly at 67 → annual at claim)
-    base_you = ss_annual_at_claim(inputs.social_security.get("fra_monthly_primary", 0.0),
-                                  int(inputs.social_security.get("primary_age", 70)))
-    base_sp  = ss_annual_at_claim(inputs.social_security.get("fra_monthly_spouse", 0.0),
-                                  int(inputs.social_security.get("spouse_age", 65))) if profile.spouse_dob else 0.0
-    cola     = float(inputs.social_security.get("cola", 0.02))
-
-    first_year_you = int(inputs.start_year + (int(inputs.social_security.get("primary_age", 70)) - (inputs.start_year - py)))
-    first_year_sp  = int(inputs.start_year + (int(inputs.social_security.get("spouse_age", 65))  - (inputs.start_year - sy))) if profile.spouse_dob else 9999
-    you_month = int(inputs.social_security.get("primary_month", 1))
-    sp_month  = int(inputs.social_security.get("spouse_month", 9))
-
-    acct_names = list(inputs.balances.keys())
-    balances   = {k: float(v) for k, v in inputs.balances.items()}
-    returns    = {k: float(v) for k, v in inputs.returns.items()}
-
-    # map meta (withdrawals + brokerage settings)
-    meta = {}
-    for item in (inputs.withdrawals_plan or []):
-        nm = str(item.get("name",""))
-        meta[nm] = {
-            "annual": float(item.get("annual", 0.0)),
-            "tax_class": str(item.get("tax_class","cash")).lower(),
-            "div_yield_pct": float(item.get("div_yield_pct", 0.0)),
-            "realize_gains_pct": float(item.get("realize_gains_pct", 0.0)),
-        }
-
-    # State tax function (function-based; for non-MD we feed rates)
-    state_fn = get_state_calculator((profile.state or "").upper(), state_rate=state_rate, local_rate=local_rate)
+    # SS benefit streams for the whole window (FRA monthly at 67 → annual at claim, COLA'd)
+    ss_in = inputs.social_security
+    cola  = float(ss_in.get("cola", 0.02))
+    base, first, month = claim_terms(ss_in, "primary", profile.primary_dob)
+    ss_by_year = benefit_stream(years, first, month, base, cola)
+    if profile.spouse_dob:
+        base, first, month = claim_terms(ss_in, "spouse", profile.spouse_dob)
+        ss_by_year = ss_by_year + benefit_stream(years, first, month, base, cola)
+    ss_by_year = ss_by_year.tolist()
+
+    # Accounts compiled once: parallel per-account lists + per-class index lists
+    book = compile_accounts(inputs)
+    acct_names = book.names
+    n_acct = len(book)
+    balances = list(book.balances)
+    returns, tax_class = book.returns, book.tax_class
+    div_yield, realize_gp = book.div_yield, book.realize
+
+    # Rules for this version: compiled federal schedule + cached state calculator
+    fed = federal_rules(assumptions.rules_version)
+    fed_sched = fed.schedule(profile.filing_status)
+
+    # State tax function (rules table for the state, or flat override rates)
+    state_fn = get_state_calculator((profile.state or "").upper(), state_rate=state_rate, local_rate=local_rate,
+                                    county=profile.county, rules_version=assumptions.rules_version,
+                                    senior=senior_bill_on, filing_status=profile.filing_status)
 
     # Strategy (weights) or manual
     strategy = strategy or {"mode":"manual","weights":{},"total_withdraw":0.0}
     mode = strategy.get("mode","manual")
+    if mode != "manual":
+        # per-year class targets: want_total * weight, in TAX_CLASSES order
+        want_total = float(strategy.get("total_withdraw", 0.0))
+        class_targets = [[want_total * float(weights_for_year(strategy, yr).get(tc, 0.0)) for tc in TAX_CLASSES]
+                         for yr in years]
+    wd_w = [0.0] * n_acct
 
-    rows = []
-    for yr in years:
+    # RMDs: per-owner rate schedules (1/divisor by year) and that owner's pre-tax
+    # accounts; an account whose owner has no DOB follows the primary.
+    rmd_you = rmd_rates(profile.primary_dob, years)
+    rmd_groups = [(rates, idx) for rates, idx in (
+        (rmd_you, tuple(j for j in book.class_index[PRE_TAX] if book.owner[j] == PRIMARY)),
+        (rmd_rates(profile.spouse_dob, years) if profile.spouse_dob else rmd_you,
+         tuple(j for j in book.class_index[PRE_TAX] if book.owner[j] == SPOUSE))) if idx and any(rates)]
+
+    # Roth conversions: pre-tax -> first Roth account, after withdrawals, before growth
+    conv_req = conversions_for_years(inputs.conversions, years)
+    pre_idx, roth_j = book.class_index[PRE_TAX], book.roth_target
+    conv_adj = [0.0] * n_acct
+
+    # Monthly time step: per-account monthly growth factors and dividend / realized-gain rates
+    monthly = time_step == "monthly"
+    if monthly:
+        is_bro = np.array(tax_class) == BROKERAGE
+        is_pre = np.array(tax_class) == PRE_TAX
+        g_month = monthly_rates(returns)
+        real_month = np.where(is_bro, np.maximum(0.0, g_month) * np.array(realize_gp), 0.0)
+        growth_month = 1.0 + g_month - real_month
+        div_month = np.where(is_bro, np.array(div_yield), 0.0) / 12.0
+
+    # Output columns, preallocated and filled in place (rounded once, on output)
+    Y = len(years)
+    out = {k: np.zeros(Y) for k in ("ss_total", "rmd", "roth_conversion", "ordinary_income", "ltcg_income", "total_income",
+                                    "taxable_total", "federal_tax", "state_tax", "total_tax",
+                                    "effective_rate")}
+    std_col = np.zeros(Y)
+    ages_you = np.zeros(Y, dtype=np.int64)
+    ages_sp = np.zeros(Y, dtype=np.int64) if profile.spouse_dob else None
+    labels = [""] * Y
+    bal_out = np.zeros((Y, len(acct_names)))
+
+    if profiler is not None:
+        tp = profiler.lap("setup", tp)
+
+    for t, yr in enumerate(years):
         age_you = year_to_age(py, int(inputs.start_year), yr)
         age_sp  = year_to_age(sy, int(inputs.start_year), yr) if profile.spouse_dob else None
 
         # Social Security
-        ss_you = compute_ss_for_year(yr, first_year_you, you_month, base_you, cola)
-        ss_sp  = compute_ss_for_year(yr, first_year_sp,  sp_month,  base_sp,  cola) if profile.spouse_dob else 0.0
-        ss_total = ss_you + ss_sp
+        ss_total = ss_by_year[t]
+        if profiler is not None:
+            tp = profiler.lap("social_security", tp)
 
         # Determine withdrawals this year
-        wd_map = {}  # {name: amount}
         if mode == "manual":
-            for nm in acct_names:
-                wd_map[nm] = float(meta.get(nm, {}).get("annual", 0.0))
+            wd_req = book.annual
         else:
-            # weights mode: split strategy["total_withdraw"] across tax classes
-            want_total = float(strategy.get("total_withdraw", 0.0))
-            weights = strategy.get("weights", {})
-            by_class_target = {
-                "pre_tax":  want_total * float(weights.get("pre_tax", 0.0)),
-                "roth":     want_total * float(weights.get("roth", 0.0)),
-                "brokerage":want_total * float(weights.get("brokerage", 0.0)),
-                "cash":     want_total * float(weights.get("cash", 0.0)),
-            }
-            # build list of accounts per class
-            class_to_accounts = {"pre_tax":[], "roth":[], "brokerage":[], "cash":[]}
-            for nm in acct_names:
-                tc = str(meta.get(nm, {}).get("tax_class","cash")).lower()
-                if tc in class_to_accounts:
-                    class_to_accounts[tc].append(nm)
-            # allocate per class proportional to available balances
-            wd_map = {nm: 0.0 for nm in acct_names}
-            for tc, target in by_class_target.items():
-                names = [n for n in class_to_accounts[tc] if balances.get(n,0.0) > 0]
-                if not names or target <= 0:
+            # weights mode: split each class target across that class's funded
+            # accounts in proportion to their balances
+            wd_req = wd_w
+            for j in range(n_acct):
+                wd_req[j] = 0.0
+            for c, target in enumerate(class_targets[t]):
+                if target <= 0:
                     continue
-                tot_bal = sum(balances[n] for n in names)
+                tot_bal = 0.0
+                for j in book.class_index[c]:
+                    if balances[j] > 0:
+                        tot_bal += balances[j]
                 if tot_bal <= 0:
                     continue
-                for n in names:
-                    share = balances[n] / tot_bal
-                    wd_map[n] += min(balances[n], target * share)
+                for j in book.class_index[c]:
+                    if balances[j] > 0:
+                        wd_req[j] = min(balances[j], target * (balances[j] / tot_bal))
 
-        # Apply withdrawals + brokerage flows (before growth)
+        # RMDs: each owner's pre-tax withdrawals must reach their RMD; any shortfall
+        # is taken pro rata from what is left in that owner's pre-tax accounts.
+        rmd_total = 0.0
+        for rates, idx in rmd_groups:
+            rate = rates[t]
+            if rate <= 0:
+                continue
+            need = taken = 0.0
+            for j in idx:
+                need += balances[j] * rate
+                taken += min(balances[j], wd_req[j])
+            rmd_total += need
+            short = need - taken
+            if short <= 0:
+                continue
+            if wd_req is book.annual:
+                wd_w[:] = book.annual
+                wd_req = wd_w
+            room = 0.0
+            for j in idx:
+                room += balances[j] - min(balances[j], wd_req[j])
+            if room <= 0:
+                continue
+            for j in idx:
+                wd_req[j] = min(balances[j], wd_req[j]) + short * (balances[j] - min(balances[j], wd_req[j])) / room
+
+        if profiler is not None:
+            tp = profiler.lap("withdrawals", tp)
+
+        converted = 0.0
+        if conv_req[t] > 0 and roth_j >= 0:
+            tot_pre = 0.0
+            for j in pre_idx:
+                conv_adj[j] = max(0.0, balances[j] - min(balances[j], wd_req[j]))
+                tot_pre += conv_adj[j]
+            if tot_pre > 0:
+                converted = min(conv_req[t], tot_pre)
+                for j in pre_idx:
+                    conv_adj[j] = -converted * (conv_adj[j] / tot_pre)
+                conv_adj[roth_j] = converted
+
+        # Apply withdrawals + conversions + brokerage flows (before growth)
         ordinary_income_from_wd = 0.0
         div_income = 0.0
         ltcg_income = 0.0
-        end_cols = {}
-
-        for nm in acct_names:
-            bal0 = balances.get(nm, 0.0)
-            ret  = returns.get(nm, 0.0)
-            m    = meta.get(nm, {"annual":0.0,"tax_class":"cash","div_yield_pct":0.0,"realize_gains_pct":0.0})
-            tax_class  = str(m.get("tax_class","cash")).lower()
-            div_yield  = float(m.get("div_yield_pct", 0.0)) / 100.0
-            realize_gp = float(m.get("realize_gains_pct", 0.0)) / 100.0
-
-            wd_req = max(0.0, float(wd_map.get(nm, 0.0)))
-            wd_taken = min(bal0, wd_req)
+        if monthly:
+            bal0 = np.array(balances)
+            start = np.maximum(0.0, bal0 + np.array(conv_adj)) if converted else bal0
+            end, taken, invested = monthly_year(start, np.minimum(bal0, wd_req) / 12.0, growth_month)
+            if converted:
+                conv_adj = [0.0] * n_acct
+            ordinary_income_from_wd = float(np.where(is_pre, taken, 0.0).sum())
+            div_income = float((invested * div_month).sum())
+            ltcg_income = float((invested * real_month).sum())
+            bal_out[t] = np.where(is_bro, np.maximum(0.0, end), end)
+            balances = bal_out[t].tolist()
+        for j in range(0 if monthly else n_acct):
+            bal0 = balances[j]
+            ret = returns[j]
+            wd_taken = min(bal0, wd_req[j])
             bal_after_wd = max(0.0, bal0 - wd_taken)
+            if converted:
+                bal_after_wd = max(0.0, bal_after_wd + conv_adj[j])
+                conv_adj[j] = 0.0
 
-            # tax character
-            if tax_class == "pre_tax":
+            # tax character: pre-tax withdrawals are ordinary income;
+            # roth/hsa/cash/brokerage withdrawals are not taxable themselves here
+            code = tax_class[j]
+            if code == PRE_TAX:
                 ordinary_income_from_wd += wd_taken
-            # roth/hsa/cash/brokerage wd not taxable themselves here
 
-            if tax_class == "brokerage":
-                div = bal_after_wd * div_yield if div_yield > 0 else 0.0
+            if code == BROKERAGE:
+                div = bal_after_wd * div_yield[j] if div_yield[j] > 0 else 0.0
                 div_income += div
                 growth = bal_after_wd * ret
-                realized = max(0.0, growth) * realize_gp if realize_gp > 0 else 0.0
+                realized = max(0.0, growth) * realize_gp[j] if realize_gp[j] > 0 else 0.0
                 ltcg_income += realized
                 end_bal = max(0.0, bal_after_wd + growth - realized)
             else:
                 end_bal = bal_after_wd * (1.0 + ret)
 
-            end_cols[nm] = end_bal
-            balances[nm] = end_bal
+            bal_out[t, j] = end_bal
+            balances[j] = end_bal
+
+        if profiler is not None:
+            tp = profiler.lap("account_flows", tp)
 
         # Income buckets
-        ordinary_income = ordinary_income_from_wd + div_income
+        ordinary_income = ordinary_income_from_wd + div_income + converted
         provisional     = ordinary_income + 0.5 * ss_total
-        ss_taxable_amt  = ss_taxable(ss_total, provisional, profile.filing_status)
+        ss_taxable_amt  = fed.ss_taxable(ss_total, provisional, profile.filing_status)
         total_income    = ordinary_income + ss_total + ltcg_income
 
         # Standard deduction
+        num65 = (1 if age_you>=65 else 0) + (1 if (age_sp and age_sp>=65) else 0)
         if std_override is not None:
             std = float(std_override)
         else:
-            base_std = STD_AUTO.get(profile.filing_status.upper(), STD_AUTO["MFJ"])
-            num65 = (1 if age_you>=65 else 0) + (1 if (age_sp and age_sp>=65) else 0)
-            std = base_std + num65*AGE_ADD
+            std = fed.std_deduction(profile.filing_status, num65)
 
         ordinary_tax_base = max(0.0, (ordinary_income + ss_taxable_amt) - std)
         taxable_total     = max(0.0, ordinary_income + ss_taxable_amt + ltcg_income - std)
         ltcg_tax_base     = max(0.0, taxable_total - ordinary_tax_base)
 
-        fed_ord_tax, marginal = fed_tax_piecewise_ordinary(ordinary_tax_base, profile.filing_status)
-        fed_ltcg_tax = ltcg_tax_base * 0.15  # simple placeholder
+        fed_ord_tax, marginal_code = fed_sched.tax(ordinary_tax_base)
+        marginal = fed_sched.label(marginal_code)
+        fed_ltcg_tax = ltcg_tax_base * fed.ltcg_rate  # flat placeholder rate from rules
         fed_tax = fed_ord_tax + fed_ltcg_tax
+        if profiler is not None:
+            tp = profiler.lap("federal_tax", tp)
 
-        state_tax = float(state_fn(taxable_total))
+        state_tax = float(state_fn(taxable_total, num65=num65,
+                                   agi=ordinary_income + ss_taxable_amt + ltcg_income,
+                                   ss_taxable=ss_taxable_amt, retirement_income=ordinary_income_from_wd))
         total_tax = fed_tax + state_tax
+        if profiler is not None:
+            tp = profiler.lap("state_tax", tp)
+
+        ages_you[t] = age_you
+        if ages_sp is not None:
+            ages_sp[t] = age_sp
+        std_col[t] = std
+        labels[t] = marginal
+        out["ss_total"][t] = ss_total
+        out["rmd"][t] = rmd_total
+        out["roth_conversion"][t] = converted
+        out["ordinary_income"][t] = ordinary_income
+        out["ltcg_income"][t] = ltcg_income
+        out["total_income"][t] = total_income
+        out["taxable_total"][t] = taxable_total
+        out["federal_tax"][t] = fed_tax
+        out["state_tax"][t] = state_tax
+        out["total_tax"][t] = total_tax
+        out["effective_rate"][t] = (total_tax / total_income) if total_income > 0 else 0.0
+        if profiler is not None:
+            tp = profiler.lap("output", tp)
 
-        row = {
-            "Year": yr,
-            "Your Age": age_you,
-            "Spouse Age": age_sp,
-            "Social Security": round(ss_total, 2),
-            "Income (Ordinary)": round(ordinary_income, 2),
-            "LTCG Income": round(ltcg_income, 2),
-            "Total Income": round(total_income, 2),
-            "Standard Deduction": round(std, 2),
-            "Taxable Income (Fed)": round(taxable_total, 2),
-            "Marginal Bracket": marginal,
-            "Federal Tax": round(fed_tax, 2),
-            "State Tax": round(state_tax, 2),
-            "Total Tax": round(total_tax, 2),
-            "Effective Tax Rate": round((total_tax / total_income) if total_income > 0 else 0.0, 4),
-        }
-        for k, v in end_cols.items():
-            row[k] = round(v, 2)
-        rows.append(row)
-
-    df = pd.DataFrame(rows)
-    core_cols = [
-        "Year","Your Age","Spouse Age","Social Security",
-        "Income (Ordinary)","LTCG Income","Total Income",
-        "Standard Deduction","Taxable Income (Fed)","Marginal Bracket",
-        "Federal Tax","State Tax","Total Tax","Effective Tax Rate",
-    ]
-    acct_cols = [c for c in df.columns if c not in core_cols]
-    df = df[core_cols + acct_cols]
-
-    if round_whole:
-        num_cols = df.select_dtypes(include=["float64","float32","int64","int32"]).columns
-        df[num_cols] = df[num_cols].round(0)
-
-    return {"table": df}
+    cols = result_columns(years, ages_you, ages_sp, std_col, labels, out, acct_names, bal_out)
+    result = cols if output == "arrays" else ProjectionResult(cols, acct_names, round_whole)
+    if profiler is not None:
+        profiler.lap("output", tp)
+    return result
@@ -0,0 +1,194 @@
+# core/result.py
+# Columnar projection result: one typed NumPy array per column, rounded once and
+# turned into a DataFrame (or Arrow table) only when a consumer asks for it.
+from __future__ import annotations
+import json
+import struct
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+CORE_COLS = [
+    "Year","Your Age","Spouse Age","Social Security",
+    "RMD","Roth Conversion","Income (Ordinary)","LTCG Income","Total Income",
+    "Standard Deduction","Taxable Income (Fed)","Marginal Bracket",
+    "Federal Tax","State Tax","Total Tax","Effective Tax Rate",
+]
+# Columns that are not dollar amounts (dollar columns round to cents, or whole dollars).
+_EXACT_COLS = ("Year", "Your Age", "Spouse Age", "Marginal Bracket")
+_RATE_COLS = {"Effective Tax Rate": 4}
+_HEADER_LEN = struct.Struct("<I")   # to_bytes: JSON header length prefix
+
+
+class ProjectionResult:
+    """
+    Result of projection.run: core columns then one balance column per account,
+    stored unrounded as arrays of length Y. Rounding (cents, or whole dollars with
+    round_whole; rates to 4 places) happens once, on first access.
+
+    - result["table"] / result.table: the full DataFrame (built lazily, cached)
+    - result.column(name): one rounded column as an array, without building a frame
+    - result.arrays(): every unrounded column, as a plain dict
+    - to_pandas / to_arrow / to_parquet(columns=...): only the requested columns;
+      Arrow wraps the NumPy buffers without copying numeric columns.
+    """
+    __slots__ = ("_raw", "account_names", "round_whole", "_rounded", "_table")
+
+    def __init__(self, columns: Dict[str, np.ndarray], account_names: Sequence[str], round_whole: bool = True):
+        self._raw = columns
+        self.account_names = list(account_names)
+        self.round_whole = round_whole
+        self._rounded: Dict[str, np.ndarray] = {}
+        self._table = None
+
+    @property
+    def columns(self) -> List[str]:
+        return CORE_COLS + self.account_names
+
+    @property
+    def n_years(self) -> int:
+        return len(self._raw["Year"])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held: the columns, their rounded copies and the DataFrame once built."""
+        n = sum(a.nbytes for a in self._raw.values())
+        n += sum(a.nbytes for k, a in self._rounded.items() if a is not self._raw[k])
+        if self._table is not None:
+            n += int(self._table.memory_usage(deep=True).sum())
+        return n
+
+    def column(self, name: str) -> np.ndarray:
+        """One column as it appears in the table (rounded); the array is shared, don't mutate it."""
+        out = self._rounded.get(name)
+        if out is None:
+            raw = self._raw[name]
+            if name in _EXACT_COLS:
+                out = raw
+            else:
+                out = np.round(raw, _RATE_COLS.get(name, 0 if self.round_whole else 2))
+            self._rounded[name] = out
+        return out
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """The unrounded columns by name, as projection.run(output="arrays") returns them."""
+        return dict(self._raw)
+
+    def to_pandas(self, columns: Sequence[str] | None = None):
+        import pandas as pd
+        names = self.columns if columns is None else list(columns)
+        return pd.DataFrame({c: self.column(c) for c in names}, columns=names)
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = self.to_pandas()
+        return self._table
+
+    def __getitem__(self, key: str):
+        if key == "table":
+            return self.table
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key == "table"
+
+    def keys(self):
+        return ["table"]
+
+    def to_arrow(self, columns: Sequence[str] | None = None):
+        """pyarrow.Table of the requested columns (requires pyarrow)."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("to_arrow/to_parquet need pyarrow (pip install pyarrow)") from e
+        names = self.columns if columns is None else list(columns)
+        arrays = []
+        for c in names:
+            a = self.column(c)
+            arrays.append(pa.array(a.tolist() if a.dtype == object else a))
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def to_parquet(self, path, columns: Sequence[str] | None = None, **kwargs) -> None:
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(columns), path, **kwargs)
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact serialization of the unrounded columns (see from_bytes): a JSON
+        header, then the float and int columns as two contiguous blocks.
+        """
+        kinds, floats, ints, text = [], [], [], {}
+        for name, a in self._raw.items():
+            if a.dtype == object:
+                kind = "none" if all(v is None for v in a) else "text"
+                if kind == "text":
+                    text[name] = [str(v) for v in a]
+            elif a.dtype.kind in "iub":
+                kind = "int"
+                ints.append(a)
+            else:
+                kind = "float"
+                floats.append(a)
+            kinds.append([name, kind])
+        header = json.dumps({"columns": kinds, "text": text, "accounts": self.account_names,
+                             "round_whole": self.round_whole, "years": self.n_years}).encode()
+        return b"".join([_HEADER_LEN.pack(len(header)), header,
+                         np.asarray(floats, dtype=np.float64).tobytes(), np.asarray(ints, dtype=np.int64).tobytes()])
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "ProjectionResult":
+        """Inverse of to_bytes; numeric columns are read-only views into `blob`."""
+        (n,) = _HEADER_LEN.unpack_from(blob)
+        meta = json.loads(blob[_HEADER_LEN.size:_HEADER_LEN.size + n])
+        Y, kinds = meta["years"], meta["columns"]
+        n_float = sum(k == "float" for _, k in kinds)
+        n_int = sum(k == "int" for _, k in kinds)
+        off = _HEADER_LEN.size + n
+        floats = np.frombuffer(blob, np.float64, n_float * Y, off).reshape(n_float, Y)
+        ints = np.frombuffer(blob, np.int64, n_int * Y, off + floats.nbytes).reshape(n_int, Y)
+        cols, fi, ii = {}, 0, 0
+        for name, kind in kinds:
+            if kind == "float":
+                cols[name], fi = floats[fi], fi + 1
+            elif kind == "int":
+                cols[name], ii = ints[ii], ii + 1
+            elif kind == "text":
+                cols[name] = np.array(meta["text"][name], dtype=object)
+            else:
+                cols[name] = np.full(Y, None, dtype=object)
+        return cls(cols, meta["accounts"], meta["round_whole"])
+
+    def __repr__(self) -> str:
+        return f"ProjectionResult(years={self.n_years}, accounts={len(self.account_names)})"
+
+
+def result_columns(years, age_you, age_sp, std, marginal_labels, arrays: Dict[str, np.ndarray],
+                   acct_names: Sequence[str], acct_balances: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Assemble the column dict for ProjectionResult from engine arrays (length Y each;
+    acct_balances is (Y, A)). `age_sp` is None without a spouse.
+    """
+    Y = len(years)
+    cols = {
+        "Year": np.asarray(years, dtype=np.int64),
+        "Your Age": np.asarray(age_you, dtype=np.int64),
+        "Spouse Age": (np.full(Y, None, dtype=object) if age_sp is None
+                       else np.asarray(age_sp, dtype=np.int64)),
+        "Social Security": arrays["ss_total"],
+        "RMD": arrays["rmd"],
+        "Roth Conversion": arrays["roth_conversion"],
+        "Income (Ordinary)": arrays["ordinary_income"],
+        "LTCG Income": arrays["ltcg_income"],
+        "Total Income": arrays["total_income"],
+        "Standard Deduction": np.asarray(std, dtype=float),
+        "Taxable Income (Fed)": arrays["taxable_total"],
+        "Marginal Bracket": np.asarray(marginal_labels, dtype=object),
+        "Federal Tax": arrays["federal_tax"],
+        "State Tax": arrays["state_tax"],
+        "Total Tax": arrays["total_tax"],
+        "Effective Tax Rate": arrays["effective_rate"],
+    }
+    for j, nm in enumerate(acct_names):
+        cols[nm] = acct_balances[:, j]
+    return cols
@@ -0,0 +1,163 @@
+# core/rules.py
+# Versioned tax-rules loader. Reads federal and state tables from data/, validates
+# them once, and caches compiled calculators keyed by (rules_version, state, county).
+from __future__ import annotations
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .federal import FILING_STATUSES, FederalRules
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_RULES_VERSION = "2025.v1"
+
+
+class RulesError(ValueError):
+    """Missing or malformed rules data."""
+
+
+@lru_cache(maxsize=None)
+def _index() -> Dict[str, List[Path]]:
+    """
+    Map jurisdiction -> candidate JSON files from file names alone
+    (federal_<year>.json -> "US", <code>_rates_<year>.json -> code), so
+    listing data/ does not parse every state's table.
+    """
+    found: Dict[str, List[Path]] = {}
+    for path in sorted((DATA_DIR / "federal").glob("federal_*.json")):
+        found.setdefault("US", []).append(path)
+    for path in sorted((DATA_DIR / "states").glob("*_rates_*.json")):
+        found.setdefault(path.name.split("_", 1)[0].upper(), []).append(path)
+    return found
+
+
+# (mtime_ns, size) of each file as _read parsed it; rules_digest compares these
+# with the files on disk to tell when the caches below hold outdated tables.
+_parsed: Dict[Path, Tuple[int, int]] = {}
+
+
+@lru_cache(maxsize=None)
+def _read(path: Path) -> Dict[str, Any]:
+    st = path.stat()
+    with open(path) as f:
+        data = json.load(f)
+    _parsed[path] = (st.st_mtime_ns, st.st_size)
+    return data
+
+
+def _versions(jurisdiction: str) -> Dict[str, Path]:
+    return {str(_read(p).get("rules_version", "")): p for p in _index().get(jurisdiction, [])}
+
+
+def _load(jurisdiction: str, rules_version: str) -> Dict[str, Any]:
+    path = _versions(jurisdiction).get(rules_version)
+    if path is None:
+        raise RulesError(f"no {jurisdiction} rules for version {rules_version!r} "
+                         f"(available: {', '.join(available_versions(jurisdiction)) or 'none'})")
+    return _read(path)
+
+
+def available_versions(jurisdiction: str = "US") -> List[str]:
+    return sorted(_versions(jurisdiction.upper()))
+
+
+def available_states() -> List[str]:
+    return sorted(j for j in _index() if j != "US")
+
+
+def has_rules(jurisdiction: str, rules_version: str) -> bool:
+    j = (jurisdiction or "").upper()
+    return j in _index() and rules_version in _versions(j)
+
+
+def _require(cond: bool, where: str, msg: str) -> None:
+    if not cond:
+        raise RulesError(f"{where}: {msg}")
+
+
+def validate_brackets(where: str, brackets: Any) -> None:
+    """RulesError (prefixed with `where`) unless `brackets` is [[top, rate], ...] with
+    increasing tops, rates in [0, 1) and an unbounded (null) last top."""
+    _require(isinstance(brackets, list) and brackets, where, "brackets must be a non-empty list")
+    prev = 0.0
+    for i, pair in enumerate(brackets):
+        _require(isinstance(pair, list) and len(pair) == 2, where, f"bracket {i} must be [top, rate]")
+        top, rate = pair
+        _require(0.0 <= float(rate) < 1.0, where, f"bracket {i} rate out of range")
+        if i == len(brackets) - 1:
+            _require(top is None, where, "last bracket top must be null (unbounded)")
+        else:
+            _require(top is not None and float(top) > prev, where, "bracket tops must increase")
+            prev = float(top)
+
+
+def validate_federal(data: Dict[str, Any]) -> None:
+    where = f"federal rules {data.get('rules_version')!r}"
+    for key in ("brackets", "standard_deduction", "age_65_addition", "ss_thresholds", "ltcg_rate"):
+        _require(key in data, where, f"missing {key!r}")
+    for fs in FILING_STATUSES:
+        _require(fs in data["brackets"], where, f"no brackets for {fs}")
+        validate_brackets(f"{where} {fs}", data["brackets"][fs])
+        _require(float(data["standard_deduction"].get(fs, -1)) >= 0, where, f"bad standard deduction for {fs}")
+        base, adj = data["ss_thresholds"].get(fs, (None, None))
+        _require(base is not None and adj is not None and float(adj) >= float(base), where,
+                 f"bad ss_thresholds for {fs}")
+
+
+@lru_cache(maxsize=16)
+def federal_rules(rules_version: str = DEFAULT_RULES_VERSION) -> FederalRules:
+    """Compiled federal rules for a version (validated on first use, then cached)."""
+    data = _load("US", rules_version)
+    validate_federal(data)
+    return FederalRules(data)
+
+
+def state_data(state_code: str, rules_version: str = DEFAULT_RULES_VERSION) -> Dict[str, Any]:
+    """Raw state table for a version (parsed once per process)."""
+    return _load((state_code or "").upper(), rules_version)
+
+
+@lru_cache(maxsize=256)
+def state_calculator(rules_version: str, state_code: str, county: str | None = None,
+                     senior: bool = True, filing_status: str = "MFJ") -> Callable:
+    """
+    Compiled state calculator, cached per (rules_version, state, county, senior,
+    filing_status). Only the requested state's module and table are loaded.
+    See taxes_states/registry.py for the calculator call signature.
+    """
+    from .taxes_states.registry import compile_state
+    return compile_state((state_code or "").upper(), state_data(state_code, rules_version),
+                         county=county, senior=senior, filing_status=filing_status)
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path: Path, mtime_ns: int, size: int) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def rules_digest(rules_version: str, state_code: str | None = None) -> str:
+    """
+    SHA-256 over the federal table and the state's table (if any) for a version,
+    for invalidating results computed under older rules data. A file is re-read
+    only when its size or mtime changes; if it changed after it was parsed, the
+    cached tables and calculators are dropped (clear_cache) so the next
+    projection uses the new data.
+    """
+    h = hashlib.sha256(rules_version.encode())
+    for j in ("US", (state_code or "").upper()):
+        path = _versions(j).get(rules_version) if j in _index() else None
+        if path is not None:
+            st = path.stat()
+            if _parsed.get(path, (st.st_mtime_ns, st.st_size)) != (st.st_mtime_ns, st.st_size):
+                clear_cache()
+            h.update(f"{j}:{_file_digest(path, st.st_mtime_ns, st.st_size)}".encode())
+    return h.hexdigest()
+
+
+def clear_cache() -> None:
+    """Forget parsed files and compiled calculators (e.g. after editing data/)."""
+    for fn in (_index, _read, _file_digest, federal_rules, state_calculator):
+        fn.cache_clear()
+    _parsed.clear()
@@ -0,0 +1,137 @@
+# core/sensitivity.py
+# Finite-difference sensitivity of projection outputs to each numeric input,
+# with every perturbed scenario evaluated in one batched projection.
+from __future__ import annotations
+import copy
+from typing import Any, Callable, Dict, List, Tuple
+
+from .schema import Profile, Inputs, Assumptions
+from .accounts import TAX_CLASSES
+from .vectorized import prepare_batch, project
+
+METRICS = ("ending_wealth", "lifetime_tax")
+# Perturbation sizes: absolute for returns/cola/weights/claim ages, relative (fraction) for
+# balances and withdrawals.
+DEFAULT_STEPS = {"return": 0.01, "balance": 0.10, "cola": 0.005, "claim_age": 1,
+                 "withdraw": 0.10, "weight": 0.05}
+
+# An edit applies a signed perturbation to (inputs, strategy) copies in place and
+# returns the input's value after the change.
+Edit = Callable[[Inputs, Dict[str, Any], int], float]
+
+
+def _param_edits(inputs: Inputs, strategy: Dict[str, Any], steps: Dict[str, float],
+                 spouse: bool) -> List[Tuple[str, float, Edit]]:
+    """(label, base value, edit) for every numeric input worth perturbing."""
+    edits: List[Tuple[str, float, Edit]] = []
+    for nm in inputs.balances:
+        def ret(inp, strat, sign, nm=nm):
+            inp.returns[nm] = float(inp.returns.get(nm, 0.0)) + sign * steps["return"]
+            return inp.returns[nm]
+        edits.append((f"Return: {nm}", float(inputs.returns.get(nm, 0.0)), ret))
+    for nm, bal in inputs.balances.items():
+        if float(bal) <= 0:
+            continue
+        def balance(inp, strat, sign, nm=nm):
+            inp.balances[nm] = float(inp.balances[nm]) * (1.0 + sign * steps["balance"])
+            return inp.balances[nm]
+        edits.append((f"Balance: {nm}", float(bal), balance))
+
+    ss = inputs.social_security
+    def cola(inp, strat, sign):
+        inp.social_security["cola"] = float(inp.social_security.get("cola", 0.02)) + sign * steps["cola"]
+        return inp.social_security["cola"]
+    edits.append(("SS COLA", float(ss.get("cola", 0.02)), cola))
+    for who, label, default in (("primary", "Your", 70), ("spouse", "Spouse", 65)):
+        if who == "spouse" and not spouse:
+            continue
+        key = f"{who}_age"
+        def claim(inp, strat, sign, key=key, default=default):
+            age = int(inp.social_security.get(key, default))
+            inp.social_security[key] = int(min(70, max(62, age + sign * int(steps["claim_age"]))))
+            return inp.social_security[key]
+        edits.append((f"{label} claim age", float(ss.get(key, default)), claim))
+
+    if strategy.get("mode", "manual") != "manual":
+        def total(inp, strat, sign):
+            strat["total_withdraw"] = float(strat.get("total_withdraw", 0.0)) * (1.0 + sign * steps["withdraw"])
+            return strat["total_withdraw"]
+        edits.append(("Total withdrawal", float(strategy.get("total_withdraw", 0.0)), total))
+        weights = strategy.get("weights") or {}
+        for tc in TAX_CLASSES:
+            def weight(inp, strat, sign, tc=tc):
+                # move `step` of weight into (or out of) this class, pro rata from the others
+                w = {c: float((strat.get("weights") or {}).get(c, 0.0)) for c in TAX_CLASSES}
+                new = min(1.0, max(0.0, w[tc] + sign * steps["weight"]))
+                others = sum(v for c, v in w.items() if c != tc)
+                scale = (1.0 - new) / others if others > 0 else 0.0
+                strat["weights"] = {c: (new if c == tc else v * scale) for c, v in w.items()}
+                strat.pop("schedule", None)
+                return new
+            edits.append((f"Weight: {tc}", float(weights.get(tc, 0.0)), weight))
+    else:
+        for item in inputs.withdrawals_plan or []:
+            if float(item.get("annual", 0.0)) <= 0 or item.get("name") not in inputs.balances:
+                continue
+            def annual(inp, strat, sign, nm=item["name"]):
+                for it in inp.withdrawals_plan:
+                    if it.get("name") == nm:
+                        it["annual"] = float(it["annual"]) * (1.0 + sign * steps["withdraw"])
+                        return it["annual"]
+            edits.append((f"Withdrawal: {item['name']}", float(item["annual"]), annual))
+    return edits
+
+
+def sensitivity(profile: Profile, inputs: Inputs, assumptions: Assumptions,
+                strategy: Dict[str, Any] | None = None, steps: Dict[str, float] | None = None,
+                state_rate: float | None = None, local_rate: float | None = None,
+                std_override: float | None = None, senior_bill_on: bool = True,
+                progress: Callable[[int, int], None] | None = None) -> Dict[str, Any]:
+    """
+    Perturb each numeric input down and up by its step (DEFAULT_STEPS, overridable
+    via `steps`): per-account returns and balances, SS COLA and claim ages, and
+    the withdrawal level plus class weights (weights mode) or per-account manual
+    withdrawals. The base case and all 2 x inputs scenarios run as one batch.
+
+    Returns {"base": {metric: value}, "params": [...], "tornado": {metric: [...]}}.
+    Each param has its low/high input values, the METRICS at each, "swing"
+    (high - low) and "delta" (central difference per unit of the input; one-sided
+    where a bound clips the step, e.g. claim age 70). Tornado rows are sorted
+    by |swing|, largest first. `progress` is passed to vectorized.project.
+    """
+    steps = dict(DEFAULT_STEPS, **(steps or {}))
+    strategy = copy.deepcopy(strategy or {"mode": "manual", "weights": {}, "total_withdraw": 0.0})
+    edits = _param_edits(inputs, strategy, steps, bool(profile.spouse_dob))
+
+    scen_inputs, scen_strats, ranges = [inputs], [strategy], []
+    for label, base, edit in edits:
+        xs = []
+        for sign in (-1, 1):
+            inp, strat = copy.deepcopy(inputs), copy.deepcopy(strategy)
+            xs.append(edit(inp, strat, sign))
+            scen_inputs.append(inp)
+            scen_strats.append(strat)
+        ranges.append((label, base, xs[0], xs[1]))
+
+    plan = prepare_batch(profile, scen_inputs, state_rate=state_rate, local_rate=local_rate,
+                         std_override=std_override, strategies=scen_strats,
+                         rules_version=assumptions.rules_version, senior_bill_on=senior_bill_on)
+    res = project(plan, progress=progress)
+    values = {"ending_wealth": res["balances"][:, -1, :].sum(axis=1),
+              "lifetime_tax": res["total_tax"].sum(axis=1)}
+
+    base = {m: float(values[m][0]) for m in METRICS}
+    params = []
+    for k, (label, x0, x_lo, x_hi) in enumerate(ranges):
+        lo, hi = 1 + 2 * k, 2 + 2 * k
+        p = {"name": label, "base": x0, "low": x_lo, "high": x_hi}
+        for m in METRICS:
+            f_lo, f_hi = float(values[m][lo]), float(values[m][hi])
+            p[m] = {"low": f_lo, "high": f_hi, "swing": f_hi - f_lo,
+                    "delta": (f_hi - f_lo) / (x_hi - x_lo) if x_hi != x_lo else 0.0}
+        params.append(p)
+
+    tornado = {m: sorted(({"name": p["name"], "low": p[m]["low"] - base[m], "high": p[m]["high"] - base[m],
+                           "swing": p[m]["swing"]} for p in params), key=lambda r: -abs(r["swing"]))
+               for m in METRICS}
+    return {"base": base, "params": params, "tornado": tornado, "scenarios": plan.n_scenarios}
@@ -1,30 +1,103 @@
 # core/social_security.py
-# Helpers for Social Security claiming ages, proration, and COLA adjustments
+# Helpers for Social Security claiming ages, proration, and COLA adjustments,
+# plus whole-horizon benefit streams as arrays (one row per claim age).
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
 
 FRA = 67  # Full Retirement Age (simplified constant)
+CLAIM_AGE_MONTHS = np.arange(62 * 12, 70 * 12 + 1)  # 62y0m .. 70y0m
+
+
+def claim_factor(claim_age_months):
+    """
+    Benefit as a multiple of the FRA amount for a claim age in months (scalar or
+    array): +8%/yr (2/3% per month) after FRA up to 70, -6%/yr (0.5% per month)
+    before FRA with a 0.70 floor; 0 before 62.
+    """
+    years = (np.asarray(claim_age_months, dtype=float) - FRA * 12) / 12.0
+    f = np.where(years >= 0, 1.0 + 0.08 * np.minimum(years, 3), np.maximum(0.70, 1.0 + 0.06 * years))
+    return np.where(years < 62 - FRA, 0.0, f)
 
 
-def ss_annual_at_claim(fra_monthly: float, claim_age: int) -> float:
+def ss_annual_at_claim(fra_monthly: float, claim_age: int, claim_months: int = 0) -> float:
     """
     Compute the annual Social Security benefit at claim age, based on FRA monthly benefit.
     - FRA (67): baseline
     - Delay up to 3 years (to 70): +8% per year
     - Early claim down to 62: ~6% reduction per year
+    `claim_months` (0-11) refines the claim age by month (prorated per month).
     Returns annual benefit (12 * monthly * adjustment).
     """
     if fra_monthly <= 0 or claim_age < 62:
         return 0.0
 
-    if claim_age >= FRA:
-        years = min(claim_age - FRA, 3)
-        factor = 1.0 + 0.08 * years
+    years = claim_age + claim_months / 12.0 - FRA
+    if years >= 0:
+        factor = 1.0 + 0.08 * min(years, 3)
     else:
-        years = FRA - claim_age
-        factor = max(0.70, 1.0 - 0.06 * years)
+        factor = max(0.70, 1.0 + 0.06 * years)
 
     return fra_monthly * 12.0 * factor
 
 
+def claim_start(dob: str, claim_age: int, claim_months: int) -> Tuple[int, int]:
+    """(first benefit year, first benefit month) for a claim at claim_age years + claim_months after `dob`."""
+    by, bm = (int(x) for x in dob.split("-")[:2])
+    idx = bm - 1 + int(claim_months)
+    return by + int(claim_age) + idx // 12, idx % 12 + 1
+
+
+def claim_terms(ss: Dict[str, Any], who: str, dob: str) -> Tuple[float, int, int]:
+    """
+    (annual benefit at claim, first benefit year, first benefit month) for
+    who = "primary" or "spouse" from an Inputs.social_security dict. With
+    "<who>_age_months" the start follows the birth month; otherwise the claim
+    starts in "<who>_month" of the year the claim age is reached.
+    """
+    age = int(ss.get(f"{who}_age", 70 if who == "primary" else 65))
+    fra_monthly = ss.get(f"fra_monthly_{who}", 0.0)
+    if f"{who}_age_months" in ss:
+        months = int(ss[f"{who}_age_months"])
+        first_year, month = claim_start(dob, age, months)
+        return ss_annual_at_claim(fra_monthly, age, months), first_year, month
+    first_year = int(dob.split("-")[0]) + age
+    return ss_annual_at_claim(fra_monthly, age), first_year, int(ss.get(f"{who}_month", 1 if who == "primary" else 9))
+
+
+def cola_factors(cola: float, n_years: int) -> np.ndarray:
+    """(1 + cola) ** k for k = 0..n_years-1: cumulative COLA after k years of benefits."""
+    return (1.0 + cola) ** np.arange(n_years)
+
+
+def benefit_stream(years: Sequence[int], first_year, start_month, base_annual, cola: float) -> np.ndarray:
+    """
+    Array version of compute_ss_for_year over all `years`. Scalar claim terms
+    give shape (Y,); arrays of first_year / start_month / base_annual (N,) give
+    one row per claim, (N, Y), sharing one table of COLA factors.
+    """
+    years = np.asarray(years)
+    first = np.asarray(first_year)[..., None]
+    base = np.asarray(base_annual, dtype=float)[..., None]
+    since = np.maximum(0, years - first)
+    amt = base * cola_factors(cola, int(since.max(initial=0)) + 1)[since]
+    months = np.clip(13 - np.asarray(start_month)[..., None], 0, 12)
+    amt = np.where(years == first, amt * (months / 12.0), amt)
+    out = np.where((years < first) | (base <= 0), 0.0, amt)
+    return out
+
+
+def claim_grid_streams(years: Sequence[int], dob: str, fra_monthly: float, cola: float,
+                       claim_age_months: np.ndarray = CLAIM_AGE_MONTHS) -> np.ndarray:
+    """Benefit streams (N, Y) for every claim age in months (default 62y0m..70y0m)."""
+    claim_age_months = np.asarray(claim_age_months)
+    by, bm = (int(x) for x in dob.split("-")[:2])
+    idx = bm - 1 + claim_age_months
+    base = 12.0 * float(fra_monthly) * claim_factor(claim_age_months) if fra_monthly > 0 else \
+        np.zeros(len(claim_age_months))
+    return benefit_stream(years, by + idx // 12, idx % 12 + 1, base, cola)
+
+
 def compute_ss_for_year(year: int, first_year: int, start_month: int,
                         base_annual: float, cola: float) -> float:
     """
@@ -0,0 +1,147 @@
+# core/solver.py
+# Maximum sustainable spending: the largest total_withdraw (optionally
+# inflation-indexed) that is fully funded every year through end_year.
+from __future__ import annotations
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+from .schema import Profile, Inputs, Assumptions
+from .vectorized import BatchPlan, TAX_CLASSES, prepare_batch, tile_plan, project
+from .montecarlo import account_vols, draw_returns
+
+
+def _default_weights(plan: BatchPlan) -> Dict[str, float]:
+    """Split by each class's share of starting balances (used when no weights are given)."""
+    by_class = [float(plan.balances[0][plan.tax_class[0] == c].sum()) for c in range(len(TAX_CLASSES))]
+    total = sum(by_class) or 1.0
+    return {tc: v / total for tc, v in zip(TAX_CLASSES, by_class)}
+
+
+def _spending_path(level: np.ndarray, years: np.ndarray, from_idx: int, inflation: float) -> np.ndarray:
+    """(K,) levels -> (K, Y) withdrawals; level applies from year index from_idx, grown by inflation."""
+    growth = (1.0 + inflation) ** np.maximum(0, np.arange(len(years)) - from_idx)
+    return level[:, None] * growth[None, :]
+
+
+def max_sustainable_withdrawal(profile: Profile, inputs: Inputs, assumptions: Assumptions,
+                               strategy: Dict[str, Any] | None = None,
+                               inflation: float = 0.0, tol: float = 100.0,
+                               from_year: int | None = None,
+                               warm_start: float | Tuple[float, float] | None = None,
+                               candidates_per_round: int = 16,
+                               success_target: float | None = None, n_paths: int = 2_000,
+                               volatility: float | Dict[str, float] | None = None,
+                               correlation: Sequence[Sequence[float]] | None = None,
+                               distribution: str = "normal", seed: int = 0,
+                               state_rate: float | None = None, local_rate: float | None = None,
+                               std_override: float | None = None, senior_bill_on: bool = True,
+                               time_step: str = "annual") -> Dict[str, Any]:
+    """
+    Solve for the largest level L such that withdrawing L (times
+    (1+inflation)^k in the k-th year from from_year) is fully funded every year.
+
+    Spending is split across tax classes by strategy["weights"] (or by starting
+    balance shares). Each round scores `candidates_per_round` levels in one
+    batch and narrows the bracket to [best feasible, first infeasible]; a trial
+    stops as soon as every candidate has hit a shortfall or all balances are zero.
+
+    - from_year: years before it keep the strategy's own total_withdraw; that
+      prefix is projected once and every trial resumes from its checkpoint.
+    - warm_start: a previous answer (bracket is built around it) or a (lo, hi) pair.
+    - success_target: solve against Monte Carlo success probability instead,
+      using one fixed set of seeded return paths for every trial.
+    - senior_bill_on, time_step: as in vectorized.run_batch.
+    """
+    strategy = dict(strategy or {})
+    base_total = float(strategy.get("total_withdraw", 0.0)) if strategy.get("mode") == "weights" else 0.0
+    strategy.update(mode="weights", total_withdraw=base_total)
+    plan1 = prepare_batch(profile, [inputs], state_rate=state_rate, local_rate=local_rate,
+                          std_override=std_override, strategies=strategy,
+                          rules_version=assumptions.rules_version, senior_bill_on=senior_bill_on,
+                          time_step=time_step)
+    if not strategy.get("weights") and not strategy.get("schedule"):
+        w = _default_weights(plan1)
+        plan1.weights[:] = [w[tc] for tc in TAX_CLASSES]
+    years = plan1.years
+    from_idx = 0 if from_year is None else int(np.clip(int(from_year) - int(years[0]), 0, len(years)))
+
+    # Paths: one deterministic path, or n_paths seeded Monte Carlo paths.
+    if success_target is None:
+        n = 1
+        base = plan1
+    else:
+        names = list(inputs.balances.keys())
+        corr = np.eye(len(names)) if correlation is None else np.asarray(correlation, dtype=float)
+        rng = np.random.default_rng(np.random.SeedSequence(seed))
+        n = int(n_paths)
+        base = tile_plan(plan1, n)
+        base.returns = draw_returns(rng, n, len(years), plan1.returns[0, 0, :],
+                                    account_vols(inputs, volatility), np.linalg.cholesky(corr), distribution)
+
+    # Prefix years are identical for every trial: project them once and resume from there.
+    init = None
+    if from_idx > 0:
+        prefix = project(base)
+        pre_ok = (prefix["requested"][:, :from_idx] - prefix["withdrawn"][:, :from_idx] <= 0.005).all(axis=1)
+        init = prefix["balances"][:, from_idx - 1, :]
+    else:
+        pre_ok = np.ones(n, dtype=bool)
+
+    def success_rate(levels: np.ndarray) -> np.ndarray:
+        K = len(levels)
+        plan = tile_plan(plan1, K * n)
+        plan.returns = np.tile(base.returns, (K, 1, 1))
+        path = _spending_path(levels, years, from_idx, inflation)
+        plan.total_withdraw = np.where(np.arange(len(years)) < from_idx, plan.total_withdraw,
+                                       np.repeat(path, n, axis=0))
+        res = project(plan, t0=from_idx, init_balances=None if init is None else np.tile(init, (K, 1)),
+                      stop_on_shortfall=success_target is None)
+        short = res["requested"][:, from_idx:] - res["withdrawn"][:, from_idx:] > 0.005
+        ok = ~short.any(axis=1) & np.tile(pre_ok, K)
+        return ok.reshape(K, n).mean(axis=1)
+
+    target = 1.0 if success_target is None else float(success_target)
+    feasible = lambda levels: success_rate(levels) >= target - 1e-12
+
+    # Bracket [lo feasible, hi infeasible]; spending more than everything owned fails at once.
+    start_bal = base.balances if init is None else init
+    cap = float(start_bal.sum(axis=1).max()) + 1.0
+    if isinstance(warm_start, (tuple, list)):
+        lo, hi = float(warm_start[0]), float(warm_start[1])
+    elif warm_start is not None:
+        lo, hi = 0.9 * float(warm_start), 1.1 * float(warm_start) + tol
+    else:
+        lo, hi = 0.0, cap
+    ends = feasible(np.array([lo, hi]))
+    trials = 2
+    if ends[1]:
+        lo, hi = hi, cap
+    elif not ends[0]:
+        lo = 0.0
+        trials += 1
+        if not feasible(np.array([0.0]))[0]:
+            return {"level": 0.0, "feasible": False, "trials": trials, "rounds": 0}
+
+    rounds = 0
+    while hi - lo > tol:
+        levels = np.linspace(lo, hi, candidates_per_round + 2)[1:-1]
+        ok = feasible(levels)
+        trials += len(levels)
+        rounds += 1
+        if ok.any():
+            lo = float(levels[ok].max())
+        bad = levels[~ok & (levels > lo)]
+        hi = float(bad.min()) if len(bad) else hi
+
+    spend = _spending_path(np.array([lo]), years, from_idx, inflation)[0]
+    spend[:from_idx] = base_total
+    return {
+        "level": lo,
+        "feasible": True,
+        "withdrawals": dict(zip(years.tolist(), spend.tolist())),
+        "success_probability": float(success_rate(np.array([lo]))[0]),
+        "bracket": (lo, hi),
+        "trials": trials,
+        "rounds": rounds,
+    }
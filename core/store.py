@@ -0,0 +1,325 @@
+# core/store.py
+# Persistent scenario store: saved Profile/Inputs/strategy scenarios and their
+# projection results in one SQLite file (WAL mode, so readers never block the
+# writer). Scenarios are content-addressed by cache.projection_key; a stored
+# result is served only while the rules data it was computed under is unchanged.
+from __future__ import annotations
+import dataclasses
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from .schema import Profile, Inputs, Assumptions
+from .cache import projection_key
+from .result import ProjectionResult
+from .rules import rules_digest
+
+DEFAULT_PATH = Path.home() / ".retireright" / "scenarios.db"
+_MAX_VARS = 500   # ids per IN (...) query, under SQLite's bound-parameter limit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id            TEXT PRIMARY KEY,
+    name          TEXT,
+    rules_version TEXT NOT NULL,
+    state         TEXT,
+    payload       TEXT NOT NULL,
+    created       REAL NOT NULL,
+    updated       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_name ON scenarios(name);
+CREATE INDEX IF NOT EXISTS scenarios_updated ON scenarios(updated);
+CREATE TABLE IF NOT EXISTS results (
+    scenario_id   TEXT PRIMARY KEY REFERENCES scenarios(id) ON DELETE CASCADE,
+    rules_version TEXT NOT NULL,
+    rules_digest  TEXT NOT NULL,
+    computed      REAL NOT NULL,
+    data          BLOB NOT NULL
+);
+"""
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"not JSON serializable: {type(obj).__name__}")
+
+
+def _batches(ids: Sequence[str]) -> Iterator[Sequence[str]]:
+    for i in range(0, len(ids), _MAX_VARS):
+        yield ids[i:i + _MAX_VARS]
+
+
+class ScenarioStore:
+    """
+    Scenarios (profile, inputs, assumptions and projection.run keyword arguments
+    such as strategy) and their ProjectionResults in a SQLite file.
+
+    - A scenario's id is projection_key(...) of its content, so saving the same
+      plan twice is one row (ResultCache keys add the rules digest; see cache.result_key).
+    - Results are stored with the rules_version and rules_digest they were
+      computed under; one whose rules files have since changed is deleted on
+      read (counted in stats()["invalidated"]) and recomputed by run().
+    - Bulk variants (save_many, load_many, get_results) use one transaction or
+      one query per 500 ids.
+    - Unnamed scenarios (the ones run() saves for every projection) are pruned
+      to the `max_unnamed` most recently updated; named ones are kept until deleted.
+    Safe to share across threads: each thread gets its own connection.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_PATH, timeout: float = 30.0, max_unnamed: int = 1000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.max_unnamed = max_unnamed
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.invalidated = 0
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        db = self._conn()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # ---- scenarios ----
+
+    def save(self, profile: Profile, inputs: Inputs, assumptions: Assumptions, name: str | None = None,
+             result: ProjectionResult | None = None, **kwargs) -> str:
+        """Store one scenario (and optionally its result); returns its id."""
+        return self.save_many([{"profile": profile, "inputs": inputs, "assumptions": assumptions,
+                                "name": name, "result": result, "kwargs": kwargs}])[0]
+
+    def save_many(self, scenarios: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Store scenarios given as dicts with "profile", "inputs", "assumptions" and
+        optional "name", "kwargs" (projection.run keyword arguments) and "result".
+        Re-saving keeps the original created time; a None name keeps the old name.
+        """
+        now = time.time()
+        ids, rows, results = [], [], {}
+        for sc in scenarios:
+            kwargs = sc.get("kwargs") or {}
+            sid = projection_key(sc["profile"], sc["inputs"], sc["assumptions"], **kwargs)
+            payload = json.dumps({"profile": dataclasses.asdict(sc["profile"]),
+                                  "inputs": dataclasses.asdict(sc["inputs"]),
+                                  "assumptions": dataclasses.asdict(sc["assumptions"]),
+                                  "kwargs": kwargs}, default=_json_default)
+            rows.append((sid, sc.get("name"), sc["assumptions"].rules_version, sc["profile"].state,
+                         payload, now, now))
+            if sc.get("result") is not None:
+                results[sid] = sc["result"]
+            ids.append(sid)
+        with self._tx() as db:
+            db.executemany(
+                "INSERT INTO scenarios (id, name, rules_version, state, payload, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+                "name = COALESCE(excluded.name, name), updated = excluded.updated", rows)
+            self._put_results(db, results)
+        return ids
+
+    def load(self, scenario_id: str) -> Dict[str, Any] | None:
+        """{"id", "name", "profile", "inputs", "assumptions", "kwargs"}, or None if unknown."""
+        return self.load_many([scenario_id]).get(scenario_id)
+
+    def load_many(self, ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for batch in _batches(list(ids)):
+            marks = ",".join("?" * len(batch))
+            for sid, name, payload in self._conn().execute(
+                    f"SELECT id, name, payload FROM scenarios WHERE id IN ({marks})", batch):
+                p = json.loads(payload)
+                out[sid] = {"id": sid, "name": name, "profile": Profile(**p["profile"]),
+                            "inputs": Inputs(**p["inputs"]), "assumptions": Assumptions(**p["assumptions"]),
+                            "kwargs": p["kwargs"]}
+        return out
+
+    def list(self, name: str | None = None, named_only: bool = False, limit: int | None = None
+             ) -> List[Dict[str, Any]]:
+        """Scenario summaries, most recently updated first; `name` is a LIKE pattern."""
+        sql = ("SELECT s.id, s.name, s.rules_version, s.state, s.created, s.updated, r.scenario_id IS NOT NULL "
+               "FROM scenarios s LEFT JOIN results r ON r.scenario_id = s.id")
+        where, args = [], []
+        if name is not None:
+            where.append("s.name LIKE ?")
+            args.append(name)
+        if named_only:
+            where.append("s.name IS NOT NULL")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY s.updated DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        keys = ("id", "name", "rules_version", "state", "created", "updated", "has_result")
+        return [dict(zip(keys, row[:-1] + (bool(row[-1]),))) for row in self._conn().execute(sql, args)]
+
+    def rename(self, scenario_id: str, name: str | None) -> bool:
+        """Name (or with None, unname) a saved scenario; False if the id is unknown."""
+        with self._tx() as db:
+            return db.execute("UPDATE scenarios SET name = ?, updated = ? WHERE id = ?",
+                              (name, time.time(), scenario_id)).rowcount > 0
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Delete scenarios and their results; returns how many scenarios existed."""
+        n = 0
+        with self._tx() as db:
+            for batch in _batches(list(ids)):
+                n += db.execute(f"DELETE FROM scenarios WHERE id IN ({','.join('?' * len(batch))})",
+                                batch).rowcount
+        return n
+
+    def prune(self, keep: int | None = None) -> int:
+        """Delete all but the `keep` (default max_unnamed) most recently updated unnamed scenarios."""
+        keep = self.max_unnamed if keep is None else keep
+        with self._tx() as db:
+            return db.execute("DELETE FROM scenarios WHERE name IS NULL AND id NOT IN (SELECT id FROM scenarios "
+                              "WHERE name IS NULL ORDER BY updated DESC LIMIT ?)", (keep,)).rowcount
+
+    # ---- results ----
+
+    def _put_results(self, db: sqlite3.Connection, results: Dict[str, ProjectionResult]) -> None:
+        if not results:
+            return
+        meta = {}
+        for batch in _batches(list(results)):
+            meta.update((sid, (ver, state)) for sid, ver, state in db.execute(
+                f"SELECT id, rules_version, state FROM scenarios WHERE id IN ({','.join('?' * len(batch))})",
+                batch))
+        now = time.time()
+        rows = [(sid, ver, rules_digest(ver, state), now, res.to_bytes())
+                for sid, res in results.items() for ver, state in [meta[sid]]]
+        db.executemany("INSERT OR REPLACE INTO results (scenario_id, rules_version, rules_digest, computed, data) "
+                       "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def put_results(self, results: Dict[str, ProjectionResult]) -> None:
+        """Store results for already-saved scenarios (KeyError for an unknown id)."""
+        with self._tx() as db:
+            self._put_results(db, results)
+
+    def get_result(self, scenario_id: str) -> ProjectionResult | None:
+        return self.get_results([scenario_id]).get(scenario_id)
+
+    def get_results(self, ids: Sequence[str]) -> Dict[str, ProjectionResult]:
+        """Current results by id; ids without one (or with a stale one) are left out."""
+        out, stale, digests = {}, [], {}
+        for batch in _batches(list(ids)):
+            marks = ",".join("?" * len(batch))
+            for sid, ver, digest, state, blob in self._conn().execute(
+                    "SELECT r.scenario_id, r.rules_version, r.rules_digest, s.state, r.data FROM results r "
+                    f"JOIN scenarios s ON s.id = r.scenario_id WHERE r.scenario_id IN ({marks})", batch):
+                key = (ver, state)
+                if key not in digests:
+                    digests[key] = rules_digest(ver, state)
+                if digest != digests[key]:
+                    stale.append(sid)
+                else:
+                    out[sid] = ProjectionResult.from_bytes(blob)
+        if stale:
+            self._drop_results(stale)
+        with self._lock:
+            self.hits += len(out)
+            self.misses += len(ids) - len(out)
+        return out
+
+    def _drop_results(self, ids: List[str]) -> None:
+        with self._tx() as db:
+            for batch in _batches(ids):
+                db.execute(f"DELETE FROM results WHERE scenario_id IN ({','.join('?' * len(batch))})", batch)
+        with self._lock:
+            self.invalidated += len(ids)
+
+    def invalidate(self) -> int:
+        """Delete every result computed under rules data that has since changed; returns the count."""
+        digests, stale = {}, []
+        for sid, ver, digest, state in self._conn().execute(
+                "SELECT r.scenario_id, r.rules_version, r.rules_digest, s.state FROM results r "
+                "JOIN scenarios s ON s.id = r.scenario_id"):
+            key = (ver, state)
+            if key not in digests:
+                digests[key] = rules_digest(ver, state)
+            if digest != digests[key]:
+                stale.append(sid)
+        if stale:
+            self._drop_results(stale)
+        return len(stale)
+
+    def run(self, profile: Profile, inputs: Inputs, assumptions: Assumptions, runner: Callable | None = None,
+            name: str | None = None, profiler=None, **kwargs) -> ProjectionResult:
+        """
+        projection.run through the store: saves the scenario, then returns its
+        stored result or computes (with `runner`, default projection.run) and
+        stores it. `profiler` is passed to the runner on a miss; a hit records
+        phase "store_hit". After a miss, unnamed scenarios are pruned (see prune).
+        """
+        if runner is None:
+            from .projection import run as runner
+        t = profiler.clock() if profiler is not None else 0.0
+        sid = self.save(profile, inputs, assumptions, name=name, **kwargs)
+        result = self.get_result(sid)
+        if result is not None:
+            if profiler is not None:
+                profiler.lap("store_hit", t)
+            return result
+        if profiler is not None:
+            kwargs["profiler"] = profiler
+        result = runner(profile, inputs, assumptions, **kwargs)
+        self.put_results({sid: result})
+        self.prune()
+        return result
+
+    def diff(self, a: str, b: str, columns: Sequence[str] | None = None) -> Dict[str, np.ndarray]:
+        """
+        Year-by-year change from scenario `a` to `b` (b - a, rounded as in their
+        tables) over the years both cover: {"Year": years, column: delta, ...} for
+        `columns` or every numeric column they share. KeyError if either has no
+        current result.
+        """
+        res = self.get_results([a, b])
+        ra, rb = res[a], res[b]
+        years, ia, ib = np.intersect1d(ra.column("Year"), rb.column("Year"), return_indices=True)
+        shared = set(rb.columns)
+        out = {"Year": years}
+        for c in (columns or [c for c in ra.columns if c in shared and c != "Year"]):
+            x, y = ra.column(c), rb.column(c)
+            if x.dtype != object and y.dtype != object:
+                out[c] = y[ib] - x[ia]
+        return out
+
+    def stats(self) -> Dict[str, float]:
+        db = self._conn()
+        (n_scen,), (n_res, size) = (db.execute("SELECT COUNT(*) FROM scenarios").fetchone(),
+                                    db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM results").fetchone())
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"scenarios": n_scen, "results": n_res, "result_bytes": size,
+                    "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0, "invalidated": self.invalidated}
@@ -0,0 +1,83 @@
+# core/streaming.py
+# Mergeable streaming accumulators for simulation output. Memory depends only on
+# the shape being tracked (e.g. years x accounts), never on the number of paths.
+from __future__ import annotations
+import math
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram (DDSketch-style) over non-negative values, one per cell
+    of `shape`. Quantiles carry a relative error of at most `alpha`; values below
+    `min_value` (including zero) fall in bucket 0 and report as 0.
+
+    Merging adds integer counts, so the result does not depend on merge order.
+    """
+
+    def __init__(self, shape=(), alpha: float = 0.01, min_value: float = 1.0, max_value: float = 1e10):
+        self.shape = tuple(shape)
+        self.alpha = alpha
+        self.min_value = min_value
+        self.gamma = (1.0 + alpha) / (1.0 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.n_bins = int(math.ceil(math.log(max_value / min_value) / self._log_gamma)) + 2
+        self.counts = np.zeros(self.shape + (self.n_bins,), dtype=np.int64)
+
+    def add(self, x: np.ndarray) -> None:
+        """Fold a batch of samples shaped (n, *shape)."""
+        x = np.asarray(x, dtype=float).reshape((-1,) + self.shape)
+        with np.errstate(divide="ignore"):
+            k = np.ceil(np.log(np.maximum(x, self.min_value) / self.min_value) / self._log_gamma) + 1
+        k = np.where(x < self.min_value, 0, np.minimum(k, self.n_bins - 1)).astype(np.int64)
+        cells = int(np.prod(self.shape)) if self.shape else 1
+        flat = k.reshape(len(x), cells) + np.arange(cells) * self.n_bins
+        self.counts += np.bincount(flat.ravel(), minlength=cells * self.n_bins).reshape(self.counts.shape)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.counts += other.counts
+
+    @property
+    def count(self) -> int:
+        return int(self.counts[(0,) * len(self.shape)].sum()) if self.counts.size else 0
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Estimate the q-quantile (0..1) for every cell; returns an array of `shape`."""
+        cum = np.cumsum(self.counts, axis=-1)
+        total = cum[..., -1]
+        rank = np.floor(q * np.maximum(total - 1, 0))
+        k = (cum > rank[..., None]).argmax(axis=-1)
+        est = self.min_value * self.gamma ** (k - 1) * 2.0 / (1.0 + self.gamma)
+        return np.where((k == 0) | (total == 0), 0.0, est)
+
+
+class RunningMoments:
+    """Per-cell running mean/variance; merges with Chan's parallel update."""
+
+    def __init__(self, shape=()):
+        self.n = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def add(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=float)
+        other = RunningMoments(self.mean.shape)
+        other.n = len(x)
+        if other.n:
+            other.mean = x.mean(axis=0)
+            other.m2 = ((x - other.mean) ** 2).sum(axis=0)
+        self.merge(other)
+
+    def merge(self, other: "RunningMoments") -> None:
+        n = self.n + other.n
+        if n == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.n / n)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.n * other.n / n)
+        self.n = n
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.zeros_like(self.mean)
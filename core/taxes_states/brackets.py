@@ -0,0 +1,69 @@
+# core/taxes_states/brackets.py
+# Generic data-driven state calculator: graduated (or flat) brackets, deductions
+# and exemptions, retirement-income and Social Security exclusions, local rates
+# and surtaxes, all read from data/states/<code>_rates_<year>.json.
+import numpy as np
+
+from ..federal import TaxSchedule
+from .. import rules
+
+REQUIRED = ("brackets", "standard_deduction", "personal_exemption", "senior_exemption_per65",
+            "ss_exempt", "retirement_exclusion", "local_rate")
+
+
+def compile(data: dict, county: str | None = None, senior: bool = True, filing_status: str = "MFJ"):
+    """
+    Build a calculator for one state/county/filing status.
+
+    state taxable = AGI
+                    - taxable SS (if ss_exempt)
+                    - retirement income, up to retirement_exclusion (per 65+ person, or full)
+                    - standard deduction - personal exemptions - senior_exemption_per65 * num65
+    tax = brackets(taxable) + surtaxes above their thresholds + taxable * local rate
+
+    MFJ uses the MFJ table (two exemptions); every other status uses SINGLE.
+    `senior` is accepted for interface parity; these tables have no senior toggle.
+    The returned function accepts floats or NumPy arrays. A missing key or a
+    malformed bracket table raises rules.RulesError.
+    """
+    where = f"{data.get('state_code')} rules {data.get('rules_version')!r}"
+    for key in REQUIRED:
+        if key not in data:
+            raise rules.RulesError(f"{where}: missing {key!r}")
+    for fs in ("SINGLE", "MFJ"):
+        if fs not in data["brackets"]:
+            raise rules.RulesError(f"{where}: no brackets for {fs}")
+        rules.validate_brackets(f"{where} {fs}", data["brackets"][fs])
+
+    table = "MFJ" if (filing_status or "MFJ").upper() == "MFJ" else "SINGLE"
+    persons = 2 if table == "MFJ" else 1
+    sched = TaxSchedule([(float("inf") if top is None else float(top), float(rate))
+                         for top, rate in data["brackets"][table]])
+    deduction = float(data["standard_deduction"][table]) + persons * float(data["personal_exemption"])
+    per65 = float(data["senior_exemption_per65"])
+    ss_exempt = bool(data["ss_exempt"])
+    ret = data["retirement_exclusion"]
+    ret_full = bool(ret.get("full", False))
+    ret_per = float(ret.get("per_person", 0.0))
+
+    counties = {str(k).lower(): v for k, v in (data.get("counties") or {}).items()}
+    c = counties.get((county or "").strip().lower())
+    local = float(c["local_rate"]) if c else float(data["local_rate"])
+    surtaxes = [(float(s["threshold"]), float(s["rate"])) for s in (data.get("surtaxes") or [])]
+
+    def _fn(income, num65=0, agi=None, ss_taxable=0.0, retirement_income=0.0):
+        base = np.asarray(income if agi is None else agi, dtype=float)
+        num65 = np.asarray(num65)
+        if ss_exempt:
+            base = base - ss_taxable
+        if ret_full:
+            base = base - retirement_income
+        elif ret_per:
+            base = base - np.minimum(retirement_income, ret_per * num65)
+        taxable = np.maximum(0.0, base - deduction - per65 * num65)
+        tax, _ = sched.tax(taxable)
+        for threshold, rate in surtaxes:
+            tax = tax + np.maximum(0.0, taxable - threshold) * rate
+        return tax + taxable * local
+
+    return _fn
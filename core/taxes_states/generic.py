@@ -1,5 +1,6 @@
 # core/taxes_states/generic.py
 # Fallback calculators and a tiny factory for flat state+local rates.
+import numpy as np
 
 def compute_state_tax(income: float) -> float:
     """
@@ -13,13 +14,15 @@ def make_generic_flat(state_rate_pct: float = 0.0, local_rate_pct: float = 0.0,
     """
     Factory that returns a function computing flat state+local tax on (income - deduction).
     state_rate_pct/local_rate_pct are in PERCENT (e.g., 5.0 for 5%).
+    The returned function accepts a float or a NumPy array of incomes; `num65`
+    and other keywords are accepted for interface parity with data-driven states and ignored.
     """
     state_rate = float(state_rate_pct) / 100.0
     local_rate = float(local_rate_pct) / 100.0
     ded = float(deduction)
 
-    def _fn(income: float) -> float:
-        taxable = max(0.0, float(income) - ded)
+    def _fn(income: float, num65=0, **_) -> float:
+        taxable = np.maximum(0.0, np.asarray(income, dtype=float) - ded)
         return taxable * (state_rate + local_rate)
 
     return _fn
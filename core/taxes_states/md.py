@@ -1,10 +1,47 @@
 # core/taxes_states/md.py
-# Maryland placeholder: flat 4.75% of state-taxable income.
-# (We’ll reintroduce the full data-driven logic later.)
+# Maryland: state + county effective rates and senior relief, driven by
+# data/states/md_rates_<year>.json (loaded and cached via core/rules.py).
+import numpy as np
 
-def compute_state_tax(income: float) -> float:
+from .. import rules
+
+
+def compile(data: dict, county: str | None = None, senior: bool = True, filing_status: str = "MFJ"):
     """
-    Maryland-specific placeholder: flat 4.75%.
-    `income` should be the state-taxable base you're passing (e.g., AGI proxy for now).
+    Build the Maryland calculator for one county from a rules table.
+
+    tax = (income - 65+ deductions) * (state rate + county rate) - senior credit
+    - every 65+ taxpayer deducts `senior_extra_per65`, plus
+      `senior_deduction_per65` when senior relief is on
+    - with senior relief on and income <= senior_credit.agi_cap, the credit is
+      `one65` (one taxpayer 65+) or `both65` (two)
+    Unknown counties use `default_local_effective_rate`; the rates are effective
+    rates, so the same table serves every filing status.
+    The returned function accepts a float or NumPy arrays for income/num65.
+    A missing key raises rules.RulesError.
     """
-    return max(0.0, income) * 0.0475
+    for key in ("state_effective_rate", "counties", "senior_extra_per65",
+                "senior_deduction_per65", "senior_credit"):
+        if key not in data:
+            raise rules.RulesError(f"MD rules {data.get('rules_version')!r}: missing {key!r}")
+
+    counties = {str(k).lower(): v for k, v in data["counties"].items()}
+    c = counties.get((county or "").strip().lower())
+    local = float(c["local_effective_rate"]) if c else float(data.get("default_local_effective_rate", 0.0))
+    rate = float(data["state_effective_rate"]) + local
+
+    per65 = float(data["senior_extra_per65"]) + (float(data["senior_deduction_per65"]) if senior else 0.0)
+    credit = data["senior_credit"]
+    agi_cap = float(credit["agi_cap"])
+    one65, both65 = float(credit["one65"]), float(credit["both65"])
+
+    def _fn(income, num65=0, **_):
+        income = np.asarray(income, dtype=float)
+        num65 = np.asarray(num65)
+        tax = np.maximum(0.0, income - num65 * per65) * rate
+        if senior:
+            cr = np.where(num65 >= 2, both65, np.where(num65 == 1, one65, 0.0))
+            tax = np.maximum(0.0, tax - np.where(income <= agi_cap, cr, 0.0))
+        return tax
+
+    return _fn
@@ -1,21 +1,45 @@
 # core/taxes_states/registry.py
-# Simple registry that returns a state tax function.
+# Registry that returns a state tax function. State modules and their data
+# tables are imported/parsed lazily, the first time a state is requested.
+import importlib
+
 from . import generic
-from . import md  # Maryland
+from .. import rules
 
-REGISTRY = {
-    "MD": md.compute_state_tax,   # MD uses a real function (we'll expand later)
+# States with a dedicated module; every other state with a rules table uses the
+# generic bracket module. Each module exposes compile(data, county, senior, filing_status).
+STATE_MODULES = {
+    "MD": "md",
 }
+DEFAULT_MODULE = "brackets"
+
+# Calculators take fn(income, num65=0, agi=None, ss_taxable=0.0, retirement_income=0.0):
+# `income` is federal taxable income (the legacy base); `agi` is the federal AGI
+# proxy that bracket states start from; `ss_taxable` / `retirement_income` are the
+# parts of `agi` that states may exclude. Extra keywords are ignored by simpler states.
+
+
+def compile_state(state_code: str, data: dict, county: str | None = None, senior: bool = True,
+                  filing_status: str = "MFJ"):
+    """Compile a state's rules table with its module (called through rules.state_calculator)."""
+    mod = importlib.import_module(f".{STATE_MODULES.get(state_code, DEFAULT_MODULE)}", __package__)
+    return mod.compile(data, county=county, senior=senior, filing_status=filing_status)
+
 
-def get_state_calculator(state_code: str, state_rate: float | None = None, local_rate: float | None = None):
+def get_state_calculator(state_code: str, state_rate: float | None = None, local_rate: float | None = None,
+                         county: str | None = None, rules_version: str | None = None,
+                         senior: bool = True, filing_status: str = "MFJ"):
     """
     Return a state tax function.
-    - If we have a dedicated module (e.g., MD), return that function.
+    - A non-zero `state_rate` forces the flat state+local function (explicit override).
+    - Otherwise, if data/states has a table for `rules_version`, return its compiled
+      calculator (cached per version/state/county/senior/filing status).
     - Otherwise return a flat-rate function using the provided state/local percentages.
     """
     sc = (state_code or "").upper()
-    if sc in REGISTRY:
-        return REGISTRY[sc]
+    version = rules_version or rules.DEFAULT_RULES_VERSION
+    if not state_rate and rules.has_rules(sc, version):
+        return rules.state_calculator(version, sc, county, senior, (filing_status or "MFJ").upper())
 
     # Fallback: generic flat function using UI-provided rates (percent values)
     return generic.make_generic_flat(state_rate or 0.0, local_rate or 0.0, deduction=0.0)
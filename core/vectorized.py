@@ -0,0 +1,405 @@
+# core/vectorized.py
+# Batch projection engine: evaluates many scenarios for one household at once,
+# with state held as NumPy arrays shaped (scenarios x years x accounts).
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from .schema import Profile, Inputs, Assumptions
+from .rmd import year_to_age, rmd_rates
+from .social_security import claim_terms, benefit_stream
+from .projection import weights_for_year, conversions_for_years, monthly_rates, monthly_year, TIME_STEPS
+from .accounts import TAX_CLASSES, PRE_TAX, BROKERAGE, PRIMARY, SPOUSE, compile_accounts
+from .result import ProjectionResult, result_columns
+from .federal import FederalRules
+from .rules import DEFAULT_RULES_VERSION, federal_rules
+from .taxes_states.registry import get_state_calculator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class BatchPlan:
+    """
+    Array form of N scenarios sharing one household, window and account list.
+    S = scenarios, Y = years, A = accounts, C = len(TAX_CLASSES).
+    """
+    years: np.ndarray            # (Y,)
+    acct_names: List[str]
+    age_you: np.ndarray          # (Y,)
+    age_sp: np.ndarray | None    # (Y,) or None without a spouse
+    balances: np.ndarray         # (S, A) starting balances
+    returns: np.ndarray          # (S, Y, A) per-year returns
+    tax_class: np.ndarray        # (S, A) int codes (PRE_TAX..OTHER)
+    div_yield: np.ndarray        # (S, A) fraction
+    realize: np.ndarray          # (S, A) fraction of positive growth realized
+    manual_wd: np.ndarray        # (S, A) manual-mode annual withdrawal
+    owner: np.ndarray            # (S, A) owner codes (PRIMARY/SPOUSE)
+    rmd_rate: np.ndarray         # (2, Y) RMD fraction of prior year-end balance, by owner
+    weights_mode: np.ndarray     # (S,) bool
+    weights: np.ndarray          # (S, Y, C)
+    total_withdraw: np.ndarray   # (S, Y)
+    conversions: np.ndarray      # (S, Y) requested Roth conversion
+    roth_target: np.ndarray      # (S,) account receiving conversions, -1 = none
+    ss_total: np.ndarray         # (S, Y)
+    std: np.ndarray              # (Y,) standard deduction
+    num65: np.ndarray            # (Y,) taxpayers aged 65+
+    filing_status: str
+    fed: FederalRules
+    state_fn: Callable
+    monthly: bool = False        # time_step="monthly" (see projection.monthly_year)
+
+    @property
+    def n_scenarios(self) -> int:
+        return self.balances.shape[0]
+
+
+def tile_plan(plan: BatchPlan, n: int) -> BatchPlan:
+    """Repeat a single-scenario plan n times along the scenario axis."""
+    if plan.n_scenarios != 1:
+        raise ValueError("tile_plan expects a single-scenario plan")
+    rep = lambda a: np.repeat(a, n, axis=0)
+    return replace(
+        plan, balances=rep(plan.balances), returns=rep(plan.returns),
+        tax_class=rep(plan.tax_class), div_yield=rep(plan.div_yield),
+        realize=rep(plan.realize), manual_wd=rep(plan.manual_wd), owner=rep(plan.owner),
+        weights_mode=rep(plan.weights_mode), weights=rep(plan.weights),
+        total_withdraw=rep(plan.total_withdraw), conversions=rep(plan.conversions),
+        roth_target=rep(plan.roth_target), ss_total=rep(plan.ss_total),
+    )
+
+
+def prepare_batch(profile: Profile, inputs: Sequence[Inputs],
+                  state_rate: float | None = None, local_rate: float | None = None,
+                  std_override: float | None = None,
+                  strategies: Sequence[Dict[str, Any]] | Dict[str, Any] | None = None,
+                  rules_version: str = DEFAULT_RULES_VERSION, senior_bill_on: bool = True,
+                  time_step: str = "annual") -> BatchPlan:
+    """
+    Compile N `Inputs` (plus an optional strategy per scenario, or one shared
+    strategy) into a BatchPlan. All scenarios must share the projection window
+    and account names; returns, withdrawals, claim ages and weights may differ.
+    `time_step` is as in projection.run.
+    """
+    if time_step not in TIME_STEPS:
+        raise ValueError(f"time_step must be one of {TIME_STEPS}")
+    inputs = list(inputs)
+    if not inputs:
+        raise ValueError("run_batch needs at least one scenario")
+    if strategies is None or isinstance(strategies, dict):
+        strategies = [strategies] * len(inputs)
+    strategies = list(strategies)
+    if len(strategies) != len(inputs):
+        raise ValueError("strategies must match inputs one-to-one")
+
+    first = inputs[0]
+    start, end = int(first.start_year), int(first.end_year)
+    acct_names = list(first.balances.keys())
+    for inp in inputs[1:]:
+        if (int(inp.start_year), int(inp.end_year)) != (start, end):
+            raise ValueError("all scenarios must share start_year/end_year")
+        if list(inp.balances.keys()) != acct_names:
+            raise ValueError("all scenarios must share the same accounts (in order)")
+
+    years = np.arange(start, end + 1)
+    S, Y, A, C = len(inputs), len(years), len(acct_names), len(TAX_CLASSES)
+    py = int(profile.primary_dob.split("-")[0])
+    sy = int(profile.spouse_dob.split("-")[0]) if profile.spouse_dob else None
+
+    age_you = np.array([year_to_age(py, start, int(yr)) for yr in years])
+    age_sp  = np.array([year_to_age(sy, start, int(yr)) for yr in years]) if profile.spouse_dob else None
+
+    fed = federal_rules(rules_version)
+    num65 = (age_you >= 65).astype(int)
+    if age_sp is not None:
+        num65 = num65 + ((age_sp != 0) & (age_sp >= 65)).astype(int)
+    if std_override is not None:
+        std = np.full(Y, float(std_override))
+    else:
+        std = fed.std_deduction(profile.filing_status, num65)
+
+    balances  = np.zeros((S, A))
+    returns   = np.zeros((S, Y, A))
+    tax_class = np.zeros((S, A), dtype=np.int8)
+    div_yield = np.zeros((S, A))
+    realize   = np.zeros((S, A))
+    manual_wd = np.zeros((S, A))
+    owner     = np.zeros((S, A), dtype=np.int8)
+    weights_mode = np.zeros(S, dtype=bool)
+    weights   = np.zeros((S, Y, C))
+    total_wd  = np.zeros((S, Y))
+    conversions = np.zeros((S, Y))
+    roth_target = np.full(S, -1, dtype=np.int64)
+    ss_total  = np.zeros((S, Y))
+
+    for i, (inp, strat) in enumerate(zip(inputs, strategies)):
+        book = compile_accounts(inp)
+        balances[i]  = book.balances
+        returns[i]   = book.returns
+        manual_wd[i] = book.annual
+        tax_class[i] = book.tax_class
+        div_yield[i] = book.div_yield
+        realize[i]   = book.realize
+        owner[i]     = book.owner
+        roth_target[i] = book.roth_target
+        conversions[i] = conversions_for_years(inp.conversions, [int(yr) for yr in years])
+
+        strat = strat or {"mode": "manual", "weights": {}, "total_withdraw": 0.0}
+        if strat.get("mode", "manual") != "manual":
+            weights_mode[i] = True
+            for t, yr in enumerate(years):
+                w = weights_for_year(strat, int(yr))
+                weights[i, t] = [float(w.get(tc, 0.0)) for tc in TAX_CLASSES]
+            total_wd[i] = float(strat.get("total_withdraw", 0.0))
+
+        ss = inp.social_security
+        cola = float(ss.get("cola", 0.02))
+        base, first, month = claim_terms(ss, "primary", profile.primary_dob)
+        ss_total[i] = benefit_stream(years, first, month, base, cola)
+        if profile.spouse_dob:
+            base, first, month = claim_terms(ss, "spouse", profile.spouse_dob)
+            ss_total[i] = ss_total[i] + benefit_stream(years, first, month, base, cola)
+
+    state_fn = get_state_calculator((profile.state or "").upper(), state_rate=state_rate, local_rate=local_rate,
+                                    county=profile.county, rules_version=rules_version, senior=senior_bill_on,
+                                    filing_status=profile.filing_status)
+    rmd_you = rmd_rates(profile.primary_dob, [int(yr) for yr in years])
+    rmd_rate = np.array([rmd_you, rmd_rates(profile.spouse_dob, [int(yr) for yr in years])
+                         if profile.spouse_dob else rmd_you])
+
+    return BatchPlan(
+        years=years, acct_names=acct_names, age_you=age_you, age_sp=age_sp,
+        balances=balances, returns=returns, tax_class=tax_class,
+        div_yield=div_yield, realize=realize, manual_wd=manual_wd, owner=owner, rmd_rate=rmd_rate,
+        weights_mode=weights_mode, weights=weights, total_withdraw=total_wd,
+        conversions=conversions, roth_target=roth_target, ss_total=ss_total, std=std, num65=num65, filing_status=profile.filing_status,
+        fed=fed, state_fn=state_fn, monthly=time_step == "monthly",
+    )
+
+
+# -------- Engine --------
+FLOW_KEYS = ("balances", "ordinary_income", "ltcg_income", "pretax_withdrawn", "withdrawn", "rmd",
+             "roth_conversion")
+
+
+def simulate(plan: BatchPlan, t0: int = 0, init_balances: np.ndarray | None = None,
+             stop_on_shortfall: bool = False, out: Dict[str, np.ndarray] | None = None,
+             progress: Callable[[int, int], None] | None = None) -> Dict[str, np.ndarray]:
+    """
+    The year loop: balances and taxable flows (everything that carries state from
+    one year to the next). Returns FLOW_KEYS arrays plus "requested"; "balances"
+    is (S, Y, A), the rest (S, Y). `out` supplies arrays to continue into (years
+    before t0 are kept as given); see project() for the other arguments.
+    """
+    S, A = plan.balances.shape
+    Y = len(plan.years)
+    C = len(TAX_CLASSES)
+
+    bal = (plan.balances if init_balances is None else init_balances).copy()
+    tc = plan.tax_class
+    is_pre = tc == PRE_TAX
+    is_bro = tc == BROKERAGE
+    class_masks = [tc == c for c in range(C)]
+    manual_wd = np.maximum(0.0, plan.manual_wd)
+    wmode = plan.weights_mode[:, None]
+    into_roth = np.arange(A)[None, :] == plan.roth_target[:, None]
+    can_convert = plan.roth_target >= 0
+    rmd_years = plan.rmd_rate.any(axis=0)
+    pre_of = [is_pre & (plan.owner == o) for o in (PRIMARY, SPOUSE)]
+    if plan.monthly:
+        g_month = monthly_rates(plan.returns)                                          # (S, Y, A)
+        real_month = np.where(is_bro[:, None, :], np.maximum(0.0, g_month) * plan.realize[:, None, :], 0.0)
+        growth_month = 1.0 + g_month - real_month
+        div_month = np.where(is_bro, plan.div_yield, 0.0) / 12.0
+
+    if out is None:
+        out = {k: np.zeros((S, Y, A) if k == "balances" else (S, Y)) for k in FLOW_KEYS}
+    else:
+        for v in out.values():
+            v[:, t0:] = 0.0
+    out_bal, ordinary, ltcg = out["balances"], out["ordinary_income"], out["ltcg_income"]
+    pre_wd, withdrawn, converted = out["pretax_withdrawn"], out["withdrawn"], out["roth_conversion"]
+    rmd = out["rmd"]
+    requested = np.where(plan.weights_mode[:, None], plan.total_withdraw, manual_wd.sum(axis=1)[:, None])
+    failed = np.zeros(S, dtype=bool)
+
+    for t in range(t0, Y):
+        # Weights mode: split the per-class target across that class's funded
+        # accounts in proportion to their balances.
+        wd_w = np.zeros((S, A))
+        for c in range(C):
+            in_c = class_masks[c] & (bal > 0)
+            tot = np.where(in_c, bal, 0.0).sum(axis=1)
+            target = plan.total_withdraw[:, t] * plan.weights[:, t, c]
+            ok = in_c & (target > 0)[:, None] & (tot > 0)[:, None]
+            share = np.divide(bal, tot[:, None], out=np.zeros((S, A)), where=ok)
+            wd_w = np.where(ok, np.minimum(bal, target[:, None] * share), wd_w)
+        wd_req = np.where(wmode, np.maximum(0.0, wd_w), manual_wd)
+
+        # RMDs: top each owner's pre-tax withdrawals up to their RMD, pro rata to what is left
+        if rmd_years[t]:
+            for o, own in enumerate(pre_of):
+                rate = plan.rmd_rate[o, t]
+                if rate <= 0 or not own.any():
+                    continue
+                need = np.where(own, bal * rate, 0.0).sum(axis=1)
+                rmd[:, t] += need
+                short = need - np.where(own, np.minimum(bal, wd_req), 0.0).sum(axis=1)
+                left = np.where(own, bal - np.minimum(bal, wd_req), 0.0)
+                room = left.sum(axis=1)
+                top_up = own & ((short > 0) & (room > 0))[:, None]
+                add = np.divide(short[:, None] * left, room[:, None], out=np.zeros((S, A)), where=top_up)
+                wd_req = np.where(top_up, np.minimum(bal, wd_req) + add, wd_req)
+
+        wd_taken = np.minimum(bal, wd_req)
+        bal_after = np.maximum(0.0, bal - wd_taken)
+
+        # Roth conversions: pro rata out of pre-tax (after withdrawals) into the Roth target
+        conv = plan.conversions[:, t]
+        start = bal
+        if conv.any():
+            pre_after = np.where(is_pre, bal_after, 0.0)
+            tot_pre = pre_after.sum(axis=1)
+            converted[:, t] = np.where(can_convert & (tot_pre > 0), np.minimum(conv, tot_pre), 0.0)
+            share = np.divide(pre_after, tot_pre[:, None], out=np.zeros((S, A)), where=tot_pre[:, None] > 0)
+            if plan.monthly:   # moved in January, before the first monthly withdrawal
+                start = np.maximum(0.0, bal + np.where(is_pre, -converted[:, t, None] * share,
+                                                       np.where(into_roth, converted[:, t, None], 0.0)))
+            bal_after = np.where(is_pre, np.maximum(0.0, bal_after - converted[:, t, None] * share),
+                                 np.where(into_roth, bal_after + converted[:, t, None], bal_after))
+
+        if plan.monthly:
+            end, wd_taken, invested = monthly_year(start, wd_taken / 12.0, growth_month[:, t])
+            div = invested * div_month
+            realized = invested * real_month[:, t]
+            bal = np.where(is_bro, np.maximum(0.0, end), end)
+        else:
+            ret = plan.returns[:, t, :]
+            div = np.where(is_bro & (plan.div_yield > 0), bal_after * plan.div_yield, 0.0)
+            growth = bal_after * ret
+            realized = np.where(is_bro & (plan.realize > 0), np.maximum(0.0, growth) * plan.realize, 0.0)
+            bal = np.where(is_bro,
+                           np.maximum(0.0, bal_after + growth - realized),
+                           bal_after * (1.0 + ret))
+
+        out_bal[:, t, :] = bal
+        pre_wd[:, t] = np.where(is_pre, wd_taken, 0.0).sum(axis=1)
+        ordinary[:, t] = pre_wd[:, t] + div.sum(axis=1) + converted[:, t]
+        ltcg[:, t] = realized.sum(axis=1)
+        withdrawn[:, t] = wd_taken.sum(axis=1)
+        if progress is not None:
+            progress(t + 1 - t0, Y - t0)
+
+        if not bal.any():
+            break
+        if stop_on_shortfall:
+            failed |= requested[:, t] - withdrawn[:, t] > 0.005
+            if failed.all():
+                break
+
+    return {**out, "requested": requested}
+
+
+def apply_taxes(plan: BatchPlan, flows: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Taxes depend only on each year's flows, so they are computed for all years at
+    once. Returns the full project() result (flows included).
+    """
+    ordinary, ltcg, pre_wd = flows["ordinary_income"], flows["ltcg_income"], flows["pretax_withdrawn"]
+    S, Y = ordinary.shape
+    ss_total = plan.ss_total
+    provisional = ordinary + 0.5 * ss_total
+    ss_tax_amt = plan.fed.ss_taxable(ss_total, provisional, plan.filing_status)
+    total_income = ordinary + ss_total + ltcg
+    std = plan.std[None, :]
+
+    ordinary_tax_base = np.maximum(0.0, (ordinary + ss_tax_amt) - std)
+    taxable_total = np.maximum(0.0, ordinary + ss_tax_amt + ltcg - std)
+    ltcg_tax_base = np.maximum(0.0, taxable_total - ordinary_tax_base)
+
+    fed_ord_tax, marginal_idx = plan.fed.schedule(plan.filing_status).tax(ordinary_tax_base)
+    fed_tax = fed_ord_tax + ltcg_tax_base * plan.fed.ltcg_rate
+    state_tax = np.asarray(plan.state_fn(taxable_total, num65=plan.num65[None, :],
+                                         agi=ordinary + ss_tax_amt + ltcg, ss_taxable=ss_tax_amt,
+                                         retirement_income=pre_wd), dtype=float)
+    total_tax = fed_tax + state_tax
+    eff = np.divide(total_tax, total_income, out=np.zeros((S, Y)), where=total_income > 0)
+
+    return {
+        "balances": flows["balances"],
+        "ss_total": ss_total,
+        "rmd": flows["rmd"],
+        "roth_conversion": flows["roth_conversion"],
+        "ordinary_income": ordinary,
+        "ltcg_income": ltcg,
+        "total_income": total_income,
+        "taxable_total": taxable_total,
+        "marginal_idx": marginal_idx,
+        "federal_tax": fed_tax,
+        "state_tax": state_tax,
+        "total_tax": total_tax,
+        "effective_rate": eff,
+        "pretax_withdrawn": pre_wd,
+        "withdrawn": flows["withdrawn"],
+        "requested": flows["requested"],
+    }
+
+
+def project(plan: BatchPlan, t0: int = 0, init_balances: np.ndarray | None = None,
+            stop_on_shortfall: bool = False,
+            progress: Callable[[int, int], None] | None = None) -> Dict[str, np.ndarray]:
+    """
+    Run every scenario in `plan` through the projection year loop.
+    Returns unrounded arrays: "balances" is (S, Y, A); everything else is (S, Y)
+    except "marginal_idx" (federal.TaxSchedule code, -1 = 0%).
+
+    - t0 / init_balances: resume at year index t0 from the given (S, A) balances
+      (e.g. a checkpoint from an earlier call); years before t0 are left at zero.
+    - The loop stops once every account in every scenario is empty; later years
+      have no flows, so the result is unchanged.
+    - stop_on_shortfall: also stop once every scenario has failed to fund a
+      requested withdrawal (later years are then left at zero). For solvers
+      that only need feasibility.
+    - progress: called as progress(years done, years to run) after each year
+      (see core.jobs; it may raise to abandon the run).
+    """
+    return apply_taxes(plan, simulate(plan, t0, init_balances, stop_on_shortfall, progress=progress))
+
+
+def to_results(plan: BatchPlan, res: Dict[str, np.ndarray], round_whole: bool = True) -> List[ProjectionResult]:
+    """One ProjectionResult per scenario (views into `res`), laid out like projection.run."""
+    sched = plan.fed.schedule(plan.filing_status)
+    labels = sched.label_array(res["marginal_idx"])
+    out = []
+    for i in range(plan.n_scenarios):
+        row = {k: v[i] for k, v in res.items() if k != "marginal_idx"}
+        cols = result_columns(plan.years, plan.age_you, plan.age_sp, plan.std, labels[i], row,
+                              plan.acct_names, res["balances"][i])
+        out.append(ProjectionResult(cols, plan.acct_names, round_whole))
+    return out
+
+
+def to_tables(plan: BatchPlan, res: Dict[str, np.ndarray], round_whole: bool = True) -> List[pd.DataFrame]:
+    """Materialize one DataFrame per scenario with the same layout as projection.run."""
+    return [r.table for r in to_results(plan, res, round_whole)]
+
+
+def run_batch(profile: Profile, inputs: Sequence[Inputs], assumptions: Assumptions,
+              state_rate: float | None = None, local_rate: float | None = None,
+              senior_bill_on: bool = True, round_whole: bool = True,
+              std_override: float | None = None,
+              strategies: Sequence[Dict[str, Any]] | Dict[str, Any] | None = None,
+              time_step: str = "annual") -> Dict[str, Any]:
+    """
+    Batch counterpart of projection.run: one call for N scenarios.
+    Returns {"tables": [DataFrame per scenario], "arrays": raw result arrays}.
+    """
+    plan = prepare_batch(profile, inputs, state_rate=state_rate, local_rate=local_rate,
+                         std_override=std_override, strategies=strategies,
+                         rules_version=assumptions.rules_version, senior_bill_on=senior_bill_on,
+                         time_step=time_step)
+    res = project(plan)
+    return {"tables": to_tables(plan, res, round_whole), "arrays": res}
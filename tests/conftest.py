@@ -0,0 +1,68 @@
+# tests/conftest.py
+# Shared fixtures: deterministic households for the engine tests.
+import os
+import random
+import sys
+
+import pytest
+
+# --- make the project root importable when pytest runs from anywhere ---
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+# -----------------------------------------------------------------------
+
+from core.schema import Profile, Inputs, Assumptions
+
+ACCOUNTS = [  # (name, tax_class, owner)
+    ("His Trad IRA", "pre_tax", "his"),
+    ("Her Trad IRA", "pre_tax", "hers"),
+    ("Joint Brokerage", "brokerage", "joint"),
+    ("Cash", "cash", "joint"),
+    ("HSA (His)", "hsa", "his"),
+    ("Roth (His)", "roth", "his"),
+]
+CLASSES = ("pre_tax", "roth", "brokerage", "cash")
+
+
+def make_household(seed: int = 0, state: str = "MD", filing_status: str = "MFJ", mode: str = "manual",
+                   spouse: bool = True, start_year: int = 2025, end_year: int | None = None):
+    """
+    (profile, inputs, strategy) for a randomized but reproducible household:
+    six accounts across every tax class, brokerage dividends and realized gains,
+    Social Security for both spouses, and (depending on `seed`) Roth conversions.
+    mode="weights" returns a weights strategy; "manual" uses per-account withdrawals.
+    """
+    r = random.Random(seed)
+    profile = Profile(filing_status, "1958-03-14", "1961-09-09" if spouse else None, state, "Montgomery")
+    balances = {n: r.choice([0.0, 50_000.0, 325_000.0, 1_138_000.0, round(r.uniform(0, 900_000), 2)])
+                for n, _, _ in ACCOUNTS}
+    returns = {n: round(r.uniform(-0.03, 0.10), 4) for n, _, _ in ACCOUNTS}
+    plan = [{"name": n, "annual": r.choice([0.0, 20_000.0, 60_000.0]), "tax_class": tc, "owner": owner,
+             "div_yield_pct": 2.0 if tc == "brokerage" else 0.0,
+             "realize_gains_pct": 25.0 if tc == "brokerage" else 0.0}
+            for n, tc, owner in ACCOUNTS]
+    conversions = r.choice([{"annual": 0.0, "years": 0},
+                            {"annual": r.choice([30_000.0, 90_000.0]), "years": r.randint(1, 8)},
+                            {"schedule": {str(start_year + k): round(r.uniform(0, 150_000), 2) for k in (0, 2, 4)}}])
+    inputs = Inputs(start_year, end_year or start_year + r.randint(10, 40), balances, returns, mode, plan,
+                    0.0, False, conversions,
+                    {"primary_age": r.randint(62, 70), "spouse_age": r.randint(62, 70),
+                     "primary_month": r.randint(1, 12), "spouse_month": r.randint(1, 12),
+                     "fra_monthly_primary": 2981.0, "fra_monthly_spouse": 2800.0, "cola": 0.02})
+    strategy = None
+    if mode == "weights":
+        w = [r.random() for _ in CLASSES]
+        strategy = {"mode": "weights", "total_withdraw": r.choice([50_000.0, 120_000.0, 300_000.0]),
+                    "weights": {c: x / sum(w) for c, x in zip(CLASSES, w)}}
+    return profile, inputs, strategy
+
+
+@pytest.fixture(scope="session")
+def household():
+    return make_household
+
+
+@pytest.fixture(scope="session")
+def assumptions():
+    return Assumptions("2025.v1")
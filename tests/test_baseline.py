@@ -0,0 +1,56 @@
+# tests/test_baseline.py
+# Regression check: the 2025-2044 projection tables for a few fixed households
+# must match tests/data/baseline_2025_2044.json to the dollar.
+#
+#   python tests/test_baseline.py        # rewrite the baseline after an intended change
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BASELINE = os.path.join(os.path.dirname(__file__), "data", "baseline_2025_2044.json")
+# (name, household seed, state, filing status, withdrawal mode, time_step)
+CASES = [
+    ("md_mfj_manual", 11, "MD", "MFJ", "manual", "annual"),
+    ("ca_single_weights", 12, "CA", "Single", "weights", "annual"),
+    ("pa_mfj_weights", 13, "PA", "MFJ", "weights", "annual"),
+    ("ny_hoh_manual", 14, "NY", "HOH", "manual", "annual"),
+    ("md_mfj_weights_monthly", 15, "MD", "MFJ", "weights", "monthly"),
+]
+
+
+def project_case(seed, state, fs, mode, time_step):
+    from conftest import make_household
+    from core.projection import run
+    from core.schema import Assumptions
+    profile, inputs, strategy = make_household(seed, state, fs, mode, spouse=fs == "MFJ", end_year=2044)
+    result = run(profile, inputs, Assumptions("2025.v1"), strategy=strategy, time_step=time_step)
+    return {c: result.column(c).tolist() for c in result.columns}
+
+
+def _load():
+    with open(BASELINE) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("name, seed, state, fs, mode, time_step", CASES, ids=[c[0] for c in CASES])
+def test_matches_baseline(name, seed, state, fs, mode, time_step):
+    want = _load()[name]
+    got = project_case(seed, state, fs, mode, time_step)
+    assert list(got) == list(want)
+    assert got["Year"] == list(range(2025, 2045))
+    for col, values in want.items():
+        if not all(isinstance(v, (int, float)) for v in values):   # labels, or Spouse Age without a spouse
+            assert got[col] == values, col
+        else:
+            np.testing.assert_allclose(got[col], values, rtol=0, atol=1.0, err_msg=f"{name}: {col}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(__file__))
+    data = {name: project_case(*args) for name, *args in CASES}
+    with open(BASELINE, "w") as f:
+        json.dump(data, f, indent=1)
+    print(f"wrote {BASELINE} ({len(data)} cases)")
@@ -0,0 +1,17 @@
+# tests/test_imports.py
+# The engine modules import without pandas/pyarrow/streamlit and within the
+# cold-import budget of benchmarks/bench_imports.py (fresh interpreter each).
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from bench_imports import BUDGET_MS, MODULES, measure  # noqa: E402
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_engine_import_is_light(module):
+    r = measure(module, repeats=3)
+    assert r["heavy"] == [], f"{module} imports {', '.join(r['heavy'])}"
+    assert r["core_ms"] <= BUDGET_MS, f"{module} takes {r['core_ms']:.1f} ms (budget {BUDGET_MS:.0f} ms)"
@@ -0,0 +1,135 @@
+# tests/test_incremental.py
+# IncrementalProjector must give exactly what a fresh projection.run gives,
+# while re-simulating only the years an edit can affect.
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from core.incremental import IncrementalProjector
+from core.projection import run
+
+
+def _assert_same(a, b):
+    assert a.keys() == b.keys()
+    for col in a:
+        if a[col].dtype == object:
+            assert list(a[col]) == list(b[col]), col
+        else:
+            np.testing.assert_array_equal(a[col], b[col], err_msg=col)
+
+
+def _edits(inputs, strategy):
+    """(label, inputs, strategy) for a run of typical slider edits, applied cumulatively."""
+    inp, strat = copy.deepcopy(inputs), copy.deepcopy(strategy)
+    inp.end_year += 5
+    yield "extend window", copy.deepcopy(inp), copy.deepcopy(strat)
+    inp.social_security["primary_age"] = 70
+    yield "claim age", copy.deepcopy(inp), copy.deepcopy(strat)
+    name = next(iter(inp.returns))
+    inp.returns[name] += 0.01
+    yield "one return", copy.deepcopy(inp), copy.deepcopy(strat)
+    inp.conversions = {"schedule": {str(inp.start_year + 3): 40_000.0}}
+    yield "later conversion", copy.deepcopy(inp), copy.deepcopy(strat)
+    inp.end_year -= 8
+    yield "shorten window", copy.deepcopy(inp), copy.deepcopy(strat)
+
+
+@pytest.mark.parametrize("time_step", ("annual", "monthly"))
+@pytest.mark.parametrize("mode", ("manual", "weights"))
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_matches_full_run(household, assumptions, seed, mode, time_step):
+    profile, inputs, strategy = household(seed, mode=mode)
+    proj = IncrementalProjector()
+    for label, inp, strat in [("first run", inputs, strategy), *_edits(inputs, strategy)]:
+        got = proj.project(profile, inp, assumptions, strategy=strat, time_step=time_step, output="arrays")
+        want = run(profile, inp, assumptions, strategy=strat, time_step=time_step, output="arrays")
+        _assert_same(got, want)
+
+
+def test_tax_only_edit_reuses_every_year(household, assumptions):
+    profile, inputs, strategy = household(2, mode="weights")
+    proj = IncrementalProjector()
+    proj.project(profile, inputs, assumptions, strategy=strategy)
+    inp = copy.deepcopy(inputs)
+    inp.social_security["cola"] = 0.03
+    proj.project(profile, inp, assumptions, strategy=strategy)
+    assert proj.last_restart == inputs.end_year - inputs.start_year + 1
+
+
+def test_extension_simulates_only_new_years(household, assumptions):
+    profile, inputs, strategy = household(1)
+    proj = IncrementalProjector()
+    proj.project(profile, inputs, assumptions, strategy=strategy)
+    inp = copy.deepcopy(inputs)
+    inp.end_year += 3
+    before = proj.stats["years_simulated"]
+    proj.project(profile, inp, assumptions, strategy=strategy)
+    assert proj.stats["years_simulated"] - before == 3
+
+
+def test_conversion_edit_restarts_at_that_year(household, assumptions):
+    profile, inputs, strategy = household(0)
+    inputs.conversions = {"annual": 0.0, "years": 0}
+    proj = IncrementalProjector()
+    proj.project(profile, inputs, assumptions, strategy=strategy)
+    inp = copy.deepcopy(inputs)
+    inp.conversions = {"schedule": {str(inputs.start_year + 4): 25_000.0}}
+    proj.project(profile, inp, assumptions, strategy=strategy)
+    assert proj.last_restart == 4
+
+
+def test_switching_time_step_restarts(household, assumptions):
+    profile, inputs, strategy = household(3)
+    proj = IncrementalProjector()
+    proj.project(profile, inputs, assumptions, strategy=strategy)
+    proj.project(profile, inputs, assumptions, strategy=strategy, time_step="monthly")
+    assert proj.last_restart == 0
+
+
+def test_interrupted_run_keeps_checkpoints(household, assumptions):
+    profile, inputs, strategy = household(1, mode="weights")
+    proj = IncrementalProjector()
+    proj.project(profile, inputs, assumptions, strategy=strategy)
+    inp = copy.deepcopy(inputs)
+    inp.returns[next(iter(inp.returns))] += 0.02
+
+    def stop(done, total):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        proj.project(profile, inp, assumptions, strategy=strategy, progress=stop)
+    _assert_same(proj.project(profile, inputs, assumptions, strategy=strategy, output="arrays"),
+                 run(profile, inputs, assumptions, strategy=strategy, output="arrays"))
+
+
+
+def test_calls_are_serialized(household, assumptions):
+    profile, inputs, strategy = household(2, mode="weights")
+    other = copy.deepcopy(inputs)
+    other.returns[next(iter(other.returns))] += 0.01
+    proj = IncrementalProjector()
+    calls, started, release = [], threading.Event(), threading.Event()
+
+    def first(done, total):
+        calls.append("first")
+        started.set()
+        release.wait(5)
+
+    def second(done, total):
+        calls.append("second")
+
+    with ThreadPoolExecutor(2) as pool:
+        a = pool.submit(proj.project, profile, inputs, assumptions, strategy=strategy, progress=first)
+        started.wait(5)
+        b = pool.submit(proj.project, profile, other, assumptions, strategy=strategy,
+                        progress=second, output="arrays")
+        time.sleep(0.2)   # the second call would be simulating by now if it were not waiting
+        release.set()
+        a.result()
+        got = b.result()
+    assert calls == sorted(calls)   # every "first" before any "second"
+    _assert_same(got, run(profile, other, assumptions, strategy=strategy, output="arrays"))
@@ -0,0 +1,51 @@
+# tests/test_montecarlo.py
+# Seeded Monte Carlo: bit-identical for any worker count, streaming summaries
+# consistent with the spilled raw paths.
+import numpy as np
+import pytest
+
+from core.montecarlo import run_monte_carlo
+
+KW = dict(n_paths=900, chunk_size=200, volatility=0.15, seed=11)
+
+
+@pytest.fixture(scope="module")
+def case(household, assumptions):
+    profile, inputs, strategy = household(4, mode="weights")
+    inputs.end_year = inputs.start_year + 25
+    return profile, inputs, assumptions, strategy
+
+
+def test_same_result_for_any_worker_count(case):
+    profile, inputs, assumptions, strategy = case
+    one = run_monte_carlo(profile, inputs, assumptions, strategy=strategy, workers=1, **KW)
+    three = run_monte_carlo(profile, inputs, assumptions, strategy=strategy, workers=3, **KW)
+    assert one == three
+
+
+def test_seed_changes_paths(case):
+    profile, inputs, assumptions, strategy = case
+    a = run_monte_carlo(profile, inputs, assumptions, strategy=strategy, workers=1, **KW)
+    b = run_monte_carlo(profile, inputs, assumptions, strategy=strategy, workers=1, **{**KW, "seed": 12})
+    assert a["ending_balance_percentiles"] != b["ending_balance_percentiles"]
+
+
+def test_summaries_match_spilled_paths(case, tmp_path):
+    profile, inputs, assumptions, strategy = case
+    spill = tmp_path / "paths.npy"
+    res = run_monte_carlo(profile, inputs, assumptions, strategy=strategy, workers=1,
+                          spill_path=str(spill), **KW)
+    raw = np.load(spill, mmap_mode="r")
+    assert raw.shape == (KW["n_paths"], len(res["by_year"]["years"]), len(inputs.balances))
+    total = raw.sum(axis=2)
+    np.testing.assert_allclose(res["by_year"]["balance_mean"], total.mean(axis=0), rtol=1e-9)
+    ending = np.quantile(total[:, -1], 0.5)
+    assert res["ending_balance_percentiles"][50] == pytest.approx(ending, rel=0.02, abs=1.0)
+
+
+def test_senior_bill_flag_reaches_workers(case):
+    profile, inputs, assumptions, strategy = case
+    kw = {**KW, "n_paths": 200}
+    on = run_monte_carlo(profile, inputs, assumptions, strategy=strategy, workers=2, **kw)
+    off = run_monte_carlo(profile, inputs, assumptions, strategy=strategy, workers=2, senior_bill_on=False, **kw)
+    assert off["lifetime_tax_percentiles"][50] > on["lifetime_tax_percentiles"][50]
@@ -0,0 +1,82 @@
+# tests/test_rmd.py
+# SECURE 2.0 start ages, Uniform Lifetime divisor schedules, and RMDs as the
+# engines enforce them.
+import numpy as np
+import pytest
+
+from core.projection import run
+from core.rmd import UNIFORM_DIVISORS, rmd_rates, rmd_start_age_from_dob
+from core.schema import Profile, Inputs
+from core.vectorized import run_batch
+
+
+@pytest.mark.parametrize("dob, age", [("1949-06-30", 72), ("1950-12-31", 72), ("1951-01-01", 73),
+                                      ("1959-12-31", 73), ("1960-01-01", 75), ("1972-04-02", 75)])
+def test_start_age(dob, age):
+    assert rmd_start_age_from_dob(dob) == age
+
+
+
+def test_divisors_are_the_2022_table():
+    assert sorted(UNIFORM_DIVISORS) == list(range(72, 121))
+    for age, divisor in [(72, 27.4), (75, 24.6), (80, 20.2), (85, 16.0), (90, 12.2), (95, 8.9),
+                         (100, 6.4), (110, 3.5), (120, 2.0)]:
+        assert UNIFORM_DIVISORS[age] == divisor
+    assert all(UNIFORM_DIVISORS[a] > UNIFORM_DIVISORS[a + 1] for a in range(72, 120))
+
+
+def test_rates_follow_divisors():
+    years = list(range(2020, 2060))
+    rates = rmd_rates("1952-05-01", years)          # start age 73, reached in 2025
+    for yr, rate in zip(years, rates):
+        age = yr - 1952
+        if age < 73:
+            assert rate == 0.0
+        else:
+            assert rate == pytest.approx(1.0 / UNIFORM_DIVISORS[min(age, max(UNIFORM_DIVISORS))])
+
+
+def test_rates_without_dob_are_zero():
+    assert rmd_rates(None, [2025, 2026]) == (0.0, 0.0)
+    assert rmd_rates("1950-01-01", []) == ()
+
+
+def _rmd_household(requested: float = 0.0):
+    profile = Profile("MFJ", "1952-05-01", "1961-09-09", "TX", None)
+    names = {"His IRA": ("pre_tax", "his"), "Her IRA": ("pre_tax", "hers"), "Cash": ("cash", "joint")}
+    inputs = Inputs(2025, 2034, {"His IRA": 500_000.0, "Her IRA": 400_000.0, "Cash": 50_000.0},
+                    {"His IRA": 0.05, "Her IRA": 0.05, "Cash": 0.02}, "manual",
+                    [{"name": n, "annual": requested if n == "His IRA" else 0.0, "tax_class": tc, "owner": ow}
+                     for n, (tc, ow) in names.items()],
+                    0.0, False, {"annual": 0.0, "years": 0},
+                    {"primary_age": 70, "spouse_age": 67, "fra_monthly_primary": 0.0, "fra_monthly_spouse": 0.0})
+    return profile, inputs
+
+
+def test_engine_takes_rmd_per_owner(assumptions):
+    profile, inputs = _rmd_household()
+    out = run(profile, inputs, assumptions, output="arrays")
+    his = [500_000.0]
+    for t in range(len(out["Year"])):
+        expected = his[-1] * rmd_rates(profile.primary_dob, out["Year"].tolist())[t]
+        assert out["RMD"][t] == pytest.approx(expected)
+        his.append(out["His IRA"][t])
+    # the spouse (born 1961) owes nothing before 2036
+    np.testing.assert_allclose(out["Her IRA"], 400_000.0 * 1.05 ** np.arange(1, 11))
+    np.testing.assert_allclose(out["Income (Ordinary)"], out["RMD"])
+
+
+def test_requested_withdrawal_above_rmd_is_not_topped_up(assumptions):
+    profile, inputs = _rmd_household(requested=60_000.0)
+    out = run(profile, inputs, assumptions, output="arrays")
+    assert out["Income (Ordinary)"][0] == pytest.approx(60_000.0)
+    assert out["His IRA"][0] == pytest.approx((500_000.0 - 60_000.0) * 1.05)
+
+
+def test_batch_engine_enforces_the_same_rmds(assumptions):
+    profile, inputs = _rmd_household(requested=10_000.0)
+    ref = run(profile, inputs, assumptions, output="arrays")
+    assert ref["Income (Ordinary)"][0] == pytest.approx(ref["RMD"][0])   # 10k requested, RMD made up
+    table = run_batch(profile, [inputs], assumptions, round_whole=False)["tables"][0]
+    np.testing.assert_allclose(table["RMD"], ref["RMD"], atol=0.01)
+    np.testing.assert_allclose(table["His IRA"], ref["His IRA"], atol=0.01)
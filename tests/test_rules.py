@@ -0,0 +1,41 @@
+# tests/test_rules.py
+# Every shipped rules table validates; malformed state tables raise RulesError.
+import copy
+
+import pytest
+
+from core import rules
+from core.taxes_states.registry import compile_state
+
+
+@pytest.mark.parametrize("state", rules.available_states())
+def test_state_tables_compile(state):
+    for version in rules.available_versions(state):
+        for fs in ("MFJ", "Single"):
+            assert compile_state(state, rules.state_data(state, version), filing_status=fs)(80_000.0) >= 0.0
+
+
+def test_missing_key_is_a_rules_error():
+    data = copy.deepcopy(rules.state_data("PA"))
+    del data["local_rate"]
+    with pytest.raises(rules.RulesError, match="missing 'local_rate'"):
+        compile_state("PA", data)
+    data = copy.deepcopy(rules.state_data("MD"))
+    del data["senior_credit"]
+    with pytest.raises(rules.RulesError, match="missing 'senior_credit'"):
+        compile_state("MD", data)
+
+
+@pytest.mark.parametrize("brackets, msg", [
+    ([], "non-empty"),
+    ([[10_000, 0.02], [5_000, 0.04], [None, 0.05]], "must increase"),
+    ([[10_000, 0.02], [20_000, 0.04]], "must be null"),
+    ([[None, 1.5]], "out of range"),
+])
+def test_bad_brackets_are_rules_errors(brackets, msg):
+    with pytest.raises(rules.RulesError, match=msg):
+        rules.validate_brackets("test", brackets)
+    data = copy.deepcopy(rules.state_data("PA"))
+    data["brackets"]["MFJ"] = brackets
+    with pytest.raises(rules.RulesError, match=msg):
+        compile_state("PA", data)
@@ -0,0 +1,108 @@
+# tests/test_vectorized.py
+# The batch engine against the scalar engine, column by column, to the cent.
+import numpy as np
+import pytest
+
+from core.projection import run, monthly_year, monthly_rates
+from core.vectorized import run_batch
+
+STATES = ("MD", "CA", "PA", "NY", "TX")
+STATUSES = ("MFJ", "Single", "HOH")
+
+
+def _variants(household, seed, state, fs, mode, n=4):
+    """n scenarios of one household shape (same accounts and window), as run_batch expects."""
+    profile, base, _ = household(seed, state, fs, mode, spouse=fs == "MFJ")
+    inputs, strategies = [], []
+    for k in range(n):
+        _, inp, strat = household(seed * 100 + k, state, fs, mode, spouse=fs == "MFJ")
+        inp.start_year, inp.end_year = base.start_year, base.end_year
+        inputs.append(inp)
+        strategies.append(strat)
+    return profile, inputs, strategies
+
+
+@pytest.mark.parametrize("time_step", ("annual", "monthly"))
+@pytest.mark.parametrize("mode", ("manual", "weights"))
+@pytest.mark.parametrize("fs", STATUSES)
+@pytest.mark.parametrize("state", STATES)
+def test_batch_matches_scalar(household, assumptions, state, fs, mode, time_step):
+    seed = STATES.index(state) * 10 + STATUSES.index(fs)
+    profile, inputs, strategies = _variants(household, seed, state, fs, mode)
+    std = None if seed % 2 else 20_000.0
+    res = run_batch(profile, inputs, assumptions, round_whole=False, std_override=std,
+                    strategies=strategies, time_step=time_step)
+    for inp, strat, table in zip(inputs, strategies, res["tables"]):
+        ref = run(profile, inp, assumptions, round_whole=False, std_override=std, strategy=strat,
+                  time_step=time_step).table
+        assert list(table.columns) == list(ref.columns)
+        for col in ref.columns:
+            if ref[col].dtype.kind in "biuf":
+                np.testing.assert_allclose(table[col], ref[col], rtol=0, atol=0.01, err_msg=col)
+            else:
+                assert list(map(str, table[col])) == list(map(str, ref[col])), col
+
+
+def test_flat_state_override_matches_scalar(household, assumptions):
+    profile, inputs, strategies = _variants(household, 7, "VA", "MFJ", "weights")
+    res = run_batch(profile, inputs, assumptions, state_rate=4.0, local_rate=1.0, strategies=strategies)
+    for inp, strat, table in zip(inputs, strategies, res["tables"]):
+        ref = run(profile, inp, assumptions, state_rate=4.0, local_rate=1.0, strategy=strat).table
+        np.testing.assert_allclose(table["Total Tax"], ref["Total Tax"], rtol=0, atol=1.0)
+
+
+def _naive_months(start, w, g):
+    bal, taken, invested = max(start, 0.0), 0.0, 0.0
+    for _ in range(12):
+        x = min(bal, w)
+        bal -= x
+        taken += x
+        invested += bal
+        bal *= g
+    return bal, taken, invested
+
+
+def test_monthly_year_matches_month_loop():
+    rng = np.random.default_rng(0)
+    start = np.concatenate([[0.0, 5_000.0], rng.uniform(0, 1e6, 500)])
+    w = np.concatenate([[1_000.0, 1_000.0], rng.choice([0.0, 5_000.0, 90_000.0], 500)])   # includes depletion
+    g = 1.0 + monthly_rates(rng.uniform(-0.5, 0.4, 502))
+    end, taken, invested = monthly_year(start, w, g)
+    expected = np.array([_naive_months(*args) for args in zip(start, w, g)])
+    np.testing.assert_allclose(np.c_[end, taken, invested], expected, rtol=1e-9, atol=1e-6)
+
+
+def test_monthly_rates_compound_to_annual():
+    r = np.array([-0.3, 0.0, 0.05, 0.12])
+    np.testing.assert_allclose((1 + monthly_rates(r)) ** 12 - 1, r, atol=1e-12)
+
+
+def test_monthly_equals_annual_without_cash_flows(household, assumptions):
+    profile, inputs, _ = household(3)
+    for item in inputs.withdrawals_plan:
+        item.update(annual=0.0, div_yield_pct=0.0, realize_gains_pct=0.0)
+    inputs.conversions = {"annual": 0.0, "years": 0}
+    inputs.end_year = 2030    # before the first RMD (age 73 in 2031)
+    annual = run(profile, inputs, assumptions, output="arrays")
+    monthly = run(profile, inputs, assumptions, output="arrays", time_step="monthly")
+    for name in inputs.balances:
+        np.testing.assert_allclose(monthly[name], annual[name], rtol=1e-12, atol=1e-6)
+
+
+def test_monthly_withdrawals_leave_more_invested(household, assumptions):
+    # Withdrawing over the year instead of up front keeps money growing longer.
+    profile, inputs, _ = household(5)
+    inputs.returns = {n: 0.06 for n in inputs.returns}
+    inputs.conversions = {"annual": 0.0, "years": 0}
+    inputs.balances["Cash"] = 500_000.0
+    for item in inputs.withdrawals_plan:
+        item["annual"] = 30_000.0 if item["name"] == "Cash" else 0.0
+    annual = run(profile, inputs, assumptions, output="arrays")
+    monthly = run(profile, inputs, assumptions, output="arrays", time_step="monthly")
+    assert (monthly["Cash"][:5] > annual["Cash"][:5]).all()
+
+
+def test_unknown_time_step_rejected(household, assumptions):
+    profile, inputs, _ = household(1)
+    with pytest.raises(ValueError):
+        run(profile, inputs, assumptions, time_step="weekly")